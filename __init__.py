@@ -10,14 +10,21 @@ bl_info = {
 import bpy
 from . import mouse_strafing
 from . import prefs
+from . import raycast
+from . import bookmarks
+from . import recorder
 
 def registerProperties():
     if not hasattr(bpy.types.Scene, "mstrf_camera_save_states"):
         bpy.types.Scene.mstrf_camera_save_states = bpy.props.PointerProperty(type = mouse_strafing.CameraStates, options = {"HIDDEN"})
+    if not hasattr(bpy.types.Scene, "mstrf_camera_bookmarks"):
+        bpy.types.Scene.mstrf_camera_bookmarks = bpy.props.PointerProperty(type = bookmarks.CameraBookmarks, options = {"HIDDEN"})
 
 def unregisterProperties():
     if hasattr(bpy.types.Scene, "mstrf_camera_save_states"):
         del bpy.types.Scene.mstrf_camera_save_states
+    if hasattr(bpy.types.Scene, "mstrf_camera_bookmarks"):
+        del bpy.types.Scene.mstrf_camera_bookmarks
 
 def initAddonPreferences():
     p: prefs.MouseStrafingPreferences = bpy.context.preferences.addons[prefs.MouseStrafingPreferences.bl_idname].preferences
@@ -31,7 +38,10 @@ def initAddonPreferences():
         b.button1, b.button2, b.action = "lmb", "rmb", "strafeXZ"
         b = p.buttonBindings.add()
         b.button1, b.button2, b.action = "mmb", "omit", "roll"
+        prefs.invalidateButtonBindingTable()
         bpy.context.preferences.use_preferences_save = True
+    raycast.setBvhCacheMemoryLimit(p.pivotCacheMemoryLimit * 1024 * 1024)
+    recorder.setPathRecorderMemoryLimit(p.pathRecorderMemoryLimit * 1024 * 1024)
 
 addonClasses = [ \
     prefs.NavigationMouseButtonBinding, \
@@ -41,6 +51,15 @@ addonClasses = [ \
     prefs.MoveButtonBindingDown, \
     mouse_strafing.CameraState, \
     mouse_strafing.CameraStates, \
+    bookmarks.CameraBookmark, \
+    bookmarks.CameraBookmarkPage, \
+    bookmarks.CameraBookmarks, \
+    bookmarks.ExportCameraBookmarks, \
+    bookmarks.ImportCameraBookmarks, \
+    bookmarks.RenameCameraBookmarkPage, \
+    recorder.PlayNavigationPath, \
+    recorder.ExportNavigationPath, \
+    recorder.ImportNavigationPath, \
     prefs.MouseStrafingPreferences, \
     mouse_strafing.MouseStrafingOperator, \
 ]
@@ -49,13 +68,29 @@ def register():
     for addonClass in addonClasses:
         bpy.utils.register_class(addonClass)
     registerProperties()
+    bpy.types.TOPBAR_MT_file_import.append(bookmarks.drawImportMenu)
+    bpy.types.TOPBAR_MT_file_export.append(bookmarks.drawExportMenu)
+    bpy.types.TOPBAR_MT_file_import.append(recorder.drawImportMenu)
+    bpy.types.TOPBAR_MT_file_export.append(recorder.drawExportMenu)
+    bpy.types.VIEW3D_MT_view.append(bookmarks.drawViewMenu)
+    bpy.types.VIEW3D_MT_view.append(recorder.drawViewMenu)
     initAddonPreferences()
+    raycast.registerHandlers()
+    recorder.registerHandlers()
     mouse_strafing.register_keymaps()
 
 
 def unregister():
     mouse_strafing.unregister_keymaps()
+    bpy.types.TOPBAR_MT_file_import.remove(bookmarks.drawImportMenu)
+    bpy.types.TOPBAR_MT_file_export.remove(bookmarks.drawExportMenu)
+    bpy.types.TOPBAR_MT_file_import.remove(recorder.drawImportMenu)
+    bpy.types.TOPBAR_MT_file_export.remove(recorder.drawExportMenu)
+    bpy.types.VIEW3D_MT_view.remove(bookmarks.drawViewMenu)
+    bpy.types.VIEW3D_MT_view.remove(recorder.drawViewMenu)
     unregisterProperties()
+    raycast.unregisterHandlers()
+    recorder.unregisterHandlers()
 
     for addonClass in reversed(addonClasses):
         bpy.utils.unregister_class(addonClass)
\ No newline at end of file
@@ -0,0 +1 @@
+# Event-stream replay benchmarks for the mouse strafing operator. Run `python -m bench --help` from the repository root.
@@ -0,0 +1,104 @@
+# Compact binary format for recorded event streams, plus a recorder that can be hooked into the operator's modal
+# handler (inside Blender or headless) to capture real navigation sessions.
+#
+# Layout: magic, version, number of type names, the type names (length-prefixed UTF-8), then fixed-size records of
+# (microseconds since previous event, type index, value index, modifier flags, mouse dx, mouse dy).
+
+import struct
+import time
+from collections import namedtuple
+
+magic = b"MSTRFEV\0"
+version = 1
+headerFormat = struct.Struct("<8sHH")
+recordFormat = struct.Struct("<IBBBxhh")
+
+values = ("NOTHING", "PRESS", "RELEASE", "CLICK", "DOUBLE_CLICK", "ANY")
+shiftFlag, ctrlFlag, altFlag = 1, 2, 4
+
+StreamEvent = namedtuple("StreamEvent", ("timeUs", "type", "value", "shift", "ctrl", "alt", "dx", "dy"))
+
+def makeEvent(timeUs: int, type: str, value: str = "NOTHING", shift: bool = False, ctrl: bool = False, alt: bool = False, dx: int = 0, dy: int = 0) -> StreamEvent:
+    return StreamEvent(int(timeUs), type, value, shift, ctrl, alt, int(dx), int(dy))
+
+def save(path: str, events: list):
+    typeNames = sorted({event.type for event in events})
+    typeIndices = {name: i for i, name in enumerate(typeNames)}
+    with open(path, "wb") as f:
+        f.write(headerFormat.pack(magic, version, len(typeNames)))
+        for name in typeNames:
+            encoded = name.encode("utf-8")
+            f.write(struct.pack("<B", len(encoded)) + encoded)
+        previousUs = 0
+        buffer = bytearray(recordFormat.size * len(events))
+        for i, event in enumerate(events):
+            flags = (shiftFlag if event.shift else 0) | (ctrlFlag if event.ctrl else 0) | (altFlag if event.alt else 0)
+            recordFormat.pack_into(buffer, i * recordFormat.size, max(0, event.timeUs - previousUs), typeIndices[event.type], values.index(event.value), flags, \
+                clampInt16(event.dx), clampInt16(event.dy))
+            previousUs = max(previousUs, event.timeUs)
+        f.write(buffer)
+
+def load(path: str) -> list:
+    with open(path, "rb") as f:
+        data = f.read()
+    fileMagic, fileVersion, typeCount = headerFormat.unpack_from(data, 0)
+    if fileMagic != magic:
+        raise ValueError(f"{path} is not a mouse strafing event stream")
+    if fileVersion > version:
+        raise ValueError(f"{path} uses event stream version {fileVersion}, but only versions up to {version} are supported")
+    offset = headerFormat.size
+    typeNames = []
+    for _i in range(typeCount):
+        length = data[offset]
+        typeNames.append(data[offset + 1:offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+    events = []
+    timeUs = 0
+    for deltaUs, typeIndex, valueIndex, flags, dx, dy in recordFormat.iter_unpack(data[offset:]):
+        timeUs += deltaUs
+        events.append(StreamEvent(timeUs, typeNames[typeIndex], values[valueIndex], bool(flags & shiftFlag), bool(flags & ctrlFlag), bool(flags & altFlag), dx, dy))
+    return events
+
+def clampInt16(v: int) -> int:
+    return -32768 if v < -32768 else (32767 if v > 32767 else v)
+
+class EventRecorder:
+    __slots__ = "events", "startNs", "operatorClass", "originalInvoke", "originalModal"
+
+    def __init__(self):
+        self.events = []
+        self.startNs = None
+        self.operatorClass = None
+        self.originalInvoke = None
+        self.originalModal = None
+
+    def record(self, event):
+        nowNs = time.perf_counter_ns()
+        if self.startNs is None:
+            self.startNs = nowNs
+        value = event.value if event.value in values else "NOTHING"
+        self.events.append(StreamEvent((nowNs - self.startNs) // 1000, event.type, value, event.shift, event.ctrl, event.alt, \
+            event.mouse_x - event.mouse_prev_x, event.mouse_y - event.mouse_prev_y))
+
+    def install(self, operatorClass):
+        if self.operatorClass is not None:
+            raise RuntimeError("event recorder is already installed")
+        recorder = self
+        originalInvoke, originalModal = operatorClass.invoke, operatorClass.modal
+        def invoke(self, context, event):
+            recorder.record(event)
+            return originalInvoke(self, context, event)
+        def modal(self, context, event):
+            recorder.record(event)
+            return originalModal(self, context, event)
+        self.operatorClass, self.originalInvoke, self.originalModal = operatorClass, originalInvoke, originalModal
+        operatorClass.invoke, operatorClass.modal = invoke, modal
+
+    def uninstall(self):
+        if self.operatorClass is None:
+            return
+        self.operatorClass.invoke, self.operatorClass.modal = self.originalInvoke, self.originalModal
+        self.operatorClass, self.originalInvoke, self.originalModal = None, None, None
+
+    def save(self, path: str):
+        save(path, self.events)
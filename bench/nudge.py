@@ -0,0 +1,65 @@
+# Checks that nudgeValue() gives exactly the same results as applying nudgeStep() once per unit of magnitude, for every
+# value on the coarse and fine ladders of all value ranges plus off-ladder values in between and outside of them.
+# Run with: python -m bench.nudge. tests/test_nudge.py runs the same comparison over a representative grid.
+
+import argparse
+import random
+import sys
+import time
+
+import headless
+
+magnitudes = (1, 2, 3, 4, 5, 10, 25, -1, -2, -3, -4, -5, -10, -25)
+
+def referenceNudge(ms, value: float, magnitude: int, fine: bool, ranges) -> float:
+    for i in range(abs(magnitude)):
+        value = ms.nudgeStep(value, 1 if magnitude >= 0 else -1, fine, ranges)
+    return value
+
+def offLadderValues(ranges, seed: int, count: int) -> list:
+    minimum, maximum = ranges[0][0], ranges[len(ranges) - 1]
+    rng = random.Random(seed)
+    values = [minimum - 1.0, minimum - 0.0001, maximum + 0.0001, maximum + 1.0, 0.0]
+    values.extend(rng.uniform(minimum, maximum) for i in range(count))
+    # near range boundaries, where snapping decides between two step sizes
+    for start, _step in ranges[:-1]:
+        values.extend(start + offset for offset in (-0.0004, -0.00001, -0.000004, 0.000004, 0.00001, 0.0004))
+    return values
+
+def check(ms, name: str, ranges, fine: bool, randomCount: int) -> int:
+    ladders = [ms.getNudgeLadder(ranges, fine, direction) for direction in (1, -1)]
+    for ladder in ladders:
+        if any(ladder[i] >= ladder[i + 1] for i in range(len(ladder) - 1)):
+            print(f"{name}: ladder is not strictly increasing")
+            return 1
+    failures = 0
+    values = sorted(set(ladders[0]) | set(ladders[1])) + offLadderValues(ranges, len(ladders[0]), randomCount)
+    for value in values:
+        for magnitude in magnitudes:
+            expected = referenceNudge(ms, value, magnitude, fine, ranges)
+            actual = ms.nudgeValue(value, magnitude, fine, ranges)
+            if actual != expected:
+                failures += 1
+                if failures <= 10:
+                    print(f"{name} fine={fine}: nudgeValue({value!r}, {magnitude}) = {actual!r}, expected {expected!r}")
+    print(f"{name:24} fine={fine!s:5} {len(ladders[0]):>7} rungs {len(values) * len(magnitudes):>9} cases {failures:>5} failures")
+    return failures
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog = "python -m bench.nudge", description = "Check nudgeValue() against repeated nudgeStep() calls.")
+    parser.add_argument("--random", type = int, default = 20000, help = "number of random off-ladder values per range")
+    parser.add_argument("--coarse-only", action = "store_true", help = "skip the (large) fine ladders")
+    args = parser.parse_args(argv)
+
+    addon = headless.loadAddon()
+    ms = addon.mouse_strafing
+    startNs = time.perf_counter_ns()
+    failures = 0
+    for name in ("strafeSensitivityRanges", "focalLengthRanges", "fovRanges"):
+        for fine in ((False,) if args.coarse_only else (False, True)):
+            failures += check(ms, name, getattr(ms, name), fine, args.random)
+    print(f"{'all equal' if failures == 0 else f'{failures} failures'} ({(time.perf_counter_ns() - startNs) / 1_000_000_000:.1f}s)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
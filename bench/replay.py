@@ -0,0 +1,192 @@
+# Replays event streams through MouseStrafingOperator.modal in a headless session and reports latency percentiles.
+# Timers and draw callbacks are driven by a simulated event loop that follows the stream's timestamps, so timer load
+# (e.g. the WASD tick) and redraws happen at the rate they would in Blender while events are replayed as fast as possible.
+
+import argparse
+import json
+import time
+
+import headless
+
+import bpy
+
+from . import eventstream
+from . import scenarios
+
+class Latencies:
+    __slots__ = "name", "samples"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples = []
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        total = sum(self.samples)
+        return {
+            "count": len(self.samples),
+            "totalMs": total / 1_000_000,
+            "meanUs": (total / len(self.samples) / 1000) if self.samples else 0.0,
+            "p50Us": self.percentile(50) / 1000,
+            "p90Us": self.percentile(90) / 1000,
+            "p99Us": self.percentile(99) / 1000,
+            "p999Us": self.percentile(99.9) / 1000,
+            "maxUs": max(self.samples, default = 0) / 1000,
+            "perSecond": (len(self.samples) / (total / 1_000_000_000)) if total > 0 else 0.0,
+        }
+
+class Report:
+    __slots__ = "name", "simulatedSeconds", "modal", "timers", "draws", "evaluations", "session"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.simulatedSeconds = 0.0
+        self.modal = Latencies("modal")
+        self.timers = Latencies("timers")
+        self.draws = Latencies("draw")
+        self.evaluations = 0
+        self.session = None
+
+    def summary(self) -> dict:
+        return {"name": self.name, "simulatedSeconds": self.simulatedSeconds, "modal": self.modal.summary(), "timers": self.timers.summary(), "draw": self.draws.summary(), "evaluations": self.evaluations}
+
+class SimulatedClock:
+    __slots__ = "now",
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def createSession(addon, gridSubdivisions: int = 32, lockedCamera: bool = False) -> headless.Session:
+    session = headless.Session(addon)
+    if gridSubdivisions > 0:
+        session.addMesh("Ground", *headless.gridMesh(200.0, gridSubdivisions))
+        session.addMesh("Cube", *headless.cubeMesh(4.0), headless.Matrix.Translation((0.0, 20.0, 2.0)))
+    session.rv3d.view_location = (0.0, 0.0, 1.0)
+    session.rv3d.view_rotation = headless.Quaternion((1.0, 0.0, 0.0), 1.3)
+    session.rv3d.view_distance = 10.0
+    if lockedCamera:
+        session.addCamera("Camera", headless.Matrix.Translation((0.0, -10.0, 2.0)) @ headless.Quaternion((1.0, 0.0, 0.0), 1.3).to_matrix().to_4x4())
+        session.viewThroughCamera(lock = True)
+    return session
+
+def applyBindings(prefs, bindings: list) -> list:
+    previous = [(b.button1, b.button2, b.action) for b in prefs.buttonBindings]
+    if bindings is not None:
+        prefs.buttonBindings.clear()
+        for button1, button2, action in bindings:
+            b = prefs.buttonBindings.add()
+            b.button1, b.button2, b.action = button1, button2, action
+    return previous
+
+def replay(addon, name: str, events: list, bindings: list = None, drawHz: float = 60.0, gridSubdivisions: int = 32, operatorKey: str = "SPACE", loopHz: float = scenarios.eventLoopHz, lockedCamera: bool = False) -> Report:
+    report = Report(name)
+    session = createSession(addon, gridSubdivisions, lockedCamera)
+    report.session = session
+    previousBindings = applyBindings(session.prefs, bindings)
+    clock = SimulatedClock()
+    previousClock = bpy.app.timers.clock
+    bpy.app.timers.clock = clock
+    loopInterval, drawInterval = 1.0 / loopHz, 1.0 / drawHz
+    nextLoop, nextDraw = 0.0, 0.0
+    try:
+        for event in events:
+            eventTime = event.timeUs / 1_000_000
+            # events arriving within one event loop iteration are handled back to back, then timers run, then the view redraws
+            while nextLoop <= eventTime:
+                clock.now = nextLoop
+                nextTimer = bpy.app.timers.nextDue()
+                if nextTimer is not None and nextTimer <= clock.now:
+                    startNs = time.perf_counter_ns()
+                    bpy.app.timers.run(clock.now)
+                    report.timers.samples.append(time.perf_counter_ns() - startNs)
+                if nextDraw <= clock.now:
+                    if session.running:
+                        startNs = time.perf_counter_ns()
+                        session.draw()
+                        report.draws.samples.append(time.perf_counter_ns() - startNs)
+                    nextDraw += drawInterval
+                nextLoop += loopInterval
+            clock.now = eventTime
+            if not session.running:
+                if event.type == operatorKey and event.value == "PRESS":
+                    startNs = time.perf_counter_ns()
+                    session.invoke(event.type, event.shift, event.ctrl, event.alt)
+                    report.modal.samples.append(time.perf_counter_ns() - startNs)
+                continue
+            if event.type in ("MOUSEMOVE", "INBETWEEN_MOUSEMOVE"):
+                prevX, prevY = session.window.mouse
+                session.window.mouse = [prevX + event.dx, prevY + event.dy]
+                e = session.makeEvent(event.type, event.value, event.shift, event.ctrl, event.alt)
+                e.mouse_prev_x, e.mouse_prev_y = prevX, prevY
+            else:
+                e = session.makeEvent(event.type, event.value, event.shift, event.ctrl, event.alt)
+            startNs = time.perf_counter_ns()
+            session.dispatch(e)
+            report.modal.samples.append(time.perf_counter_ns() - startNs)
+        report.simulatedSeconds = clock.now
+        report.evaluations = session.viewLayer.updateCount
+    finally:
+        if session.running:
+            session.dispatch(session.makeEvent("ESC", "PRESS"))
+        bpy.app.timers.clock = previousClock
+        bpy.app.timers.clear()
+        applyBindings(session.prefs, previousBindings)
+    return report
+
+def formatReport(report: Report) -> str:
+    lines = [f"{report.name}  ({report.simulatedSeconds:.2f}s simulated)"]
+    lines.append(f"  {'':8}{'count':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'p99.9':>10}{'max':>10}{'per sec':>12}")
+    for latencies in (report.modal, report.timers, report.draws):
+        s = latencies.summary()
+        lines.append(f"  {latencies.name:8}{s['count']:>8}{s['meanUs']:>9.1f}u{s['p50Us']:>9.1f}u{s['p90Us']:>9.1f}u{s['p99Us']:>9.1f}u{s['p999Us']:>9.1f}u{s['maxUs']:>9.1f}u{s['perSecond']:>12.0f}")
+    lines.append(f"  forced depsgraph evaluations: {report.evaluations}")
+    return "\n".join(lines)
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog = "python -m bench", description = "Replay event streams through the mouse strafing operator and report per-event latency.")
+    parser.add_argument("streams", nargs = "*", help = "recorded event stream files to replay")
+    parser.add_argument("--scenario", "-s", action = "append", default = None, help = "canned scenario to run (default: all); see --list")
+    parser.add_argument("--polling", "-p", type = int, action = "append", default = None, help = "mouse polling rate in Hz for canned scenarios (default: 1000 and 8000)")
+    parser.add_argument("--draw-hz", type = float, default = 60.0, help = "simulated viewport redraw rate")
+    parser.add_argument("--loop-hz", type = float, default = scenarios.eventLoopHz, help = "simulated event loop rate; timers run at most once per iteration")
+    parser.add_argument("--grid", type = int, default = 32, help = "subdivisions of the ground mesh used for pivot raycasts (0 for an empty scene)")
+    parser.add_argument("--save", metavar = "PATH", help = "write the (single) selected canned scenario to an event stream file instead of replaying it")
+    parser.add_argument("--json", action = "store_true", help = "print results as JSON")
+    parser.add_argument("--list", action = "store_true", help = "list canned scenarios")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for scenario in scenarios.scenarios:
+            print(f"{scenario.name:20} {scenario.description}")
+        return
+
+    addon = headless.loadAddon()
+    pollingRates = args.polling or [1000, 8000]
+    selected = [scenarios.getScenario(name) for name in args.scenario] if args.scenario else ([] if args.streams else scenarios.scenarios)
+
+    if args.save:
+        if len(selected) != 1 or len(pollingRates) != 1:
+            parser.error("--save requires exactly one --scenario and one --polling rate")
+        eventstream.save(args.save, selected[0].events(pollingRates[0]))
+        return
+
+    reports = []
+    for path in args.streams:
+        reports.append(replay(addon, path, eventstream.load(path), drawHz = args.draw_hz, gridSubdivisions = args.grid, loopHz = args.loop_hz))
+    for scenario in selected:
+        for pollingHz in pollingRates:
+            reports.append(replay(addon, f"{scenario.name} @ {pollingHz} Hz", scenario.events(pollingHz), scenario.bindings, args.draw_hz, args.grid, loopHz = args.loop_hz, lockedCamera = scenario.lockedCamera))
+
+    if args.json:
+        print(json.dumps([report.summary() for report in reports], indent = 2))
+    else:
+        print("\n\n".join(formatReport(report) for report in reports))
@@ -0,0 +1,124 @@
+# Canned event streams exercising the modal handler. Mouse streams emit one MOUSEMOVE per event loop iteration
+# and INBETWEEN_MOUSEMOVE for every other sample the mouse delivered in between, like Blender does.
+
+import math
+
+from .eventstream import makeEvent
+
+eventLoopHz = 240
+
+class Scenario:
+    __slots__ = "name", "description", "generate", "bindings", "lockedCamera"
+
+    def __init__(self, name: str, description: str, generate, bindings: list = None, lockedCamera: bool = False):
+        self.name = name
+        self.description = description
+        self.generate = generate
+        self.bindings = bindings
+        self.lockedCamera = lockedCamera
+
+    def events(self, pollingHz: int) -> list:
+        return list(self.generate(pollingHz))
+
+def mouseSamples(startUs: int, seconds: float, pollingHz: int, path, shift: bool = False, ctrl: bool = False, alt: bool = False):
+    sampleCount = int(seconds * pollingHz)
+    loopSamples = max(1, pollingHz // eventLoopHz)
+    x, y = 0.0, 0.0
+    for i in range(1, sampleCount + 1):
+        t = i / pollingHz
+        nx, ny = path(t)
+        dx, dy = int(round(nx)) - int(round(x)), int(round(ny)) - int(round(y))
+        x, y = nx, ny
+        type = "MOUSEMOVE" if i % loopSamples == 0 else "INBETWEEN_MOUSEMOVE"
+        yield makeEvent(startUs + int(t * 1_000_000), type, shift = shift, ctrl = ctrl, alt = alt, dx = dx, dy = dy)
+
+def key(timeUs: int, type: str, value: str, shift: bool = False, ctrl: bool = False, alt: bool = False):
+    return makeEvent(timeUs, type, value, shift, ctrl, alt)
+
+def turnXYDrag(pollingHz: int):
+    yield key(0, "SPACE", "PRESS")
+    yield key(20_000, "LEFTMOUSE", "PRESS")
+    # a long sweeping look-around, roughly 2000 counts per second horizontally
+    yield from mouseSamples(20_000, 4.0, pollingHz, lambda t: (2000 * t, 300 * math.sin(t * 3)))
+    yield key(4_040_000, "LEFTMOUSE", "RELEASE")
+    yield key(4_060_000, "SPACE", "RELEASE")
+
+def strafeXRappel(pollingHz: int):
+    yield key(0, "SPACE", "PRESS")
+    yield key(20_000, "RIGHTMOUSE", "PRESS")
+    yield from mouseSamples(20_000, 3.0, pollingHz, lambda t: (400 * math.sin(t * 4), 600 * t))
+    yield key(3_040_000, "RIGHTMOUSE", "RELEASE")
+    yield key(3_060_000, "SPACE", "RELEASE")
+
+def gearCyclingStorm(pollingHz: int):
+    yield key(0, "SPACE", "PRESS")
+    yield key(10_000, "RIGHTMOUSE", "PRESS")
+    timeUs = 10_000
+    for i in range(200):
+        shift = (i // 10) % 2 == 1
+        timeUs += 5_000
+        yield key(timeUs, "G", "PRESS", shift = shift)
+        yield from mouseSamples(timeUs, 0.01, pollingHz, lambda t: (1000 * t, 0), shift = shift)
+        timeUs += 10_000
+        yield key(timeUs, "G", "RELEASE", shift = shift)
+    yield key(timeUs + 10_000, "RIGHTMOUSE", "RELEASE")
+    yield key(timeUs + 20_000, "SPACE", "RELEASE")
+
+def saveLoadSpam(pollingHz: int):
+    digits = ("ZERO", "ONE", "TWO", "THREE", "FOUR", "FIVE", "SIX", "SEVEN", "EIGHT", "NINE")
+    yield key(0, "SPACE", "PRESS")
+    timeUs = 0
+    for i in range(100):
+        digit = digits[i % 10]
+        timeUs += 30_000
+        yield key(timeUs, "LEFTMOUSE", "PRESS")
+        yield from mouseSamples(timeUs, 0.02, pollingHz, lambda t: (800 * t, 200 * t))
+        timeUs += 20_000
+        yield key(timeUs, "LEFTMOUSE", "RELEASE")
+        # save, then load back via double tap and via the load key
+        for pressUs in (10_000, 60_000):
+            yield key(timeUs + pressUs, digit, "PRESS")
+            yield key(timeUs + pressUs + 20_000, digit, "RELEASE")
+        yield key(timeUs + 120_000, "T", "PRESS")
+        yield key(timeUs + 130_000, "T", "RELEASE")
+        yield key(timeUs + 140_000, digits[(i + 3) % 10], "PRESS")
+        yield key(timeUs + 160_000, digits[(i + 3) % 10], "RELEASE")
+        timeUs += 160_000
+    yield key(timeUs + 10_000, "SPACE", "RELEASE")
+
+def wheelStorm(pollingHz: int):
+    yield key(0, "SPACE", "PRESS")
+    timeUs = 0
+    for i in range(400):
+        timeUs += 4_000
+        wheel = "WHEELUPMOUSE" if (i // 25) % 2 == 0 else "WHEELDOWNMOUSE"
+        yield key(timeUs, wheel, "PRESS", ctrl = (i // 100) % 2 == 1, shift = i % 7 == 0)
+    yield key(timeUs + 10_000, "SPACE", "RELEASE")
+
+def wasdFlight(pollingHz: int):
+    yield key(0, "SPACE", "PRESS")
+    yield key(10_000, "W", "PRESS")
+    yield key(10_000, "LEFTMOUSE", "PRESS")
+    yield from mouseSamples(10_000, 1.5, pollingHz, lambda t: (300 * math.sin(t * 2), 100 * t))
+    yield key(1_510_000, "A", "PRESS")
+    yield from mouseSamples(1_510_000, 1.5, pollingHz, lambda t: (-300 * t, 0))
+    yield key(3_010_000, "A", "RELEASE")
+    yield key(3_010_000, "LEFTMOUSE", "RELEASE")
+    yield key(3_500_000, "W", "RELEASE")
+    yield key(3_600_000, "SPACE", "RELEASE")
+
+scenarios = [
+    Scenario("turnXYDrag", "Long look-around drag holding LMB", turnXYDrag),
+    Scenario("strafeXRappel", "Strafe left/right and rappel while holding RMB", strafeXRappel, [("rmb", "omit", "strafeXRappel")]),
+    Scenario("gearCyclingStorm", "Rapid gear cycling with G / Shift + G while strafing", gearCyclingStorm),
+    Scenario("saveLoadSpam", "Saving and loading camera states on all digit keys", saveLoadSpam),
+    Scenario("wheelStorm", "Mouse wheel moves and FOV changes", wheelStorm),
+    Scenario("wasdFlight", "WASD flight while looking around", wasdFlight),
+    Scenario("wasdFlightCamera", "WASD flight while looking around through a camera locked to view", wasdFlight, lockedCamera = True),
+]
+
+def getScenario(name: str) -> Scenario:
+    for scenario in scenarios:
+        if scenario.name == name:
+            return scenario
+    raise KeyError(f"unknown scenario \"{name}\", choose from: {', '.join(s.name for s in scenarios)}")
@@ -0,0 +1,377 @@
+# Camera bookmarks: any number of saved views per scene, each stored as one packed record of floats, so that all of them
+# are read in one go with foreach_get. The digit keys address the ten slots of the current page. Libraries are files
+# holding the same records, to share bookmarks between .blend files.
+
+from array import array
+import math
+import mmap
+import os
+import struct
+import sys
+
+import bpy
+from mathutils import Vector
+from mathutils import Quaternion
+from mathutils.kdtree import KDTree
+
+recordSize = 12 # position (3), rotation (4), view distance, lens, flags, 2 spare
+slotsPerPage = 10
+flagUsed = 1
+flagPerspective = 2
+maxUnindexedRecords = 64
+
+# library file: header, then a fixed-size UTF-8 name per page, then the records of all pages as little-endian floats
+libraryMagic = b"MSTRFBM\0"
+libraryVersion = 1
+libraryHeader = struct.Struct("<8sIIII") # magic, version, floats per record, page count, bytes per page name
+libraryPageNameSize = 64
+libraryExtension = ".mstrf"
+
+class CameraBookmark(bpy.types.PropertyGroup):
+    values: bpy.props.FloatVectorProperty(size = recordSize, options = {"HIDDEN"})
+
+class CameraBookmarkPage(bpy.types.PropertyGroup):
+    pass
+
+class CameraBookmarks(bpy.types.PropertyGroup):
+    records: bpy.props.CollectionProperty(type = CameraBookmark, options = {"HIDDEN"})
+    pages: bpy.props.CollectionProperty(type = CameraBookmarkPage, options = {"HIDDEN"})
+    page: bpy.props.IntProperty(options = {"HIDDEN"}, default = 0)
+    imminentRecord: bpy.props.FloatVectorProperty(size = recordSize, options = {"HIDDEN"})
+    imminentSlot: bpy.props.IntProperty(options = {"HIDDEN"}, default = -1)
+
+def packRecord(viewPos: Vector, rot: Quaternion, viewDist: float, lens: float, isPerspective: bool) -> array:
+    flags = flagUsed | (flagPerspective if isPerspective else 0)
+    return array('f', (viewPos[0], viewPos[1], viewPos[2], rot[0], rot[1], rot[2], rot[3], viewDist, lens, flags, 0.0, 0.0))
+
+def unpackRecord(record) -> tuple[Vector, Quaternion, float, float, bool]:
+    flags = int(record[9])
+    return Vector(record[0:3]), Quaternion(record[3:7]), record[7], record[8], (flags & flagPerspective) != 0
+
+def isRecordUsed(record) -> bool:
+    return (int(record[9]) & flagUsed) != 0
+
+def getRecordDirection(record) -> Vector:
+    viewDir = Vector((0, 0, -1))
+    viewDir.rotate(Quaternion(record[3:7]))
+    return viewDir
+
+class BookmarkIndex:
+    # k-d tree over the positions of the used records. Records saved after it was balanced are kept aside and checked
+    # one by one, until there are enough of them to make rebuilding the tree worthwhile.
+    __slots__ = 'tree', 'unindexed'
+
+    def __init__(self, store: "BookmarkStore"):
+        slots = [slot for slot in range(len(store)) if store.isUsed(slot)]
+        self.tree = KDTree(len(slots))
+        values = store.values
+        for slot in slots:
+            self.tree.insert(values[slot * recordSize:slot * recordSize + 3], slot)
+        self.tree.balance()
+        self.unindexed = set()
+
+    def findNearest(self, store: "BookmarkStore", viewPos: Vector, viewDir: Vector, angleWeight: float, count: int) -> list[tuple[float, int]]:
+        # pose distance = distance between positions + angle between view directions * angleWeight; as the angle term
+        # is never negative, the positional range of the count-th nearest pose contains all nearer poses
+        def getPoseDistance(slot: int) -> float:
+            record = store.getRecord(slot)
+            if not isRecordUsed(record):
+                return math.inf
+            angle = math.acos(max(-1.0, min(1.0, viewDir.dot(getRecordDirection(record)))))
+            return (Vector(record[0:3]) - viewPos).length + angle * angleWeight
+
+        unindexed = self.unindexed
+        candidates = {slot for _co, slot, _dist in self.tree.find_n(viewPos, count)} | unindexed
+        nearest = sorted((getPoseDistance(slot), slot) for slot in candidates)[:count]
+        if len(nearest) == count and nearest[-1][0] < math.inf:
+            candidates = {slot for _co, slot, _dist in self.tree.find_range(viewPos, nearest[-1][0])} | unindexed
+            nearest = sorted((getPoseDistance(slot), slot) for slot in candidates)[:count]
+        return [(distance, slot) for distance, slot in nearest if distance < math.inf]
+
+class BookmarkStore:
+    # the records of one scene, mirrored in a flat array; reads never touch RNA, writes go through to the scene
+    __slots__ = 'bookmarks', 'values', 'index'
+
+    def __init__(self, bookmarks: CameraBookmarks):
+        self.bookmarks = bookmarks
+        self.index = None
+        self.values = array('f', bytes(4 * recordSize * len(bookmarks.records)))
+        bookmarks.records.foreach_get("values", self.values)
+
+    def __len__(self) -> int:
+        return len(self.values) // recordSize
+
+    def getRecord(self, slot: int):
+        if slot < 0 or slot >= len(self):
+            return None
+        return self.values[slot * recordSize:(slot + 1) * recordSize]
+
+    def isUsed(self, slot: int) -> bool:
+        record = self.getRecord(slot)
+        return record is not None and isRecordUsed(record)
+
+    def setRecord(self, slot: int, record):
+        self.reserve(slot + 1)
+        self.values[slot * recordSize:(slot + 1) * recordSize] = array('f', record)
+        self.bookmarks.records[slot].values = record
+        if self.index is not None:
+            self.index.unindexed.add(slot)
+            if len(self.index.unindexed) > maxUnindexedRecords:
+                self.index = None
+
+    def commitImminent(self):
+        bookmarks = self.bookmarks
+        if bookmarks.imminentSlot >= 0:
+            self.setRecord(bookmarks.imminentSlot, bookmarks.imminentRecord)
+            bookmarks.imminentSlot = -1
+
+    def writeAll(self):
+        self.bookmarks.records.foreach_set("values", self.values)
+        self.index = None
+
+    def findNearest(self, viewPos: Vector, viewDir: Vector, angleWeight: float, count: int) -> list[tuple[float, int]]:
+        if self.index is None:
+            self.index = BookmarkIndex(self)
+        return self.index.findNearest(self, viewPos, viewDir, angleWeight, count)
+
+    def reserve(self, count: int):
+        # grows by whole pages, so that every page the digit keys can address exists and has a name
+        bookmarks = self.bookmarks
+        pageCount = math.ceil(count / slotsPerPage)
+        while len(bookmarks.pages) < pageCount:
+            bookmarks.pages.add().name = f"Page {len(bookmarks.pages) + 1}"
+        count = pageCount * slotsPerPage
+        while len(bookmarks.records) < count:
+            bookmarks.records.add()
+        if len(self.values) < count * recordSize:
+            self.values.extend(array('f', bytes(4 * (count * recordSize - len(self.values)))))
+
+    def getPageCount(self) -> int:
+        return max(1, len(self.bookmarks.pages), math.ceil(len(self) / slotsPerPage))
+
+    def getPageName(self, page: int) -> str:
+        pages = self.bookmarks.pages
+        return pages[page].name if page < len(pages) else f"Page {page + 1}"
+
+    def isPageUsed(self, page: int) -> bool:
+        return any(self.isUsed(slot) for slot in range(page * slotsPerPage, (page + 1) * slotsPerPage))
+
+    def cyclePage(self, backwards: bool) -> int:
+        # going past the last page opens a new, empty one, unless the last page is empty itself
+        bookmarks = self.bookmarks
+        pageCount = self.getPageCount()
+        page = bookmarks.page
+        if backwards:
+            page = (page - 1) % pageCount
+        elif page + 1 < pageCount or self.isPageUsed(page):
+            page = page + 1
+        else:
+            page = 0
+        bookmarks.page = page
+        return page
+
+    def getSlot(self, digit: int) -> int:
+        return self.bookmarks.page * slotsPerPage + digit
+
+def getBookmarkStore(scene: bpy.types.Scene) -> BookmarkStore:
+    bookmarks: CameraBookmarks = scene.mstrf_camera_bookmarks
+    store = BookmarkStore(bookmarks)
+    if len(store) == 0:
+        migrateLegacySaveStates(scene, store)
+    return store
+
+def migrateLegacySaveStates(scene: bpy.types.Scene, store: BookmarkStore):
+    # camera states saved by previous versions (ten slots, one property at a time) become the first page
+    legacy = getattr(scene, "mstrf_camera_save_states", None)
+    if legacy is None:
+        return
+    slots = [slot for slot in range(min(slotsPerPage, len(legacy.savedStates))) if legacy.usedStates[slot]]
+    if len(slots) > 0:
+        store.reserve(slotsPerPage)
+        for slot in slots:
+            state = legacy.savedStates[slot]
+            store.values[slot * recordSize:(slot + 1) * recordSize] = packRecord(state.viewPos, state.rot, state.viewDist, state.lens, state.isPerspective)
+        store.writeAll()
+    if 0 <= legacy.imminentSlot < slotsPerPage:
+        state = legacy.imminentState
+        store.bookmarks.imminentRecord = packRecord(state.viewPos, state.rot, state.viewDist, state.lens, state.isPerspective)
+        store.bookmarks.imminentSlot = legacy.imminentSlot
+        legacy.imminentSlot = -1
+
+def encodePageName(name: str) -> bytes:
+    encoded = name.encode("utf-8")[:libraryPageNameSize - 1].decode("utf-8", "ignore").encode("utf-8")
+    return encoded.ljust(libraryPageNameSize, b"\0")
+
+def writeLibrary(filepath: str, store: BookmarkStore) -> int:
+    # leaves the scene alone: the imminent record and the padding of the last page only go to the file
+    bookmarks = store.bookmarks
+    pageCount = store.getPageCount()
+    if bookmarks.imminentSlot >= 0:
+        pageCount = max(pageCount, bookmarks.imminentSlot // slotsPerPage + 1)
+    values = array('f', store.values)
+    values.extend(array('f', bytes(4 * (pageCount * slotsPerPage * recordSize - len(values)))))
+    if bookmarks.imminentSlot >= 0:
+        values[bookmarks.imminentSlot * recordSize:(bookmarks.imminentSlot + 1) * recordSize] = array('f', bookmarks.imminentRecord)
+    count = countUsedRecords(values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    with open(filepath, "wb") as file:
+        file.write(libraryHeader.pack(libraryMagic, libraryVersion, recordSize, pageCount, libraryPageNameSize))
+        file.write(b"".join(encodePageName(store.getPageName(page)) for page in range(pageCount)))
+        values.tofile(file)
+    return count
+
+def countUsedRecords(values: array) -> int:
+    return sum(1 for flags in values[9::recordSize] if int(flags) & flagUsed)
+
+def readLibrary(filepath: str) -> tuple[list[str], array]:
+    # returns the page names and the records of all pages, converted to this version's record size
+    if os.path.getsize(filepath) < libraryHeader.size:
+        raise ValueError("not a camera bookmark library")
+    with open(filepath, "rb") as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as view:
+        magic, version, fileRecordSize, pageCount, pageNameSize = libraryHeader.unpack_from(view)
+        if magic != libraryMagic:
+            raise ValueError("not a camera bookmark library")
+        if version > libraryVersion:
+            raise ValueError(f"library version {version} is newer than supported version {libraryVersion}")
+        recordsStart = libraryHeader.size + pageCount * pageNameSize
+        recordsEnd = recordsStart + pageCount * slotsPerPage * fileRecordSize * 4
+        if fileRecordSize < 10 or pageNameSize == 0 or len(view) < recordsEnd:
+            raise ValueError("library file is damaged")
+        names = [bytes(view[offset:offset + pageNameSize]).split(b"\0", 1)[0].decode("utf-8", "replace") \
+            for offset in range(libraryHeader.size, recordsStart, pageNameSize)]
+        values = array('f')
+        values.frombytes(view[recordsStart:recordsEnd])
+    if sys.byteorder != "little":
+        values.byteswap()
+    if fileRecordSize != recordSize:
+        # records of other versions: keep the fields both know, leave the rest zero
+        converted = array('f', bytes(4 * recordSize * pageCount * slotsPerPage))
+        for field in range(min(recordSize, fileRecordSize)):
+            converted[field::recordSize] = values[field::fileRecordSize]
+        values = converted
+    return names, values
+
+def importLibrary(store: BookmarkStore, names: list[str], values: array, merge: bool) -> int:
+    # merging keeps the scene's bookmarks and only replaces those under the same page name and digit
+    bookmarks = store.bookmarks
+    store.commitImminent()
+    if not merge:
+        bookmarks.records.clear()
+        bookmarks.pages.clear()
+        bookmarks.page = 0
+        store.values = array('f')
+        store.reserve(len(names) * slotsPerPage)
+        for page, name in enumerate(names):
+            bookmarks.pages[page].name = name
+        store.values = values
+        store.writeAll()
+        return countUsedRecords(values)
+    # only pages that exist, as getPageCount() counts a first page even in a scene without bookmarks
+    pageIndices = {}
+    for page in reversed(range(len(bookmarks.pages))):
+        pageIndices[bookmarks.pages[page].name] = page
+    existingPageCount = pageCount = len(bookmarks.pages)
+    targets = []
+    for name in names:
+        target = pageIndices.get(name)
+        if target is None:
+            target = pageIndices[name] = pageCount
+            pageCount += 1
+        targets.append(target)
+    store.reserve(pageCount * slotsPerPage)
+    pageSize = slotsPerPage * recordSize
+    newPages = set(range(existingPageCount, len(bookmarks.pages)))
+    for page, target in enumerate(targets):
+        source = page * pageSize
+        if target in newPages:
+            # nothing to keep on a page this import created, so copy it whole
+            newPages.discard(target)
+            bookmarks.pages[target].name = names[page]
+            store.values[target * pageSize:(target + 1) * pageSize] = values[source:source + pageSize]
+            continue
+        for digit in range(slotsPerPage):
+            record = values[source + digit * recordSize:source + (digit + 1) * recordSize]
+            if isRecordUsed(record):
+                destination = target * pageSize + digit * recordSize
+                store.values[destination:destination + recordSize] = record
+    store.writeAll()
+    return countUsedRecords(values)
+
+class ExportCameraBookmarks(bpy.types.Operator):
+    """Export the camera save states of the current scene to a library file"""
+    bl_idname = "view3d.mouse_strafing_export_bookmarks"
+    bl_label = "Export Camera Save States"
+    filepath: bpy.props.StringProperty(subtype = "FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default = "*" + libraryExtension, options = {"HIDDEN"})
+    def invoke(self, context, event):
+        if self.filepath == "":
+            self.filepath = "camera_save_states" + libraryExtension
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+    def execute(self, context):
+        filepath = self.filepath if self.filepath.endswith(libraryExtension) else self.filepath + libraryExtension
+        try:
+            count = writeLibrary(filepath, getBookmarkStore(context.scene))
+        except OSError as e:
+            self.report({"ERROR"}, f"Cannot write {filepath}: {e.strerror}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Exported {count} camera save states")
+        return {"FINISHED"}
+
+class ImportCameraBookmarks(bpy.types.Operator):
+    """Import camera save states from a library file into the current scene. Merging matches pages by name and save states by their number on the page"""
+    bl_idname = "view3d.mouse_strafing_import_bookmarks"
+    bl_label = "Import Camera Save States"
+    bl_options = {"REGISTER", "UNDO"}
+    filepath: bpy.props.StringProperty(subtype = "FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default = "*" + libraryExtension, options = {"HIDDEN"})
+    merge: bpy.props.BoolProperty(name = "Merge", description = "Keep the save states of the scene and only replace those with the same page name and number. Pages not renamed are called 'Page 1', 'Page 2' and so on in every file, so they match by position. Otherwise, all save states of the scene are replaced", default = True)
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+    def execute(self, context):
+        try:
+            names, values = readLibrary(self.filepath)
+        except OSError as e:
+            self.report({"ERROR"}, f"Cannot read {self.filepath}: {e.strerror}")
+            return {"CANCELLED"}
+        except ValueError as e:
+            self.report({"ERROR"}, f"Cannot read {self.filepath}: {e}")
+            return {"CANCELLED"}
+        count = importLibrary(getBookmarkStore(context.scene), names, values, self.merge)
+        self.report({"INFO"}, f"Imported {count} camera save states")
+        return {"FINISHED"}
+
+class RenameCameraBookmarkPage(bpy.types.Operator):
+    """Rename the current page of camera save states. Imports merge save states into the page with the same name"""
+    bl_idname = "view3d.mouse_strafing_rename_bookmark_page"
+    bl_label = "Rename Save State Page"
+    bl_options = {"REGISTER", "UNDO"}
+    name: bpy.props.StringProperty(name = "Name", description = "Name of the current page of camera save states")
+    def invoke(self, context, event):
+        store = getBookmarkStore(context.scene)
+        self.name = store.getPageName(store.bookmarks.page)
+        return context.window_manager.invoke_props_dialog(self)
+    def execute(self, context):
+        name = self.name.strip()
+        store = getBookmarkStore(context.scene)
+        bookmarks = store.bookmarks
+        if name == "":
+            self.report({"ERROR"}, "Page name must not be empty")
+            return {"CANCELLED"}
+        if any(page.name == name for index, page in enumerate(bookmarks.pages) if index != bookmarks.page):
+            self.report({"ERROR"}, f"There already is a page named \"{name}\"")
+            return {"CANCELLED"}
+        store.reserve((bookmarks.page + 1) * slotsPerPage) # a page only carries a name once it exists
+        bookmarks.pages[bookmarks.page].name = name
+        return {"FINISHED"}
+
+def drawViewMenu(self, context: bpy.types.Context):
+    self.layout.operator(RenameCameraBookmarkPage.bl_idname)
+
+def drawImportMenu(self, context: bpy.types.Context):
+    self.layout.operator(ImportCameraBookmarks.bl_idname, text = f"Camera Save States ({libraryExtension})")
+
+def drawExportMenu(self, context: bpy.types.Context):
+    self.layout.operator(ExportCameraBookmarks.bl_idname, text = f"Camera Save States ({libraryExtension})")
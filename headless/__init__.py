@@ -0,0 +1,41 @@
+# Headless stand-in for the parts of Blender (bpy, blf, mathutils) that the add-on uses, so the operator can be
+# constructed, invoked and fed events in plain CPython, e.g. for profiling in CI.
+#
+#   import headless
+#   addon = headless.loadAddon()
+#   session = headless.Session(addon)
+#   op = session.invoke("SPACE")
+#   session.press("LEFTMOUSE"); session.moveMouse(12, -3); session.release("LEFTMOUSE")
+#   session.release("SPACE")
+#
+# The stand-in modules are only put on sys.path when the real ones cannot be imported.
+
+import importlib.util
+import os
+import sys
+
+modulesPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "modules")
+addonPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def install() -> bool:
+    if modulesPath in sys.path:
+        return True
+    if importlib.util.find_spec("bpy") is not None:
+        return False
+    sys.path.insert(0, modulesPath)
+    return True
+
+def loadAddon(name: str = "mouse_strafing"):
+    install()
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(addonPath, "__init__.py"), submodule_search_locations = [addonPath])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+install()
+
+from .session import Session, gridMesh, cubeMesh, lookAt
+from mathutils import Vector, Quaternion, Matrix
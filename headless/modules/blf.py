@@ -0,0 +1,50 @@
+# Stand-in for Blender's blf font module. Drawing is a no-op; calls are counted so draw handlers can be profiled.
+
+SHADOW = 1 << 2
+ROTATION = 1 << 0
+CLIPPING = 1 << 1
+WORD_WRAP = 1 << 7
+
+callCounts = {}
+drawnTexts = []
+
+_state = {"size": 11.0, "position": (0.0, 0.0, 0.0), "color": (1.0, 1.0, 1.0, 1.0)}
+
+def _count(name: str):
+    callCounts[name] = callCounts.get(name, 0) + 1
+
+def resetCounters():
+    callCounts.clear()
+    drawnTexts.clear()
+
+def size(fontid: int, size: float, dpi: int = 72):
+    _count("size")
+    _state["size"] = size * dpi / 72
+
+def color(fontid: int, r: float, g: float, b: float, a: float):
+    _count("color")
+    _state["color"] = (r, g, b, a)
+
+def enable(fontid: int, option: int):
+    _count("enable")
+
+def disable(fontid: int, option: int):
+    _count("disable")
+
+def shadow(fontid: int, level: int, r: float, g: float, b: float, a: float):
+    _count("shadow")
+
+def shadow_offset(fontid: int, x: int, y: int):
+    _count("shadow_offset")
+
+def position(fontid: int, x: float, y: float, z: float):
+    _count("position")
+    _state["position"] = (x, y, z)
+
+def dimensions(fontid: int, text: str) -> tuple:
+    _count("dimensions")
+    return (len(text) * _state["size"] * 0.5, _state["size"])
+
+def draw(fontid: int, text: str):
+    _count("draw")
+    drawnTexts.append((text, _state["position"], _state["color"]))
@@ -0,0 +1,10 @@
+# Headless stand-in for Blender's bpy module. Only what the add-on uses is modelled; see headless/session.py for
+# how a window, 3D View and scene are assembled around it.
+
+from . import types
+from . import props
+from . import app
+from . import ops
+from . import utils
+
+context = types.Context()
@@ -0,0 +1,7 @@
+from . import timers
+from . import handlers
+
+version = (2, 93, 0)
+version_string = "2.93.0 (headless)"
+background = True
+binary_path = ""
@@ -0,0 +1,16 @@
+depsgraph_update_pre = []
+depsgraph_update_post = []
+load_pre = []
+load_post = []
+save_pre = []
+save_post = []
+frame_change_pre = []
+frame_change_post = []
+undo_pre = []
+undo_post = []
+redo_pre = []
+redo_post = []
+
+def persistent(function):
+    function._bpy_persistent = True
+    return function
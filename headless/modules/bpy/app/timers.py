@@ -0,0 +1,52 @@
+# Timers are kept in a plain list and only run when the headless session pumps them via run(). Like in Blender, timers
+# run without a window, area or region in context.
+
+import time
+
+_timers = []
+clock = time.perf_counter
+
+def register(function, first_interval: float = 0, persistent: bool = False):
+    _timers.append([clock() + first_interval, function])
+
+def unregister(function):
+    for timer in _timers:
+        if timer[1] == function:
+            _timers.remove(timer)
+            return
+    raise ValueError("Error: function is not registered")
+
+def is_registered(function) -> bool:
+    return any(timer[1] == function for timer in _timers)
+
+def pending() -> int:
+    return len(_timers)
+
+def clear():
+    _timers.clear()
+
+def run(now: float = None) -> int:
+    import bpy
+    now = clock() if now is None else now
+    due = [timer for timer in _timers if timer[0] <= now]
+    if not due:
+        return 0
+    context = bpy.context
+    window, area, region = context.window, context.area, context.region
+    context.window, context.area, context.region = None, None, None # region_data and space_data follow the area
+    try:
+        for timer in due:
+            if timer not in _timers:
+                continue
+            interval = timer[1]()
+            if interval is None:
+                if timer in _timers:
+                    _timers.remove(timer)
+            else:
+                timer[0] = now + interval
+    finally:
+        context.window, context.area, context.region = window, area, region
+    return len(due)
+
+def nextDue() -> float:
+    return min((timer[0] for timer in _timers), default = None)
@@ -0,0 +1,54 @@
+# bpy.ops.<category>.<name>() calls into registered add-on operators plus the few built-in operators the add-on uses.
+
+from . import types as _types
+from . import utils as _utils
+
+undoPushes = []
+
+def _viewPerspOrtho(context):
+    rv3d = context.region_data
+    if rv3d is None:
+        raise RuntimeError("Operator bpy.ops.view3d.view_persportho.poll() failed, context is incorrect")
+    rv3d.view_perspective = "PERSP" if rv3d.view_perspective == "ORTHO" else "ORTHO"
+    return {"FINISHED"}
+
+def _undoPush(context, message: str = "Add an undo step *function may be moved*"):
+    undoPushes.append(message)
+    return {"FINISHED"}
+
+builtinOperators = {
+    "view3d.view_persportho": _viewPerspOrtho,
+    "ed.undo_push": _undoPush,
+}
+
+class _OperatorCall:
+    __slots__ = "idname",
+
+    def __init__(self, idname: str):
+        self.idname = idname
+
+    def __call__(self, *args, **keywords):
+        import bpy
+        if self.idname in builtinOperators:
+            return builtinOperators[self.idname](bpy.context, **keywords)
+        for cls in _utils.registeredClasses:
+            if issubclass(cls, _types.Operator) and cls.bl_idname == self.idname:
+                operator = cls()
+                for key, value in keywords.items():
+                    setattr(operator, key, value)
+                if hasattr(operator, "execute"):
+                    return operator.execute(bpy.context)
+                return operator.invoke(bpy.context, _types.Event())
+        raise AttributeError(f"Calling operator \"bpy.ops.{self.idname}\" error, could not be found")
+
+class _OperatorCategory:
+    __slots__ = "category",
+
+    def __init__(self, category: str):
+        self.category = category
+
+    def __getattr__(self, name: str):
+        return _OperatorCall(self.category + "." + name)
+
+def __getattr__(category: str):
+    return _OperatorCategory(category)
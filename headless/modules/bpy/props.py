@@ -0,0 +1,53 @@
+# Property definitions return deferred descriptions, just like Blender's bpy.props, which bpy.types turns into
+# per-instance storage when a class is created or a property is assigned to a type.
+
+class _PropertyDeferred:
+    __slots__ = "function", "keywords"
+
+    def __init__(self, function, keywords: dict):
+        self.function = function
+        self.keywords = keywords
+
+    def __repr__(self):
+        return f"<_PropertyDeferred, {self.function.__name__}, {self.keywords}>"
+
+def _deferred(function):
+    def define(**keywords):
+        return _PropertyDeferred(define, keywords)
+    define.__name__ = function.__name__
+    define.__doc__ = function.__doc__
+    return define
+
+@_deferred
+def BoolProperty(): pass
+
+@_deferred
+def BoolVectorProperty(): pass
+
+@_deferred
+def IntProperty(): pass
+
+@_deferred
+def IntVectorProperty(): pass
+
+@_deferred
+def FloatProperty(): pass
+
+@_deferred
+def FloatVectorProperty(): pass
+
+@_deferred
+def StringProperty(): pass
+
+@_deferred
+def EnumProperty(): pass
+
+@_deferred
+def PointerProperty(): pass
+
+@_deferred
+def CollectionProperty(): pass
+
+def RemoveProperty(cls, attr: str):
+    if attr in cls.__dict__:
+        delattr(cls, attr)
@@ -0,0 +1,797 @@
+# Headless stand-ins for the bpy.types structures the add-on touches. RNA properties declared with bpy.props are
+# backed by plain per-instance storage and fire their update callbacks on assignment, like in Blender.
+
+import itertools
+
+from mathutils import Vector, Quaternion, Matrix
+
+from . import props as _props
+
+def _context():
+    import bpy
+    return bpy.context
+
+class bpy_prop_array(list):
+    # element assignments run the owning property's update callback like they do in Blender
+    __slots__ = "_owner", "_update"
+
+    def __init__(self, values = (), owner = None, update = None):
+        list.__init__(self, values)
+        self._owner = owner
+        self._update = update
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            if len(value) != len(self[index]):
+                raise ValueError("bpy_prop_array: slice assignment cannot change the array length")
+        list.__setitem__(self, index, value)
+        if self._update is not None:
+            self._update(self._owner, _context())
+
+    def foreach_get(self, seq):
+        for i, v in enumerate(self):
+            seq[i] = v
+
+    def foreach_set(self, seq):
+        for i in range(len(self)):
+            list.__setitem__(self, i, type(self[i])(seq[i]))
+
+class bpy_prop_collection:
+    __slots__ = "_items", "_type"
+
+    def __init__(self, itemType = None, items = ()):
+        self._items = list(items)
+        self._type = itemType
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return len(self._items) > 0
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for item in self._items:
+                if getattr(item, "name", None) == key:
+                    return item
+            raise KeyError(f"bpy_prop_collection[key]: key \"{key}\" not found")
+        return self._items[key]
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(getattr(item, "name", None) == key for item in self._items)
+        return key in self._items
+
+    def get(self, key, default = None):
+        try:
+            return self[key]
+        except (KeyError, IndexError):
+            return default
+
+    def find(self, key: str) -> int:
+        for i, item in enumerate(self._items):
+            if getattr(item, "name", None) == key:
+                return i
+        return -1
+
+    def keys(self):
+        return [getattr(item, "name", "") for item in self._items]
+
+    def values(self):
+        return list(self._items)
+
+    def items(self):
+        return [(getattr(item, "name", ""), item) for item in self._items]
+
+    def add(self):
+        item = self._type()
+        self._items.append(item)
+        return item
+
+    def remove(self, index):
+        if not isinstance(index, int):
+            index = self._items.index(index)
+        del self._items[index]
+
+    def move(self, fromIndex: int, toIndex: int):
+        if 0 <= fromIndex < len(self._items) and 0 <= toIndex < len(self._items):
+            self._items.insert(toIndex, self._items.pop(fromIndex))
+
+    def clear(self):
+        self._items.clear()
+
+    def foreach_get(self, attr: str, seq):
+        i = 0
+        for item in self._items:
+            value = getattr(item, attr)
+            if isinstance(value, (list, tuple, Vector, Quaternion)):
+                for v in value:
+                    seq[i] = v
+                    i += 1
+            else:
+                seq[i] = value
+                i += 1
+        if i != len(seq):
+            raise RuntimeError(f"internal error setting the array from sequence, expected {i} items, got {len(seq)}")
+
+    def foreach_set(self, attr: str, seq):
+        i = 0
+        for item in self._items:
+            current = getattr(item, attr)
+            if isinstance(current, (list, tuple, Vector, Quaternion)):
+                size = len(current)
+                setattr(item, attr, [seq[j] for j in range(i, i + size)])
+                i += size
+            else:
+                setattr(item, attr, seq[i])
+                i += 1
+        if i != len(seq):
+            raise RuntimeError(f"internal error setting the array from sequence, expected {i} items, got {len(seq)}")
+
+def _enumIdentifiers(keywords: dict) -> list:
+    items = keywords.get("items", ())
+    if callable(items):
+        return []
+    return [item[0] for item in items]
+
+class _RNAProperty:
+    __slots__ = "name", "deferred"
+
+    def __init__(self, name: str, deferred: _props._PropertyDeferred):
+        self.name = name
+        self.deferred = deferred
+
+    def createDefault(self, instance = None):
+        function, keywords = self.deferred.function, self.deferred.keywords
+        if function is _props.BoolProperty:
+            return bool(keywords.get("default", False))
+        if function is _props.IntProperty:
+            return int(keywords.get("default", 0))
+        if function is _props.FloatProperty:
+            return float(keywords.get("default", 0.0))
+        if function is _props.StringProperty:
+            return str(keywords.get("default", ""))
+        if function is _props.EnumProperty:
+            identifiers = _enumIdentifiers(keywords)
+            return keywords.get("default", identifiers[0] if identifiers else "")
+        if function in (_props.BoolVectorProperty, _props.IntVectorProperty, _props.FloatVectorProperty):
+            elementType = {_props.BoolVectorProperty: bool, _props.IntVectorProperty: int, _props.FloatVectorProperty: float}[function]
+            size = keywords.get("size", 3)
+            default = keywords.get("default", [elementType()] * size)
+            return bpy_prop_array((elementType(v) for v in default), instance, keywords.get("update"))
+        if function is _props.PointerProperty:
+            return keywords["type"]()
+        if function is _props.CollectionProperty:
+            return bpy_prop_collection(keywords["type"])
+        raise TypeError(f"unsupported property function {function.__name__}")
+
+    def coerce(self, current, value):
+        function, keywords = self.deferred.function, self.deferred.keywords
+        if function is _props.BoolProperty:
+            return bool(value)
+        if function in (_props.IntProperty, _props.FloatProperty):
+            value = int(value) if function is _props.IntProperty else float(value)
+            if "min" in keywords and value < keywords["min"]:
+                value = type(value)(keywords["min"])
+            if "max" in keywords and value > keywords["max"]:
+                value = type(value)(keywords["max"])
+            return value
+        if function is _props.StringProperty:
+            return str(value)
+        if function is _props.EnumProperty:
+            identifiers = _enumIdentifiers(keywords)
+            if identifiers and value not in identifiers:
+                raise TypeError(f"bpy_struct: item.attr = val: enum \"{value}\" not found in {tuple(identifiers)}")
+            return value
+        if function in (_props.BoolVectorProperty, _props.IntVectorProperty, _props.FloatVectorProperty):
+            values = list(value)
+            if len(values) != len(current):
+                raise ValueError(f"bpy_struct: item.attr = val: sequences of dimension 0 should contain {len(current)} items, not {len(values)}")
+            elementType = type(current[0]) if len(current) > 0 else float
+            return bpy_prop_array((elementType(v) for v in values), current._owner, current._update)
+        raise AttributeError(f"bpy_struct: attribute \"{self.name}\" from \"{type(current).__name__}\" is read-only")
+
+    def storage(self, instance) -> dict:
+        try:
+            return instance.__dict__["_rna"]
+        except KeyError:
+            return instance.__dict__.setdefault("_rna", {})
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.deferred
+        storage = self.storage(instance)
+        try:
+            return storage[self.name]
+        except KeyError:
+            value = storage[self.name] = self.createDefault(instance)
+            return value
+
+    def __set__(self, instance, value):
+        storage = self.storage(instance)
+        current = self.__get__(instance, type(instance))
+        storage[self.name] = self.coerce(current, value)
+        update = self.deferred.keywords.get("update")
+        if update is not None:
+            update(instance, _context())
+
+class _StructMeta(type):
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        for attr, annotation in namespace.get("__annotations__", {}).items():
+            if isinstance(annotation, _props._PropertyDeferred):
+                type.__setattr__(cls, attr, _RNAProperty(attr, annotation))
+
+    def __setattr__(cls, attr, value):
+        if isinstance(value, _props._PropertyDeferred):
+            value = _RNAProperty(attr, value)
+        type.__setattr__(cls, attr, value)
+
+_pointerCounter = itertools.count(0x10000, 0x100)
+
+class bpy_struct(metaclass = _StructMeta):
+    def as_pointer(self) -> int:
+        try:
+            return self.__dict__["_pointer"]
+        except KeyError:
+            return self.__dict__.setdefault("_pointer", next(_pointerCounter))
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return id(self)
+
+_removedClasses = {}
+
+def _removeStruct(struct: bpy_struct):
+    # like Blender once the data behind a struct is freed: every access raises, only identity still works
+    cls = type(struct)
+    if cls in _removedClasses.values():
+        return
+    removed = _removedClasses.get(cls)
+    if removed is None:
+        def raiseRemoved(self, *args):
+            raise ReferenceError(f"StructRNA of type {cls.__name__} has been removed")
+        removed = _removedClasses[cls] = type(cls)(cls.__name__, (cls,), {"__getattribute__": raiseRemoved, "__setattr__": raiseRemoved})
+    struct.__class__ = removed
+
+class PropertyGroup(bpy_struct):
+    name: _props.StringProperty()
+
+class ID(bpy_struct):
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.is_evaluated = False
+        self.original = self
+        self.users = 1
+
+    @property
+    def name_full(self) -> str:
+        return self.name
+
+    def evaluated_get(self, depsgraph):
+        return self
+
+class AddonPreferences(bpy_struct):
+    bl_idname = ""
+
+    @property
+    def layout(self):
+        return UILayout()
+
+class Operator(bpy_struct):
+    bl_idname = ""
+    bl_label = ""
+    bl_options = set()
+
+    def report(self, type, message: str):
+        print(f"{self.bl_idname}: {', '.join(sorted(type))}: {message}")
+
+class Menu(bpy_struct):
+    bl_idname = ""
+    bl_label = ""
+    drawFunctions = None
+
+    @property
+    def layout(self):
+        return UILayout()
+
+    @classmethod
+    def append(cls, draw_func):
+        if cls.__dict__.get("drawFunctions") is None:
+            cls.drawFunctions = []
+        cls.drawFunctions.append(draw_func)
+
+    @classmethod
+    def remove(cls, draw_func):
+        if cls.__dict__.get("drawFunctions") is not None and draw_func in cls.drawFunctions:
+            cls.drawFunctions.remove(draw_func)
+
+class TOPBAR_MT_file_import(Menu):
+    bl_idname = "TOPBAR_MT_file_import"
+
+class TOPBAR_MT_file_export(Menu):
+    bl_idname = "TOPBAR_MT_file_export"
+
+class VIEW3D_MT_view(Menu):
+    bl_idname = "VIEW3D_MT_view"
+
+class UILayout(bpy_struct):
+    def __getattr__(self, name):
+        def element(*args, **kwargs):
+            return UILayout()
+        return element
+
+class Event:
+    def __init__(self, type: str = "NONE", value: str = "NOTHING", shift: bool = False, ctrl: bool = False, alt: bool = False, oskey: bool = False, \
+            mouse_x: int = 0, mouse_y: int = 0, mouse_prev_x: int = 0, mouse_prev_y: int = 0, is_repeat: bool = False):
+        self.type = type
+        self.value = value
+        self.shift, self.ctrl, self.alt, self.oskey = shift, ctrl, alt, oskey
+        self.mouse_x, self.mouse_y = mouse_x, mouse_y
+        self.mouse_prev_x, self.mouse_prev_y = mouse_prev_x, mouse_prev_y
+        self.mouse_region_x, self.mouse_region_y = mouse_x, mouse_y
+        self.is_repeat = is_repeat
+
+    def __repr__(self):
+        return f"<Event {self.type} {self.value} ({self.mouse_x}, {self.mouse_y})>"
+
+class Camera(ID):
+    def __new__(cls, other = None, *args, **kwargs):
+        if isinstance(other, cls):
+            return other
+        return super().__new__(cls)
+
+    def __init__(self, name = "Camera"):
+        if isinstance(name, Camera):
+            return
+        super().__init__(name)
+        self.lens = 50.0
+        self.sensor_width = 36.0
+        self.sensor_height = 24.0
+        self.sensor_fit = "AUTO"
+        self.type = "PERSP"
+        self.clip_start = 0.1
+        self.clip_end = 1000.0
+
+class MeshVertex:
+    __slots__ = "co", "index"
+
+    def __init__(self, co, index: int):
+        self.co = Vector(co)
+        self.index = index
+
+class MeshLoop:
+    __slots__ = "vertex_index", "index"
+
+    def __init__(self, vertex_index: int, index: int):
+        self.vertex_index = vertex_index
+        self.index = index
+
+class MeshPolygon:
+    __slots__ = "vertices", "index", "normal"
+
+    def __init__(self, vertices, index: int, normal: Vector):
+        self.vertices = tuple(vertices)
+        self.index = index
+        self.normal = normal
+
+class Mesh(ID):
+    def __init__(self, name = "Mesh", vertices = (), polygons = ()):
+        super().__init__(name)
+        self.vertices = bpy_prop_collection(None, [MeshVertex(co, i) for i, co in enumerate(vertices)])
+        self.polygons = bpy_prop_collection(None, [MeshPolygon(p, i, _polygonNormal(vertices, p)) for i, p in enumerate(polygons)])
+        self.loops = bpy_prop_collection(None, [MeshLoop(v, i) for i, v in enumerate(v for p in polygons for v in p)])
+        self.shape_keys = None
+        if len(self.vertices) > 0:
+            self._boundsMin = tuple(min(v.co[i] for v in self.vertices) for i in range(3))
+            self._boundsMax = tuple(max(v.co[i] for v in self.vertices) for i in range(3))
+        else:
+            self._boundsMin = self._boundsMax = (0.0, 0.0, 0.0)
+
+def _polygonNormal(vertices, polygon) -> Vector:
+    normal = Vector((0.0, 0.0, 0.0))
+    points = [Vector(vertices[i]) for i in polygon]
+    for a, b in zip(points, points[1:] + points[:1]):
+        normal = normal + Vector(((a[1] - b[1]) * (a[2] + b[2]), (a[2] - b[2]) * (a[0] + b[0]), (a[0] - b[0]) * (a[1] + b[1])))
+    return normal.normalized()
+
+class Object(ID):
+    def __init__(self, name = "Object", data = None):
+        super().__init__(name)
+        self.data = data
+        self.type = "CAMERA" if isinstance(data, Camera) else ("MESH" if isinstance(data, Mesh) else "EMPTY")
+        self._matrix = Matrix.Identity(4)
+        self.modifiers = bpy_prop_collection(None)
+        self.hide_viewport = False
+        self._hidden = False
+        self.instance_type = "NONE"
+        self.instance_collection = None
+
+    @property
+    def matrix_local(self) -> Matrix:
+        return self._matrix.copy()
+
+    @matrix_local.setter
+    def matrix_local(self, matrix):
+        self._matrix = Matrix(matrix)
+
+    matrix_world = matrix_local
+    matrix_basis = matrix_local
+
+    @property
+    def location(self) -> Vector:
+        return self._matrix.translation
+
+    @location.setter
+    def location(self, value):
+        self._matrix.translation = value
+
+    @property
+    def bound_box(self) -> list:
+        if self.type != "MESH":
+            return [(0.0, 0.0, 0.0)] * 8
+        (x0, y0, z0), (x1, y1, z1) = self.data._boundsMin, self.data._boundsMax
+        # corner order matches Blender: [0] is the minimum, [6] the maximum
+        return [(x0, y0, z0), (x0, y0, z1), (x0, y1, z1), (x0, y1, z0), (x1, y0, z0), (x1, y0, z1), (x1, y1, z1), (x1, y1, z0)]
+
+    def hide_get(self, view_layer = None) -> bool:
+        return self._hidden
+
+    def hide_set(self, state: bool, view_layer = None):
+        self._hidden = state
+
+    def visible_get(self, view_layer = None, viewport = None) -> bool:
+        return not self._hidden and not self.hide_viewport
+
+class Collection(ID):
+    def __init__(self, name = "Collection", objects = ()):
+        super().__init__(name)
+        self.objects = bpy_prop_collection(Object, objects)
+        self.instance_offset = Vector((0.0, 0.0, 0.0))
+
+def _objectInstances(objects):
+    # (object, world matrix, instancer) for every object and every object instanced through a collection
+    for obj in objects:
+        yield obj, obj.matrix_world, None
+        if obj.instance_type == "COLLECTION" and obj.instance_collection is not None:
+            offset = Matrix.Translation(-obj.instance_collection.instance_offset)
+            for child, matrix, _parent in _objectInstances(obj.instance_collection.objects):
+                yield child, obj.matrix_world @ offset @ matrix, obj
+
+class UnitSettings(bpy_struct):
+    def __init__(self):
+        self.system = "METRIC"
+        self.scale_length = 1.0
+
+class RenderSettings(bpy_struct):
+    def __init__(self):
+        self.resolution_x = 1920
+        self.resolution_y = 1080
+        self.pixel_aspect_x = 1.0
+        self.pixel_aspect_y = 1.0
+
+class Scene(ID):
+    def __init__(self, name = "Scene"):
+        super().__init__(name)
+        self.unit_settings = UnitSettings()
+        self.render = RenderSettings()
+        self.objects = bpy_prop_collection(Object)
+        self.camera = None
+
+    def ray_cast(self, depsgraph, origin, direction, distance: float = 1.70141e+38) -> tuple:
+        origin, direction = Vector(origin), Vector(direction).normalized()
+        best = (False, Vector((0.0, 0.0, 0.0)), Vector((0.0, 0.0, 0.0)), -1, None, Matrix.Identity(4))
+        bestDistance = distance
+        for obj, matrix, instancer in _objectInstances(self.objects):
+            if obj.type != "MESH" or (instancer is None and not obj.visible_get()):
+                continue
+            inverse = matrix.inverted()
+            localOrigin = inverse @ origin
+            localDirection = inverse.to_3x3() @ direction
+            for polygon in obj.data.polygons:
+                for a, b, c in _fan(polygon.vertices):
+                    t = _intersectRayTriangle(localOrigin, localDirection, obj.data.vertices[a].co, obj.data.vertices[b].co, obj.data.vertices[c].co)
+                    if t is None:
+                        continue
+                    location = matrix @ (localOrigin + localDirection * t)
+                    worldDistance = (location - origin).length
+                    if worldDistance < bestDistance:
+                        bestDistance = worldDistance
+                        normal = inverse.to_3x3().transposed() @ polygon.normal
+                        best = (True, location, normal.normalized(), polygon.index, obj, matrix)
+        return best
+
+def _fan(vertices):
+    for i in range(1, len(vertices) - 1):
+        yield vertices[0], vertices[i], vertices[i + 1]
+
+def _intersectRayTriangle(origin, direction, v0, v1, v2):
+    e1x, e1y, e1z = v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2]
+    e2x, e2y, e2z = v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2]
+    dx, dy, dz = direction[0], direction[1], direction[2]
+    px, py, pz = dy * e2z - dz * e2y, dz * e2x - dx * e2z, dx * e2y - dy * e2x
+    det = e1x * px + e1y * py + e1z * pz
+    if -1e-12 < det < 1e-12:
+        return None
+    inv = 1.0 / det
+    tx, ty, tz = origin[0] - v0[0], origin[1] - v0[1], origin[2] - v0[2]
+    u = (tx * px + ty * py + tz * pz) * inv
+    if u < 0.0 or u > 1.0:
+        return None
+    qx, qy, qz = ty * e1z - tz * e1y, tz * e1x - tx * e1z, tx * e1y - ty * e1x
+    v = (dx * qx + dy * qy + dz * qz) * inv
+    if v < 0.0 or u + v > 1.0:
+        return None
+    t = (e2x * qx + e2y * qy + e2z * qz) * inv
+    return t if t >= 0.0 else None
+
+class DepsgraphUpdate(bpy_struct):
+    def __init__(self, id: ID, is_updated_geometry: bool = False, is_updated_transform: bool = False, is_updated_shading: bool = False):
+        self.id = id
+        self.is_updated_geometry = is_updated_geometry
+        self.is_updated_transform = is_updated_transform
+        self.is_updated_shading = is_updated_shading
+
+class DepsgraphObjectInstance(bpy_struct):
+    def __init__(self, object: Object, matrix_world: Matrix, is_instance: bool = False, instance_object: Object = None):
+        self.object = object
+        self.matrix_world = matrix_world
+        self.is_instance = is_instance
+        self.instance_object = instance_object
+        self.parent = instance_object
+
+class Depsgraph(bpy_struct):
+    def __init__(self, scene: Scene, view_layer = None):
+        self.scene = scene
+        self.view_layer = view_layer
+        self.updates = bpy_prop_collection(DepsgraphUpdate)
+
+    @property
+    def objects(self):
+        return self.scene.objects
+
+    @property
+    def object_instances(self):
+        for obj, matrix, instancer in _objectInstances(self.scene.objects):
+            yield DepsgraphObjectInstance(obj, matrix, instancer is not None, instancer)
+
+class ViewLayer(bpy_struct):
+    def __init__(self, scene: Scene):
+        self.name = "ViewLayer"
+        self.depsgraph = Depsgraph(scene, self)
+        self.updateCount = 0
+
+    def update(self):
+        self.updateCount += 1
+
+class Shading(bpy_struct):
+    def __init__(self):
+        self.show_backface_culling = False
+        self.type = "SOLID"
+
+class RegionView3D(bpy_struct):
+    def __init__(self):
+        self._location = Vector((0.0, 0.0, 0.0))
+        self._rotation = Quaternion()
+        self.view_distance = 10.0
+        self.view_perspective = "PERSP"
+        self._cameraOffset = [0.0, 0.0]
+        self.writeCount = 0
+
+    @property
+    def view_location(self) -> Vector:
+        return self._location.copy()
+
+    @view_location.setter
+    def view_location(self, value):
+        self.writeCount += 1
+        self._location = Vector(value)
+
+    @property
+    def view_rotation(self) -> Quaternion:
+        return self._rotation.copy()
+
+    @view_rotation.setter
+    def view_rotation(self, value):
+        self.writeCount += 1
+        self._rotation = Quaternion(value)
+
+    @property
+    def view_camera_offset(self) -> tuple:
+        return tuple(self._cameraOffset)
+
+    @view_camera_offset.setter
+    def view_camera_offset(self, value):
+        self._cameraOffset = [float(value[0]), float(value[1])]
+
+    @property
+    def is_perspective(self) -> bool:
+        return self.view_perspective != "ORTHO"
+
+    @is_perspective.setter
+    def is_perspective(self, value: bool):
+        self.view_perspective = "PERSP" if value else "ORTHO"
+
+class Space(bpy_struct):
+    type = "EMPTY"
+
+class SpaceView3D(Space):
+    type = "VIEW_3D"
+    _drawHandlers = {}
+    _drawHandleCounter = itertools.count(1)
+
+    def __init__(self, quadView: bool = False):
+        self.lens = 50.0
+        self.clip_start = 0.01
+        self.clip_end = 1000.0
+        self.lock_camera = False
+        self.camera = None
+        self.shading = Shading()
+        self.region_3d = RegionView3D()
+        self.region_quadviews = bpy_prop_collection(RegionView3D, [RegionView3D() for _i in range(3)] + [self.region_3d] if quadView else [])
+
+    @classmethod
+    def draw_handler_add(cls, callback, args: tuple, region_type: str, draw_type: str):
+        handle = next(cls._drawHandleCounter)
+        cls._drawHandlers[handle] = (callback, args, region_type, draw_type)
+        return handle
+
+    @classmethod
+    def draw_handler_remove(cls, handle, region_type: str):
+        if handle not in cls._drawHandlers:
+            raise ValueError("draw_handler_remove(handler): handler doesn't exist")
+        del cls._drawHandlers[handle]
+
+class Region(bpy_struct):
+    def __init__(self, type: str = "WINDOW", x: int = 0, y: int = 0, width: int = 1920, height: int = 1080):
+        self.type = type
+        self.x, self.y = x, y
+        self.width, self.height = width, height
+        self.redrawCount = 0
+
+    def tag_redraw(self):
+        self.redrawCount += 1
+
+class Area(bpy_struct):
+    def __init__(self, space: Space, regions: list):
+        self.type = space.type
+        self.spaces = bpy_prop_collection(Space, [space])
+        self.regions = bpy_prop_collection(Region, regions)
+        self.redrawCount = 0
+
+    @property
+    def width(self) -> int:
+        return max(region.x + region.width for region in self.regions)
+
+    @property
+    def height(self) -> int:
+        return max(region.y + region.height for region in self.regions)
+
+    def tag_redraw(self):
+        self.redrawCount += 1
+
+class Window(bpy_struct):
+    def __init__(self, view_layer: ViewLayer = None):
+        self.view_layer = view_layer
+        self.cursor = "DEFAULT"
+        self.mouse = [0, 0]
+
+    def cursor_set(self, cursor: str):
+        self.cursor = cursor
+
+    def cursor_warp(self, x: int, y: int):
+        self.mouse = [int(x), int(y)]
+
+class KeyMapItem(bpy_struct):
+    def __init__(self, idname: str, type: str, value: str, **keywords):
+        self.idname, self.type, self.value = idname, type, value
+        self.active = True
+        for key, value in keywords.items():
+            setattr(self, key, value)
+
+class KeyMapItems(bpy_prop_collection):
+    __slots__ = ()
+
+    def new(self, idname: str, type: str, value: str, head: bool = False, **keywords):
+        item = KeyMapItem(idname, type, value, **keywords)
+        if head:
+            self._items.insert(0, item)
+        else:
+            self._items.append(item)
+        return item
+
+class KeyMap(bpy_struct):
+    def __init__(self, name: str, space_type: str = "EMPTY", region_type: str = "WINDOW", modal: bool = False):
+        self.name, self.space_type, self.region_type, self.is_modal = name, space_type, region_type, modal
+        self.keymap_items = KeyMapItems(KeyMapItem)
+
+class KeyMaps(bpy_prop_collection):
+    __slots__ = ()
+
+    def new(self, name: str, space_type: str = "EMPTY", region_type: str = "WINDOW", modal: bool = False, tool: bool = False):
+        keymap = KeyMap(name, space_type, region_type, modal)
+        self._items.append(keymap)
+        return keymap
+
+class KeyConfig(bpy_struct):
+    def __init__(self, name: str):
+        self.name = name
+        self.keymaps = KeyMaps(KeyMap)
+
+class KeyConfigurations(bpy_struct):
+    def __init__(self):
+        self.addon = KeyConfig("Blender addon")
+        self.user = KeyConfig("Blender user")
+        self.active = self.user
+
+class WindowManager(ID):
+    def __init__(self):
+        super().__init__("WinMan")
+        self.keyconfigs = KeyConfigurations()
+        self.modalHandlers = []
+
+    def modal_handler_add(self, operator) -> bool:
+        self.modalHandlers.append(operator)
+        return True
+
+    def fileselect_add(self, operator):
+        pass
+
+    def invoke_props_dialog(self, operator, width: int = 300):
+        return {"RUNNING_MODAL"}
+
+class PreferencesSystem(bpy_struct):
+    def __init__(self):
+        self.ui_scale = 1.0
+        self.dpi = 72
+
+class Addon(bpy_struct):
+    def __init__(self, module: str, preferences = None):
+        self.module = module
+        self.preferences = preferences
+
+class Addons(dict):
+    pass
+
+class Preferences(bpy_struct):
+    def __init__(self):
+        self.addons = Addons()
+        self.system = PreferencesSystem()
+        self.use_preferences_save = False
+
+class Context(bpy_struct):
+    def __init__(self):
+        self.preferences = Preferences()
+        self.window_manager = WindowManager()
+        self.window = None
+        self.area = None
+        self.region = None
+        self.scene = None
+        self.view_layer = None
+
+    @property
+    def space_data(self):
+        return self.area.spaces[0] if self.area is not None else None
+
+    @property
+    def region_data(self):
+        space = self.space_data
+        if space is None or space.type != "VIEW_3D":
+            return None
+        if not space.region_quadviews:
+            return space.region_3d
+        windowRegions = [region for region in self.area.regions if region.type == "WINDOW"]
+        return space.region_quadviews[windowRegions.index(self.region)] if self.region in windowRegions else space.region_3d
+
+    @property
+    def visible_objects(self) -> list:
+        return [obj for obj in self.scene.objects if obj.visible_get()] if self.scene is not None else []
+
+    def evaluated_depsgraph_get(self) -> Depsgraph:
+        return self.view_layer.depsgraph
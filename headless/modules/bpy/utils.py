@@ -0,0 +1,19 @@
+from . import types as _types
+
+registeredClasses = []
+
+def register_class(cls):
+    if cls in registeredClasses:
+        raise ValueError(f"register_class(...): already registered as a subclass '{cls.__name__}'")
+    registeredClasses.append(cls)
+    if issubclass(cls, _types.AddonPreferences):
+        import bpy
+        bpy.context.preferences.addons[cls.bl_idname] = _types.Addon(cls.bl_idname, cls())
+
+def unregister_class(cls):
+    if cls not in registeredClasses:
+        raise RuntimeError(f"unregister_class(...): missing bl_rna attribute from '{cls.__name__}'")
+    registeredClasses.remove(cls)
+    if issubclass(cls, _types.AddonPreferences):
+        import bpy
+        bpy.context.preferences.addons.pop(cls.bl_idname, None)
@@ -0,0 +1,563 @@
+# Pure-Python stand-in for the subset of Blender's mathutils module used by the add-on.
+# Conventions follow Blender: quaternions are (w, x, y, z), matrices are row-major and multiply column vectors.
+
+import math
+
+def _floats(seq) -> list:
+    return [float(v) for v in seq]
+
+class Vector:
+    __slots__ = "_v",
+
+    def __init__(self, seq = (0.0, 0.0, 0.0)):
+        self._v = _floats(seq)
+
+    def __len__(self):
+        return len(self._v)
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._v[index])
+        return self._v[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = _floats(value)
+            if len(values) != len(self._v[index]):
+                raise ValueError("Vector slice assignment: size mismatch")
+            self._v[index] = values
+        else:
+            self._v[index] = float(value)
+
+    def __repr__(self):
+        return "Vector((" + ", ".join(f"{v:.4f}" for v in self._v) + "))"
+
+    def __eq__(self, other):
+        try:
+            return len(other) == len(self._v) and all(a == b for a, b in zip(self._v, other))
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def _check(self, other):
+        if len(other) != len(self._v):
+            raise ValueError("Vector addition: vectors must have the same dimensions for this operation")
+        return other
+
+    def __add__(self, other):
+        return Vector([a + b for a, b in zip(self._v, self._check(other))])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vector([a - b for a, b in zip(self._v, self._check(other))])
+
+    def __rsub__(self, other):
+        return Vector([b - a for a, b in zip(self._v, self._check(other))])
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Vector([a * other for a in self._v])
+        if isinstance(other, Vector):
+            return Vector([a * b for a, b in zip(self._v, self._check(other))])
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if other == 0:
+            raise ZeroDivisionError("Vector division: divide by zero error")
+        return Vector([a / other for a in self._v])
+
+    def __neg__(self):
+        return Vector([-a for a in self._v])
+
+    def __pos__(self):
+        return Vector(self._v)
+
+    def __matmul__(self, other):
+        if isinstance(other, Vector):
+            return self.dot(other)
+        if isinstance(other, Matrix):
+            return other.transposed() @ self
+        return NotImplemented
+
+    def _getAxis(index):
+        return property(lambda self: self._v[index], lambda self, value: self._v.__setitem__(index, float(value)))
+
+    x = _getAxis(0)
+    y = _getAxis(1)
+    z = _getAxis(2)
+    w = _getAxis(3)
+    del _getAxis
+
+    @property
+    def xy(self):
+        return Vector(self._v[0:2])
+
+    @property
+    def xyz(self):
+        return Vector(self._v[0:3])
+
+    @property
+    def length(self) -> float:
+        return math.sqrt(sum(a * a for a in self._v))
+
+    @length.setter
+    def length(self, value: float):
+        current = self.length
+        if current != 0.0:
+            factor = value / current
+            self._v = [a * factor for a in self._v]
+
+    @property
+    def length_squared(self) -> float:
+        return sum(a * a for a in self._v)
+
+    def dot(self, other) -> float:
+        return sum(a * b for a, b in zip(self._v, self._check(other)))
+
+    def cross(self, other):
+        a, b = self._v, other
+        return Vector((a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]))
+
+    def normalize(self):
+        length = self.length
+        if length != 0.0:
+            self._v = [a / length for a in self._v]
+
+    def normalized(self):
+        v = Vector(self._v)
+        v.normalize()
+        return v
+
+    def rotate(self, other):
+        if isinstance(other, Quaternion):
+            self._v = _floats(other @ self)
+        elif isinstance(other, Matrix):
+            self._v = _floats(other.to_3x3() @ self)
+        else:
+            raise TypeError("Vector.rotate(): expected a Quaternion or Matrix")
+
+    def angle(self, other, fallback = None):
+        lengthA, lengthB = self.length, Vector(other).length
+        if lengthA == 0.0 or lengthB == 0.0:
+            if fallback is not None:
+                return fallback
+            raise ValueError("Vector.angle(other): zero length vectors have no valid angle")
+        return math.acos(max(-1.0, min(1.0, self.dot(other) / (lengthA * lengthB))))
+
+    def lerp(self, other, factor: float):
+        return Vector([a + (b - a) * factor for a, b in zip(self._v, other)])
+
+    def copy(self):
+        return Vector(self._v)
+
+    __copy__ = copy
+
+    def to_tuple(self, precision: int = -1) -> tuple:
+        if precision == -1:
+            return tuple(self._v)
+        return tuple(round(a, precision) for a in self._v)
+
+    def to_2d(self):
+        return Vector((self._v + [0.0, 0.0])[0:2])
+
+    def to_3d(self):
+        return Vector((self._v + [0.0, 0.0, 0.0])[0:3])
+
+    def to_4d(self):
+        return Vector((self._v + [0.0, 0.0, 0.0])[0:3] + [self._v[3] if len(self._v) > 3 else 1.0])
+
+    def zero(self):
+        self._v = [0.0] * len(self._v)
+
+    def freeze(self):
+        return self
+
+class Quaternion:
+    __slots__ = "_q",
+
+    def __init__(self, seq = None, angle = None):
+        if seq is None:
+            self._q = [1.0, 0.0, 0.0, 0.0]
+        elif angle is not None:
+            axis = Vector(seq).normalized()
+            if axis.length == 0.0:
+                self._q = [1.0, 0.0, 0.0, 0.0]
+            else:
+                s = math.sin(angle * 0.5)
+                self._q = [math.cos(angle * 0.5), axis[0] * s, axis[1] * s, axis[2] * s]
+        else:
+            self._q = _floats(seq)
+            if len(self._q) != 4:
+                raise ValueError("Quaternion(): 4d numeric sequence expected")
+
+    def __len__(self):
+        return 4
+
+    def __iter__(self):
+        return iter(self._q)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._q[index])
+        return self._q[index]
+
+    def __setitem__(self, index, value):
+        self._q[index] = float(value)
+
+    def __repr__(self):
+        return "Quaternion((" + ", ".join(f"{v:.4f}" for v in self._q) + "))"
+
+    def __eq__(self, other):
+        try:
+            return len(other) == 4 and all(a == b for a, b in zip(self._q, other))
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def _getComponent(index):
+        return property(lambda self: self._q[index], lambda self, value: self._q.__setitem__(index, float(value)))
+
+    w = _getComponent(0)
+    x = _getComponent(1)
+    y = _getComponent(2)
+    z = _getComponent(3)
+    del _getComponent
+
+    def __matmul__(self, other):
+        if isinstance(other, Quaternion):
+            w1, x1, y1, z1 = self._q
+            w2, x2, y2, z2 = other._q
+            return Quaternion((
+                w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2))
+        if isinstance(other, Vector):
+            w, x, y, z = self._q
+            vx, vy, vz = other[0], other[1], other[2]
+            # t = 2 * cross(q.xyz, v); v' = v + w * t + cross(q.xyz, t)
+            tx = 2.0 * (y * vz - z * vy)
+            ty = 2.0 * (z * vx - x * vz)
+            tz = 2.0 * (x * vy - y * vx)
+            return Vector((vx + w * tx + (y * tz - z * ty), vy + w * ty + (z * tx - x * tz), vz + w * tz + (x * ty - y * tx)))
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Quaternion([a * other for a in self._q])
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __add__(self, other):
+        return Quaternion([a + b for a, b in zip(self._q, other)])
+
+    def __sub__(self, other):
+        return Quaternion([a - b for a, b in zip(self._q, other)])
+
+    def __neg__(self):
+        return Quaternion([-a for a in self._q])
+
+    @property
+    def magnitude(self) -> float:
+        return math.sqrt(sum(a * a for a in self._q))
+
+    @property
+    def angle(self) -> float:
+        return 2.0 * math.acos(max(-1.0, min(1.0, self.normalized()._q[0])))
+
+    @property
+    def axis(self) -> Vector:
+        return self.to_axis_angle()[0]
+
+    def dot(self, other) -> float:
+        return sum(a * b for a, b in zip(self._q, other))
+
+    def normalize(self):
+        length = self.magnitude
+        if length != 0.0:
+            self._q = [a / length for a in self._q]
+        else:
+            self._q = [1.0, 0.0, 0.0, 0.0]
+
+    def normalized(self):
+        q = Quaternion(self._q)
+        q.normalize()
+        return q
+
+    def conjugate(self):
+        self._q = [self._q[0], -self._q[1], -self._q[2], -self._q[3]]
+
+    def conjugated(self):
+        return Quaternion((self._q[0], -self._q[1], -self._q[2], -self._q[3]))
+
+    def invert(self):
+        lengthSquared = sum(a * a for a in self._q)
+        self.conjugate()
+        self._q = [a / lengthSquared for a in self._q]
+
+    def inverted(self):
+        q = Quaternion(self._q)
+        q.invert()
+        return q
+
+    def negate(self):
+        self._q = [-a for a in self._q]
+
+    def identity(self):
+        self._q = [1.0, 0.0, 0.0, 0.0]
+
+    def copy(self):
+        return Quaternion(self._q)
+
+    __copy__ = copy
+
+    def rotate(self, other):
+        if isinstance(other, Matrix):
+            other = other.to_quaternion()
+        self._q = (other @ self)._q
+
+    def rotation_difference(self, other):
+        return other @ self.inverted()
+
+    def to_axis_angle(self) -> tuple:
+        q = self.normalized()
+        w = max(-1.0, min(1.0, q._q[0]))
+        angle = 2.0 * math.acos(w)
+        s = math.sqrt(max(0.0, 1.0 - w * w))
+        if s < 1e-7:
+            return Vector((1.0, 0.0, 0.0)), angle
+        return Vector((q._q[1] / s, q._q[2] / s, q._q[3] / s)), angle
+
+    def to_matrix(self):
+        w, x, y, z = self._q
+        return Matrix((
+            (1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - w * z), 2.0 * (x * z + w * y)),
+            (2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - w * x)),
+            (2.0 * (x * z - w * y), 2.0 * (y * z + w * x), 1.0 - 2.0 * (x * x + y * y))))
+
+    def slerp(self, other, factor: float):
+        a = self.normalized()
+        b = Quaternion(other).normalized()
+        cosom = a.dot(b)
+        if cosom < 0.0:
+            cosom = -cosom
+            b = -b
+        if cosom > 0.9995:
+            result = Quaternion([x + (y - x) * factor for x, y in zip(a._q, b._q)])
+            result.normalize()
+            return result
+        omega = math.acos(cosom)
+        sinom = math.sin(omega)
+        wa = math.sin((1.0 - factor) * omega) / sinom
+        wb = math.sin(factor * omega) / sinom
+        return Quaternion([x * wa + y * wb for x, y in zip(a._q, b._q)])
+
+    def freeze(self):
+        return self
+
+class Matrix:
+    __slots__ = "_rows",
+
+    def __init__(self, rows = ((1.0, 0.0, 0.0, 0.0), (0.0, 1.0, 0.0, 0.0), (0.0, 0.0, 1.0, 0.0), (0.0, 0.0, 0.0, 1.0))):
+        self._rows = [Vector(row) for row in rows]
+
+    @classmethod
+    def Identity(cls, size: int):
+        return cls([[1.0 if i == j else 0.0 for j in range(size)] for i in range(size)])
+
+    @classmethod
+    def Translation(cls, vector):
+        m = cls.Identity(4)
+        m[0][3], m[1][3], m[2][3] = vector[0], vector[1], vector[2]
+        return m
+
+    @classmethod
+    def Diagonal(cls, vector):
+        size = len(vector)
+        return cls([[vector[i] if i == j else 0.0 for j in range(size)] for i in range(size)])
+
+    @classmethod
+    def Scale(cls, factor: float, size: int, axis = None):
+        if axis is None:
+            return cls.Diagonal([factor] * 3 + ([1.0] if size == 4 else []))
+        raise NotImplementedError("Matrix.Scale(): axis argument is not supported by the headless stand-in")
+
+    @classmethod
+    def Rotation(cls, angle: float, size: int, axis):
+        if isinstance(axis, str):
+            axis = {"X": (1.0, 0.0, 0.0), "Y": (0.0, 1.0, 0.0), "Z": (0.0, 0.0, 1.0)}[axis]
+        m = Quaternion(axis, angle).to_matrix()
+        return m.to_4x4() if size == 4 else m
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __setitem__(self, index, value):
+        self._rows[index] = Vector(value)
+
+    def __repr__(self):
+        return "Matrix((" + ",\n        ".join(repr(tuple(round(v, 4) for v in row)) for row in self._rows) + "))"
+
+    def __eq__(self, other):
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return len(self._rows) == len(other._rows) and all(a == b for a, b in zip(self._rows, other._rows))
+
+    __hash__ = None
+
+    @property
+    def row(self):
+        return self._rows
+
+    @property
+    def col(self):
+        return [Vector([row[j] for row in self._rows]) for j in range(len(self._rows[0]))]
+
+    @property
+    def translation(self) -> Vector:
+        return Vector((self._rows[0][3], self._rows[1][3], self._rows[2][3]))
+
+    @translation.setter
+    def translation(self, vector):
+        self._rows[0][3], self._rows[1][3], self._rows[2][3] = vector[0], vector[1], vector[2]
+
+    def __matmul__(self, other):
+        if isinstance(other, Matrix):
+            columns = other.col
+            return Matrix([[row.dot(column) for column in columns] for row in self._rows])
+        if isinstance(other, Vector):
+            size = len(self._rows)
+            if len(other) == size:
+                return Vector([row.dot(other) for row in self._rows])
+            if size == 4 and len(other) == 3:
+                v = Vector((other[0], other[1], other[2], 1.0))
+                return Vector([self._rows[i].dot(v) for i in range(3)])
+            raise ValueError("Matrix multiplication: len(matrix.col) and len(vector) must be the same")
+        return NotImplemented
+
+    def copy(self):
+        return Matrix(self._rows)
+
+    __copy__ = copy
+
+    def transposed(self):
+        return Matrix(self.col)
+
+    def to_3x3(self):
+        return Matrix([row[0:3] for row in self._rows[0:3]])
+
+    def to_4x4(self):
+        if len(self._rows) == 4:
+            return self.copy()
+        m = Matrix.Identity(4)
+        for i in range(3):
+            for j in range(3):
+                m[i][j] = self._rows[i][j]
+        return m
+
+    def to_scale(self) -> Vector:
+        columns = self.to_3x3().col
+        return Vector([column.length for column in columns])
+
+    def to_quaternion(self) -> Quaternion:
+        m = self.to_3x3()
+        columns = m.col
+        for column in columns:
+            column.normalize()
+        m = Matrix(columns).transposed()
+        trace = m[0][0] + m[1][1] + m[2][2]
+        if trace > 0.0:
+            s = 0.5 / math.sqrt(trace + 1.0)
+            q = Quaternion((0.25 / s, (m[2][1] - m[1][2]) * s, (m[0][2] - m[2][0]) * s, (m[1][0] - m[0][1]) * s))
+        elif m[0][0] > m[1][1] and m[0][0] > m[2][2]:
+            s = 2.0 * math.sqrt(1.0 + m[0][0] - m[1][1] - m[2][2])
+            q = Quaternion(((m[2][1] - m[1][2]) / s, 0.25 * s, (m[0][1] + m[1][0]) / s, (m[0][2] + m[2][0]) / s))
+        elif m[1][1] > m[2][2]:
+            s = 2.0 * math.sqrt(1.0 + m[1][1] - m[0][0] - m[2][2])
+            q = Quaternion(((m[0][2] - m[2][0]) / s, (m[0][1] + m[1][0]) / s, 0.25 * s, (m[1][2] + m[2][1]) / s))
+        else:
+            s = 2.0 * math.sqrt(1.0 + m[2][2] - m[0][0] - m[1][1])
+            q = Quaternion(((m[1][0] - m[0][1]) / s, (m[0][2] + m[2][0]) / s, (m[1][2] + m[2][1]) / s, 0.25 * s))
+        if q[0] < 0.0:
+            q.negate()
+        q.normalize()
+        return q
+
+    def decompose(self) -> tuple:
+        return self.translation, self.to_quaternion(), self.to_scale()
+
+    def determinant(self) -> float:
+        m = self._rows
+        if len(m) == 3:
+            return m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1]) - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0]) + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0])
+        return _invert(self)[1]
+
+    def inverted(self, fallback = None):
+        inverse, determinant = _invert(self)
+        if determinant == 0.0:
+            if fallback is not None:
+                return fallback
+            raise ValueError("Matrix.inverted(): matrix does not have an inverse")
+        return inverse
+
+    def inverted_safe(self):
+        inverse, determinant = _invert(self)
+        if determinant == 0.0:
+            return Matrix.Identity(len(self._rows))
+        return inverse
+
+    def invert(self):
+        self._rows = self.inverted()._rows
+
+    def normalized(self):
+        columns = self.to_3x3().col
+        for column in columns:
+            column.normalize()
+        m = Matrix(columns).transposed()
+        return m.to_4x4() if len(self._rows) == 4 else m
+
+    def freeze(self):
+        return self
+
+def _invert(matrix: Matrix) -> tuple:
+    size = len(matrix)
+    a = [list(row) + [1.0 if i == j else 0.0 for j in range(size)] for i, row in enumerate(matrix)]
+    determinant = 1.0
+    for column in range(size):
+        pivot = max(range(column, size), key = lambda r: abs(a[r][column]))
+        if abs(a[pivot][column]) < 1e-12:
+            return Matrix.Identity(size), 0.0
+        if pivot != column:
+            a[column], a[pivot] = a[pivot], a[column]
+            determinant = -determinant
+        pivotValue = a[column][column]
+        determinant *= pivotValue
+        a[column] = [v / pivotValue for v in a[column]]
+        for r in range(size):
+            if r != column and a[r][column] != 0.0:
+                factor = a[r][column]
+                a[r] = [v - factor * p for v, p in zip(a[r], a[column])]
+    return Matrix([row[size:] for row in a]), determinant
@@ -0,0 +1,124 @@
+# Pure-Python stand-in for mathutils.bvhtree. Polygons are fanned into triangles and kept in a binary tree of
+# axis-aligned boxes split at the median of the longest axis; ray_cast returns the nearest hit like Blender does.
+
+import math
+
+from . import Vector
+
+leafSize = 4
+
+class BVHTree:
+    __slots__ = "_vertices", "_triangles", "_root"
+
+    buildCount = 0
+
+    def __init__(self, vertices, triangles):
+        # triangles are (v0, v1, v2, polygon index) with v* indexing into vertices
+        BVHTree.buildCount += 1
+        self._vertices = [tuple(float(c) for c in v) for v in vertices]
+        self._triangles = list(triangles)
+        self._root = self._build(list(range(len(self._triangles)))) if self._triangles else None
+
+    @classmethod
+    def FromPolygons(cls, vertices, polygons, all_triangles = False, epsilon = 0.0):
+        triangles = []
+        for index, polygon in enumerate(polygons):
+            for i in range(1, len(polygon) - 1):
+                triangles.append((polygon[0], polygon[i], polygon[i + 1], index))
+        return cls(vertices, triangles)
+
+    @classmethod
+    def FromObject(cls, object, depsgraph, deform = True, render = False, cage = False, epsilon = 0.0):
+        mesh = object.evaluated_get(depsgraph).data
+        return cls.FromPolygons([v.co for v in mesh.vertices], [p.vertices for p in mesh.polygons], epsilon = epsilon)
+
+    def _bounds(self, triangleIndices) -> tuple:
+        lo, hi = [math.inf] * 3, [-math.inf] * 3
+        vertices = self._vertices
+        for t in triangleIndices:
+            for v in self._triangles[t][:3]:
+                co = vertices[v]
+                for axis in range(3):
+                    if co[axis] < lo[axis]:
+                        lo[axis] = co[axis]
+                    if co[axis] > hi[axis]:
+                        hi[axis] = co[axis]
+        return tuple(lo), tuple(hi)
+
+    def _build(self, triangleIndices) -> tuple:
+        lo, hi = self._bounds(triangleIndices)
+        if len(triangleIndices) <= leafSize:
+            return (lo, hi, None, None, triangleIndices)
+        axis = max(range(3), key = lambda a: hi[a] - lo[a])
+        vertices = self._vertices
+        def centroid(t):
+            a, b, c = self._triangles[t][:3]
+            return vertices[a][axis] + vertices[b][axis] + vertices[c][axis]
+        triangleIndices.sort(key = centroid)
+        half = len(triangleIndices) // 2
+        return (lo, hi, self._build(triangleIndices[:half]), self._build(triangleIndices[half:]), None)
+
+    def ray_cast(self, origin, direction, distance = math.inf) -> tuple:
+        miss = (None, None, None, None)
+        if self._root is None:
+            return miss
+        direction = Vector(direction).normalized()
+        o = (float(origin[0]), float(origin[1]), float(origin[2]))
+        d = (direction[0], direction[1], direction[2])
+        inv = tuple((1.0 / c) if c != 0.0 else math.inf for c in d)
+        best, bestT = None, distance
+        stack = [self._root]
+        while stack:
+            lo, hi, left, right, leaf = stack.pop()
+            if not _hitBox(o, inv, lo, hi, bestT):
+                continue
+            if leaf is None:
+                stack.append(left)
+                stack.append(right)
+                continue
+            for t in leaf:
+                a, b, c, _polygon = self._triangles[t]
+                hit = _intersect(o, d, self._vertices[a], self._vertices[b], self._vertices[c])
+                if hit is not None and hit <= bestT:
+                    best, bestT = t, hit
+        if best is None:
+            return miss
+        a, b, c, polygon = self._triangles[best]
+        v0, v1, v2 = Vector(self._vertices[a]), Vector(self._vertices[b]), Vector(self._vertices[c])
+        normal = (v1 - v0).cross(v2 - v0).normalized()
+        location = Vector(o) + direction * bestT
+        return (location, normal, polygon, bestT)
+
+def _hitBox(o, inv, lo, hi, maxT) -> bool:
+    tMin, tMax = 0.0, maxT
+    for axis in range(3):
+        if inv[axis] == math.inf:
+            if o[axis] < lo[axis] or o[axis] > hi[axis]:
+                return False
+            continue
+        t1, t2 = (lo[axis] - o[axis]) * inv[axis], (hi[axis] - o[axis]) * inv[axis]
+        if t1 > t2:
+            t1, t2 = t2, t1
+        tMin, tMax = max(tMin, t1), min(tMax, t2)
+        if tMin > tMax:
+            return False
+    return True
+
+def _intersect(o, d, v0, v1, v2):
+    e1x, e1y, e1z = v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2]
+    e2x, e2y, e2z = v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2]
+    px, py, pz = d[1] * e2z - d[2] * e2y, d[2] * e2x - d[0] * e2z, d[0] * e2y - d[1] * e2x
+    det = e1x * px + e1y * py + e1z * pz
+    if -1e-12 < det < 1e-12:
+        return None
+    inv = 1.0 / det
+    tx, ty, tz = o[0] - v0[0], o[1] - v0[1], o[2] - v0[2]
+    u = (tx * px + ty * py + tz * pz) * inv
+    if u < 0.0 or u > 1.0:
+        return None
+    qx, qy, qz = ty * e1z - tz * e1y, tz * e1x - tx * e1z, tx * e1y - ty * e1x
+    v = (d[0] * qx + d[1] * qy + d[2] * qz) * inv
+    if v < 0.0 or u + v > 1.0:
+        return None
+    t = (e2x * qx + e2y * qy + e2z * qz) * inv
+    return t if t >= 0.0 else None
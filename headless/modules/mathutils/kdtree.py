@@ -0,0 +1,99 @@
+# Pure-Python stand-in for mathutils.kdtree. Points are inserted into a fixed-size tree which has to be balanced
+# before it can be searched; nodes split at the median of the widest axis like Blender's BLI_kdtree does.
+
+import heapq
+import math
+
+from . import Vector
+
+class KDTree:
+    __slots__ = "_size", "_points", "_root", "_balanced"
+
+    balanceCount = 0
+
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError("negative 'size' given")
+        self._size = size
+        self._points = []
+        self._root = None
+        self._balanced = True
+
+    def insert(self, co, index: int):
+        if len(self._points) >= self._size:
+            raise RuntimeError("Trying to insert more items than KDTree has room for")
+        if index < 0:
+            raise ValueError("negative index given")
+        self._points.append((tuple(float(c) for c in co[:3]), index))
+        self._balanced = False
+
+    def balance(self):
+        KDTree.balanceCount += 1
+        self._root = self._build(list(range(len(self._points))))
+        self._balanced = True
+
+    def _build(self, pointIndices) -> tuple:
+        # (point, axis, left, right)
+        if not pointIndices:
+            return None
+        points = self._points
+        axis = max(range(3), key = lambda a: max(points[p][0][a] for p in pointIndices) - min(points[p][0][a] for p in pointIndices))
+        pointIndices.sort(key = lambda p: points[p][0][axis])
+        half = len(pointIndices) // 2
+        return (pointIndices[half], axis, self._build(pointIndices[:half]), self._build(pointIndices[half + 1:]))
+
+    def _checkBalanced(self, function: str):
+        if not self._balanced:
+            raise RuntimeError(f"KDTree must be balanced before calling {function}()")
+
+    def _result(self, point: int, distanceSquared: float) -> tuple:
+        co, index = self._points[point]
+        return Vector(co), index, math.sqrt(distanceSquared)
+
+    def _search(self, co, maxDistanceSquared: float, limit: int) -> list:
+        # returns (distance squared, point) pairs of the nearest points within the distance, at most limit of them
+        co = tuple(float(c) for c in co[:3])
+        points = self._points
+        heap = [] # max-heap on distance of the best points found so far
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, axis, left, right = node
+            pco = points[point][0]
+            distanceSquared = (pco[0] - co[0]) ** 2 + (pco[1] - co[1]) ** 2 + (pco[2] - co[2]) ** 2
+            if distanceSquared <= maxDistanceSquared:
+                if len(heap) < limit:
+                    heapq.heappush(heap, (-distanceSquared, -point))
+                elif distanceSquared < -heap[0][0]:
+                    heapq.heapreplace(heap, (-distanceSquared, -point))
+            bound = maxDistanceSquared if len(heap) < limit else min(maxDistanceSquared, -heap[0][0])
+            offset = co[axis] - pco[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            if offset * offset <= bound:
+                stack.append(far)
+            stack.append(near)
+        return sorted((-d, -p) for d, p in heap)
+
+    def find(self, co, filter = None) -> tuple:
+        self._checkBalanced("find")
+        if filter is not None:
+            found = [(d, p) for d, p in self._search(co, math.inf, len(self._points)) if filter(self._points[p][1])]
+        else:
+            found = self._search(co, math.inf, 1)
+        if not found:
+            return None, None, None
+        return self._result(found[0][1], found[0][0])
+
+    def find_n(self, co, n: int) -> list:
+        self._checkBalanced("find_n")
+        if n < 0:
+            raise RuntimeError("negative 'n' given")
+        return [self._result(p, d) for d, p in self._search(co, math.inf, n)] if n > 0 else []
+
+    def find_range(self, co, radius: float) -> list:
+        self._checkBalanced("find_range")
+        if radius < 0:
+            raise RuntimeError("negative radius given")
+        return [self._result(p, d) for d, p in self._search(co, radius * radius, len(self._points))]
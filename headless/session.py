@@ -0,0 +1,186 @@
+# Assembles a window with a single 3D View and a scene around the headless bpy stand-in, and drives registered modal
+# operators, timers and draw handlers the way Blender's event loop would.
+
+import bpy
+import mathutils
+from mathutils import Vector, Matrix
+
+class Session:
+    def __init__(self, addon, width: int = 1920, height: int = 1080, quadView: bool = False):
+        self.addon = addon
+        self.context = context = bpy.context
+        self.scene = bpy.types.Scene("Scene")
+        self.viewLayer = bpy.types.ViewLayer(self.scene)
+        self.window = bpy.types.Window(self.viewLayer)
+        self.sv3d = bpy.types.SpaceView3D(quadView)
+        regions = [bpy.types.Region("HEADER", 0, height - 26, width, 26)]
+        if quadView:
+            halfWidth, halfHeight = width // 2, height // 2
+            regions += [bpy.types.Region("WINDOW", x, y, halfWidth, halfHeight) for y in (0, halfHeight) for x in (0, halfWidth)]
+        else:
+            regions.append(bpy.types.Region("WINDOW", 0, 0, width, height))
+        self.area = bpy.types.Area(self.sv3d, regions)
+        self.region = regions[-1]
+        context.window, context.area, context.region = self.window, self.area, self.region
+        context.scene, context.view_layer = self.scene, self.viewLayer
+        context.window_manager.modalHandlers.clear()
+        bpy.app.timers.clear()
+        bpy.types.SpaceView3D._drawHandlers.clear()
+        if not any(getattr(cls, "bl_idname", None) == addon.mouse_strafing.MouseStrafingOperator.bl_idname for cls in bpy.utils.registeredClasses):
+            addon.register()
+        addon.mouse_strafing.running = False
+        addon.mouse_strafing.drawCallbackHandle = None
+        self.window.mouse = [self.region.x + self.region.width // 2, self.region.y + self.region.height // 2]
+        self.undoSteps = 0
+
+    @property
+    def rv3d(self) -> bpy.types.RegionView3D:
+        return self.context.region_data
+
+    @property
+    def prefs(self):
+        return self.context.preferences.addons[self.addon.prefs.MouseStrafingPreferences.bl_idname].preferences
+
+    @property
+    def running(self) -> bool:
+        return len(self.context.window_manager.modalHandlers) > 0
+
+    def closeArea(self):
+        # frees the 3D View like closing its area or loading another file does
+        sv3d = self.sv3d
+        for struct in [sv3d.region_3d, *sv3d.region_quadviews, *self.area.regions, sv3d, self.area]:
+            bpy.types._removeStruct(struct)
+        self.context.area, self.context.region = None, None
+
+    def addMesh(self, name: str, vertices, polygons, matrix: Matrix = None) -> bpy.types.Object:
+        obj = bpy.types.Object(name, bpy.types.Mesh(name, vertices, polygons))
+        if matrix is not None:
+            obj.matrix_world = matrix
+        self.scene.objects._items.append(obj)
+        return obj
+
+    def addCollectionInstance(self, name: str, collection: bpy.types.Collection, matrix: Matrix = None) -> bpy.types.Object:
+        obj = bpy.types.Object(name)
+        obj.instance_type, obj.instance_collection = "COLLECTION", collection
+        if matrix is not None:
+            obj.matrix_world = matrix
+        self.scene.objects._items.append(obj)
+        return obj
+
+    def addCamera(self, name: str = "Camera", matrix: Matrix = None) -> bpy.types.Object:
+        obj = bpy.types.Object(name, bpy.types.Camera(name))
+        if matrix is not None:
+            obj.matrix_world = matrix
+        self.scene.objects._items.append(obj)
+        if self.scene.camera is None:
+            self.scene.camera = obj
+        self.sv3d.camera = self.scene.camera
+        return obj
+
+    def tagUpdate(self, obj: bpy.types.Object, geometry: bool = False, transform: bool = False):
+        # reports an edit to the depsgraph_update_post handlers like Blender does after re-evaluating the scene
+        depsgraph = self.viewLayer.depsgraph
+        depsgraph.updates._items = [bpy.types.DepsgraphUpdate(obj, geometry, transform)]
+        try:
+            for handler in list(bpy.app.handlers.depsgraph_update_post):
+                handler(self.scene, depsgraph)
+        finally:
+            depsgraph.updates._items = []
+
+    def viewThroughCamera(self, lock: bool = True):
+        self.sv3d.lock_camera = lock
+        self.rv3d.view_perspective = "CAMERA"
+
+    def makeEvent(self, type: str, value: str = "NOTHING", shift: bool = False, ctrl: bool = False, alt: bool = False) -> bpy.types.Event:
+        x, y = self.window.mouse
+        return bpy.types.Event(type, value, shift, ctrl, alt, mouse_x = x, mouse_y = y, mouse_prev_x = x, mouse_prev_y = y)
+
+    def dispatch(self, event: bpy.types.Event) -> set:
+        result = {"PASS_THROUGH"}
+        for operator in list(self.context.window_manager.modalHandlers):
+            result = operator.modal(self.context, event)
+            if "RUNNING_MODAL" not in result and "PASS_THROUGH" not in result:
+                self.context.window_manager.modalHandlers.remove(operator)
+                if "FINISHED" in result and "UNDO" in operator.bl_options:
+                    self.undoSteps += 1
+            if "PASS_THROUGH" not in result:
+                break
+        return result
+
+    def send(self, type: str, value: str = "NOTHING", shift: bool = False, ctrl: bool = False, alt: bool = False) -> set:
+        return self.dispatch(self.makeEvent(type, value, shift, ctrl, alt))
+
+    def press(self, type: str, shift: bool = False, ctrl: bool = False, alt: bool = False) -> set:
+        return self.send(type, "PRESS", shift, ctrl, alt)
+
+    def release(self, type: str, shift: bool = False, ctrl: bool = False, alt: bool = False) -> set:
+        return self.send(type, "RELEASE", shift, ctrl, alt)
+
+    def tap(self, type: str, shift: bool = False, ctrl: bool = False, alt: bool = False) -> set:
+        self.press(type, shift, ctrl, alt)
+        return self.release(type, shift, ctrl, alt)
+
+    def moveMouse(self, dx: int, dy: int, type: str = "MOUSEMOVE", shift: bool = False, ctrl: bool = False, alt: bool = False) -> set:
+        prevX, prevY = self.window.mouse
+        self.window.mouse = [prevX + int(dx), prevY + int(dy)]
+        event = self.makeEvent(type, "NOTHING", shift, ctrl, alt)
+        event.mouse_prev_x, event.mouse_prev_y = prevX, prevY
+        return self.dispatch(event)
+
+    def invoke(self, key: str = "SPACE", shift: bool = False, ctrl: bool = False, alt: bool = False):
+        operator = self.addon.mouse_strafing.MouseStrafingOperator()
+        result = operator.invoke(self.context, self.makeEvent(key, "PRESS", shift, ctrl, alt))
+        return operator if "RUNNING_MODAL" in result else None
+
+    def runTimers(self, now: float = None) -> int:
+        return bpy.app.timers.run(now)
+
+    def settle(self, maxRuns: int = 10):
+        # runs due timers until none are left, as timers registered while timers run (e.g. the pose commit after a
+        # flush) only run with the next pump, like in Blender's event loop
+        for i in range(maxRuns):
+            if bpy.app.timers.run() == 0:
+                return
+
+    def draw(self, area: bpy.types.Area = None, region: bpy.types.Region = None):
+        previousArea, previousRegion = self.context.area, self.context.region
+        self.context.area = self.area if area is None else area
+        self.context.region = self.region if region is None else region
+        try:
+            for callback, args, regionType, _drawType in list(bpy.types.SpaceView3D._drawHandlers.values()):
+                if regionType == self.context.region.type:
+                    callback(*args)
+        finally:
+            self.context.area, self.context.region = previousArea, previousRegion
+
+    def viewMatrix(self) -> Matrix:
+        rv3d = self.rv3d
+        if rv3d.view_perspective == "CAMERA" and self.sv3d.lock_camera and self.sv3d.camera is not None:
+            return self.sv3d.camera.matrix_world
+        return Matrix.Translation(rv3d.view_location) @ rv3d.view_rotation.to_matrix().to_4x4() @ Matrix.Translation(Vector((0, 0, rv3d.view_distance)))
+
+def gridMesh(size: float = 10.0, subdivisions: int = 10) -> tuple[list, list]:
+    step = size / subdivisions
+    half = size * 0.5
+    vertices = [(-half + x * step, -half + y * step, 0.0) for y in range(subdivisions + 1) for x in range(subdivisions + 1)]
+    polygons = []
+    for y in range(subdivisions):
+        for x in range(subdivisions):
+            i = y * (subdivisions + 1) + x
+            polygons.append((i, i + 1, i + subdivisions + 2, i + subdivisions + 1))
+    return vertices, polygons
+
+def cubeMesh(size: float = 2.0) -> tuple[list, list]:
+    h = size * 0.5
+    vertices = [(-h, -h, -h), (h, -h, -h), (h, h, -h), (-h, h, -h), (-h, -h, h), (h, -h, h), (h, h, h), (-h, h, h)]
+    polygons = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+    return vertices, polygons
+
+def lookAt(position, target, up = (0.0, 0.0, 1.0)) -> Matrix:
+    forward = (Vector(target) - Vector(position)).normalized()
+    right = forward.cross(Vector(up)).normalized()
+    if right.length == 0.0:
+        right = Vector((1.0, 0.0, 0.0))
+    trueUp = right.cross(forward)
+    rotation = Matrix((right, trueUp, -forward)).transposed().to_4x4()
+    return Matrix.Translation(position) @ rotation
@@ -1,5 +1,7 @@
+import bisect
 import math
 import time
+from array import array
 
 import bpy
 import blf
@@ -8,7 +10,17 @@ from mathutils import Quaternion
 import mathutils
 
 from .prefs import MouseStrafingPreferences
-from .prefs import NavigationMouseButtonBinding
+from .prefs import getButtonBindingTable
+from .prefs import PreferencesSnapshot
+from .prefs import getPreferencesSnapshot
+from .raycast import PivotTracker
+from .bookmarks import BookmarkStore
+from .bookmarks import getBookmarkStore
+from .bookmarks import packRecord
+from .bookmarks import slotsPerPage
+from .bookmarks import unpackRecord
+from .recorder import pathRecorder
+from .recorder import stopPlayback
 
 def getViews3D(context: bpy.types.Context) -> tuple[bpy.types.SpaceView3D, bpy.types.RegionView3D]:
     sv3d = getSpaceView3D(context)
@@ -55,15 +67,35 @@ drawCallbackHandle = None
 
 ms = 1_000_000 # one millisecond worth of nanoseconds for use with values returned by time.perf_counter_ns()
 
+pivotTrackingInterval = 1 / 60
+cameraEvaluationPending = False
+
+overlayHoldTime = 1.0
+overlayFadeTime = 0.5
+overlayDurationNs = int((overlayHoldTime + overlayFadeTime) * 1000 * ms)
+
+defaultDrawIntervalNs = 16_666_667
+minWasdTickIntervalNs = 1 * ms
+maxWasdTickIntervalNs = 33 * ms
+wasdTimestepNs = 2 * ms
+wasdMaxCatchUpNs = 250 * ms
+
+nearestBookmarkCount = 10
+samePoseTolerance = 1e-6 # relative to the coordinates and view distance involved; bookmarks store float32, which rounds to about 6e-8
+
 mouseSanityMultiplierPan = 0.003
 mouseSanityMultiplierStrafe = 0.02
 strafeSensitivityRanges = ((0.001, 0.001), (0.02, 0.002), (0.05, 0.005), (0.1, 0.01), (0.2, 0.02), (0.5, 0.05), (1.0, 0.1), (2.0, 0.2), (5.0, 0.5), (10.0, 1.0), (20.0, 2.0), (50.0, 5.0), 100)
 focalLengthRanges = ((1, 0.125), (5, 0.25), (10, 0.5), (20, 1), (50, 2), (100, 2.5), (175, 5), 250)
 fovRanges = ((0.125, 0.125), (5, 0.25), (15, 0.5), (30, 1), (130, 0.5), (160, 0.25), 179)
 
+digitKeys = ("ZERO", "ONE", "TWO", "THREE", "FOUR", "FIVE", "SIX", "SEVEN", "EIGHT", "NINE")
+mouseButtonBits = {"LEFTMOUSE": 1, "RIGHTMOUSE": 2, "MIDDLEMOUSE": 4, "BUTTON4MOUSE": 8, "BUTTON5MOUSE": 16, "BUTTON6MOUSE": 32, "BUTTON7MOUSE": 64} # must match prefs.buttonBits
+
 def calcAtLeastOneYearAgo(nowNs: int) -> int:
     return nowNs - 1000 * ms * 60 * 60 * 24 * 400
 
+# save states of previous versions, only read to migrate them to bookmarks.CameraBookmarks
 class CameraState(bpy.types.PropertyGroup):
     viewPos: bpy.props.FloatVectorProperty(size = 3, options = {"HIDDEN"})
     rot: bpy.props.FloatVectorProperty(size = 4, options = {"HIDDEN"})
@@ -77,23 +109,42 @@ class CameraStates(bpy.types.PropertyGroup):
     imminentState: bpy.props.PointerProperty(type = CameraState, options = {"HIDDEN"})
     imminentSlot: bpy.props.IntProperty(options = {"HIDDEN"}, default = -1)
 
+class ViewTransition:
+    # all frames are computed up front, so that each tick only writes one of them to the view
+    __slots__ = 'frames', 'frameIndex', 'frameIntervalNs', 'startTimeNs', 'orthographicAtEnd'
+
+    def __init__(self, frames: list, frameIntervalNs: int, orthographicAtEnd: bool):
+        self.frames = frames
+        self.frameIndex = -1
+        self.frameIntervalNs = frameIntervalNs
+        self.startTimeNs = time.perf_counter_ns()
+        self.orthographicAtEnd = orthographicAtEnd
+
 class MouseStrafingOperator(bpy.types.Operator):
     """Strafe in the 3D View using the mouse."""
     bl_idname = "view3d.mouse_strafing"
     bl_label = "Mouse Strafing"
-    bl_options = { "BLOCKING", "UNDO" }
+    bl_options = { "BLOCKING" } # undo steps are pushed explicitly according to the undo policy
 
     __slots__ = 'operatorKey', 'operatorKeyDown', 'operatorKeyPresses', 'inEscape', 'stopSignal', 'isInMouseAction', \
         'increasedMagnitude', 'increasedPrecision', 'changedBehavior', \
-        'lmbDown', 'rmbDown', 'mmbDown', 'mb4Down', 'mb5Down', 'mb6Down', 'mb7Down', \
+        'buttonMask', 'actionFuncs', 'buttonActionFuncs', 'buttonActionSource', \
         'keyDownForward', 'keyDownLeft', 'keyDownBackward', 'keyDownRight', 'keyDownDown', 'keyDownUp', \
-        'isWasding', 'wasdStartTimeNs', 'wasdPreviousTimeNs', 'wasdSpeedPercentage', \
+        'isWasding', 'wasdElapsedNs', 'wasdPreviousTimeNs', 'wasdAccumulatorNs', 'wasdSpeedPercentage', 'drawIntervalNs', 'previousDrawTimeNs', \
         'keySaveStateDown', 'keySaveStateSlotDown', 'loadCameraState', 'loadedCameraState', 'imminentSaveStateTimeNs',  \
+        'bookmarkStore', 'editBookmarkTimeNs', 'bookmarkOverlayText', 'nearestBookmarks', 'nearestBookmarkIndex', 'nearestBookmarkSignature', \
         'keyDownRelocatePivot', 'relocatePivotLock', 'adjustPivotSuccess', \
-        'editStrafeSensitivityTimeNs', 'editFovTimeNs', 'editGearTimeNs', 'redrawAfterDrawCallback', 'keyCycleGearsDown', \
+        'editStrafeSensitivityTimeNs', 'editFovTimeNs', 'editGearTimeNs', 'animationDeadlineNs', 'animationStopSignal', 'keyCycleGearsDown', \
+        'transition', 'transitionStopSignal', \
         'bewareWarpDist', 'previousDelta', 'ignoreMouseEvents', \
-        'prefs', 'area', 'sv3d', 'rv3d', 'isUnitSystemNone', \
-        'returnValue'
+        'pendingMouseAction', 'pendingMouseDelta', 'pendingMouseModifiers', 'mouseFlushScheduled', \
+        'poseViewPos', 'poseViewRot', 'poseDirty', 'poseSignature', 'poseCommitScheduled', \
+        'eventHandlers', 'eventHandlersRevision', \
+        'pivotTracker', 'pivotTrackingStopSignal', \
+        'editedCamera', 'editedCameraSignature', 'undoCameraSignature', 'undoStepDueNs', \
+        'lensSensor', 'lensSensorKey', \
+        'fovInfoSource', 'fovInfoTexts', \
+        'prefs', 'settings', 'area', 'region', 'regionPointer', 'viewLayer', 'sv3d', 'rv3d', 'isUnitSystemNone'
 
     def initFields(self, context: bpy.types.Context, event: bpy.types.Event):
         nowNs = time.perf_counter_ns()
@@ -108,88 +159,137 @@ class MouseStrafingOperator(bpy.types.Operator):
 
         self.increasedMagnitude, self.increasedPrecision, self.changedBehavior = False, False, False
 
-        self.lmbDown, self.rmbDown, self.mmbDown, self.mb4Down, self.mb5Down, self.mb6Down, self.mb7Down = False, False, False, False, False, False, False
+        self.buttonMask = 0
+        self.actionFuncs = {"turnXY": self.turnXY, "roll": self.roll, "strafeXZ": self.strafeXZ, "strafeXY": self.strafeXY, "strafeXRappel": self.strafeXRappel, "turnXRappel": self.turnXRappel}
+        self.buttonActionFuncs = None
+        self.buttonActionSource = None
 
         self.keyDownForward, self.keyDownLeft, self.keyDownBackward, self.keyDownRight, self.keyDownDown, self.keyDownUp = False, False, False, False, False, False
 
         self.isWasding = False
-        self.wasdStartTimeNs = 0
+        self.wasdElapsedNs = 0
         self.wasdPreviousTimeNs = 0
+        self.wasdAccumulatorNs = 0
         self.wasdSpeedPercentage = 0.0
+        self.drawIntervalNs = defaultDrawIntervalNs
+        self.previousDrawTimeNs = atLeastOneYearAgo
 
         self.keySaveStateDown = False
         self.keySaveStateSlotDown = [False, False, False, False, False, False, False, False, False, False]
         self.loadCameraState = False
         self.loadedCameraState = False
         self.imminentSaveStateTimeNs = atLeastOneYearAgo
+        self.bookmarkStore = None
+        self.editBookmarkTimeNs = atLeastOneYearAgo
+        self.bookmarkOverlayText = ""
+        self.nearestBookmarks = None
+        self.nearestBookmarkIndex = 0
+        self.nearestBookmarkSignature = None
 
         self.keyDownRelocatePivot = False
         self.relocatePivotLock = False
         self.adjustPivotSuccess = False
+        self.pivotTracker = PivotTracker()
+        self.pivotTrackingStopSignal = None
 
         self.editStrafeSensitivityTimeNs = atLeastOneYearAgo
         self.editFovTimeNs = atLeastOneYearAgo
         self.editGearTimeNs = atLeastOneYearAgo
-        self.redrawAfterDrawCallback = False
+        self.animationDeadlineNs = 0
+        self.animationStopSignal = None
         self.keyCycleGearsDown = False
 
+        self.transition = None
+        self.transitionStopSignal = None
+
         self.bewareWarpDist = None
         self.previousDelta = None
         self.ignoreMouseEvents = 0
 
+        self.pendingMouseAction = None
+        self.pendingMouseDelta = Vector((0, 0))
+        self.pendingMouseModifiers = None
+        self.mouseFlushScheduled = False
+
+        self.poseViewPos, self.poseViewRot = None, None
+        self.poseDirty = False
+        self.poseSignature = None
+        self.poseCommitScheduled = False
+
         self.prefs = context.preferences.addons[MouseStrafingPreferences.bl_idname].preferences
+        self.settings: PreferencesSnapshot = getPreferencesSnapshot(self.prefs)
+        self.buildEventHandlers()
         self.area = context.area
+        self.region = context.region
+        self.regionPointer = context.region.as_pointer()
+        self.viewLayer = context.window.view_layer # timers run without a window in context
         self.sv3d, self.rv3d = getViews3D(context)
         self.isUnitSystemNone = context.scene.unit_settings.system == 'NONE'
 
-        self.returnValue = "FINISHED" if self.isEditingCamera() else "CANCELLED"
+        self.editedCamera = self.sv3d.camera if self.isEditingCamera() else None
+        self.editedCameraSignature = getCameraSignature(self.editedCamera)
+        self.undoCameraSignature = self.editedCameraSignature
+        self.undoStepDueNs = None
+
+        self.lensSensor, self.lensSensorKey = None, None
+        self.fovInfoSource, self.fovInfoTexts = None, None
 
         self.snapGear()
 
         self.updateMode(context, event)
 
+    def buildEventHandlers(self):
+        # later entries win, so this goes from lowest to highest precedence
+        settings = self.settings
+        handlers = {"ESC": self.handleEscape}
+        handlers[settings.keyResetRoll] = self.handleResetRoll
+        handlers[settings.keyRelocatePivot] = self.handleRelocatePivot
+        handlers[settings.keyLoadCameraState] = self.handleLoadCameraState
+        handlers[settings.keyCycleBookmarkPage] = self.handleCycleBookmarkPage
+        handlers[settings.keyNearestBookmark] = self.handleNearestBookmark
+        handlers[settings.keyRecordPath] = self.handleRecordPath
+        for digit in digitKeys:
+            handlers[digit] = self.handleSaveStateKey
+        for key in settings.wasdKeys:
+            handlers[key] = self.handleWasdKey
+        handlers[settings.keyCycleGears] = self.handleCycleGears
+        handlers["WHEELUPMOUSE"] = handlers["WHEELDOWNMOUSE"] = self.handleWheel
+        for button in mouseButtonBits:
+            handlers[button] = self.updateMode
+        handlers["MOUSEMOVE"] = handlers["INBETWEEN_MOUSEMOVE"] = self.handleMouseMove
+        self.eventHandlers = handlers
+        self.eventHandlersRevision = settings.bindingsRevision
+
     def getActionFunc(self, action):
-        if action == "turnXY":
-            return self.turnXY
-        elif action == "roll":
-            return self.roll
-        elif action == "strafeXZ":
-            return self.strafeXZ
-        elif action == "strafeXY":
-            return self.strafeXY
-        elif action == "strafeXRappel":
-            return self.strafeXRappel
-        elif action == "turnXRappel":
-            return self.turnXRappel
-        return self.nop
-
-    def nop():
+        return self.actionFuncs.get(action, self.nop)
+
+    def nop(self, context: bpy.types.Context, delta: Vector):
         return
 
     def turnXY(self, context: bpy.types.Context, delta: Vector):
-        panDelta = delta * mouseSanityMultiplierPan * self.prefs.sensitivityPan * (0.85 if self.isWasding else 1) * self.getPanFactor(context)
-        self.pan3dView(Vector((-panDelta[0] if self.prefs.invertMouseX else panDelta[0], -panDelta[1] if self.prefs.invertMouse else panDelta[1])))
+        panDelta = delta * mouseSanityMultiplierPan * self.settings.sensitivityPan * (0.85 if self.isWasding else 1) * self.getPanFactor(context)
+        self.pan3dView(Vector((panDelta[0] * self.settings.panSignX, panDelta[1] * self.settings.panSignY)))
 
     def roll(self, context: bpy.types.Context, delta: Vector):
-        rollDelta = delta * mouseSanityMultiplierPan * self.prefs.sensitivityPan * (0.85 if self.isWasding else 1) * self.getRollFactor()
-        self.roll3dView(Vector((-rollDelta[0] if self.prefs.invertMouseX else rollDelta[0], -rollDelta[1] if self.prefs.invertMouse else rollDelta[1])))
+        rollDelta = delta * mouseSanityMultiplierPan * self.settings.sensitivityPan * (0.85 if self.isWasding else 1) * self.getRollFactor()
+        self.roll3dView(Vector((rollDelta[0] * self.settings.panSignX, rollDelta[1] * self.settings.panSignY)))
 
     def strafeXZ(self, context: bpy.types.Context, delta: Vector):
         strafeDelta = Vector((delta[0], delta[1])) * self.getMovementFactor(True, True)
-        self.move3dView(Vector((-strafeDelta[0] if self.prefs.invertStrafeX else strafeDelta[0], 0, strafeDelta[1] if self.prefs.invertStrafeZ else -strafeDelta[1])), Vector((0, 0, 0)))
+        self.move3dView(Vector((strafeDelta[0] * self.settings.strafeSignX, 0, strafeDelta[1] * self.settings.strafeSignZ)), Vector((0, 0, 0)))
 
     def strafeXY(self, context: bpy.types.Context, delta: Vector):
         strafeDelta = Vector((delta[0], delta[1])) * self.getMovementFactor(True, True)
-        self.move3dView(Vector((-strafeDelta[0] if self.prefs.invertStrafeX else strafeDelta[0], -strafeDelta[1] if self.prefs.invertStrafeY else strafeDelta[1], 0)), Vector((0, 0, 0)))
+        self.move3dView(Vector((strafeDelta[0] * self.settings.strafeSignX, strafeDelta[1] * self.settings.strafeSignY, 0)), Vector((0, 0, 0)))
 
     def strafeXRappel(self, context: bpy.types.Context, delta: Vector):
         strafeDelta = Vector((delta[0], delta[1])) * self.getMovementFactor(True, True)
-        self.move3dView(Vector((-strafeDelta[0] if self.prefs.invertStrafeX else strafeDelta[0], 0, 0)), Vector((0, 0, -strafeDelta[1] if self.prefs.invertStrafeY else strafeDelta[1])))
+        self.move3dView(Vector((strafeDelta[0] * self.settings.strafeSignX, 0, 0)), Vector((0, 0, strafeDelta[1] * self.settings.strafeSignY)))
 
     def turnXRappel(self, context: bpy.types.Context, delta: Vector):
-        panDelta = delta * mouseSanityMultiplierPan * self.prefs.sensitivityPan * (0.85 if self.isWasding else 1) * self.getPanFactor(context)
+        panDelta = delta * mouseSanityMultiplierPan * self.settings.sensitivityPan * (0.85 if self.isWasding else 1) * self.getPanFactor(context)
         strafeDelta = Vector((delta[0], delta[1])) * self.getMovementFactor(True, True)
-        self.move3dView(Vector((0, 0, 0)), Vector((0, 0, -strafeDelta[1] if self.prefs.invertStrafeY else strafeDelta[1])))
+        self.move3dView(Vector((0, 0, 0)), Vector((0, 0, strafeDelta[1] * self.settings.strafeSignY)))
         self.pan3dView(Vector((panDelta[0] * 0.8, 0)))
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
@@ -197,7 +297,10 @@ class MouseStrafingOperator(bpy.types.Operator):
         global drawCallbackHandle
         self.initFields(context, event)
         if not running and event.value == "PRESS":
+            stopPlayback()
             self.considerCenterCameraView()
+            if pathRecorder.recording:
+                self.recordPathSample() # the view may have been changed by other means since the last session
             running = True
             context.window_manager.modal_handler_add(self)
             args = (self, context)
@@ -205,14 +308,17 @@ class MouseStrafingOperator(bpy.types.Operator):
                 bpy.types.SpaceView3D.draw_handler_remove(drawCallbackHandle, "WINDOW")
                 drawCallbackHandle = None
             drawCallbackHandle = bpy.types.SpaceView3D.draw_handler_add(drawCallback, args, "WINDOW", "POST_PIXEL")
+            self.requestPivotTracking()
+            if self.editedCamera is not None and self.settings.undoPolicy == "timed":
+                self.undoStepDueNs = time.perf_counter_ns() + int(self.settings.undoStepInterval * 1_000_000_000)
             context.area.tag_redraw()
             return {"RUNNING_MODAL"}
         return {"PASS_THROUGH"}
 
-    def initSaveStates(self, context: bpy.types.Context):
-        states: CameraStates = context.scene.mstrf_camera_save_states
-        while len(states.savedStates) < 10:
-            states.savedStates.add()
+    def initBookmarks(self, context: bpy.types.Context) -> BookmarkStore:
+        if self.bookmarkStore is None:
+            self.bookmarkStore = getBookmarkStore(context.scene)
+        return self.bookmarkStore
 
     def considerCenterCameraView(self):
         if self.rv3d.view_perspective == "CAMERA":
@@ -222,6 +328,8 @@ class MouseStrafingOperator(bpy.types.Operator):
         try:
             if not running:
                 return {"CANCELLED"}
+            if self.undoStepDueNs is not None:
+                self.considerTimedUndoStep()
             if event.type == self.operatorKey:
                 if event.value == "PRESS":
                     self.operatorKeyPresses = self.operatorKeyPresses + (0 if self.operatorKeyDown else 1)
@@ -230,128 +338,220 @@ class MouseStrafingOperator(bpy.types.Operator):
                     self.operatorKeyDown = False
                 if self.shouldExitOperator():
                     return self.exitOperator(context)
-            modifierKeys = {"shift": event.shift, "ctrl": event.ctrl, "alt": event.alt, "omit": False}
-            self.increasedMagnitude, self.increasedPrecision, self.changedBehavior = modifierKeys[self.prefs.increasedMagnitudeKey], modifierKeys[self.prefs.increasedPrecisionKey], modifierKeys[self.prefs.changedBehaviorKey]
-            if event.type in { "MOUSEMOVE", "INBETWEEN_MOUSEMOVE" }:
-                if self.ignoreMouseEvents > 0:
-                    self.ignoreMouseEvents = self.ignoreMouseEvents - 1
-                    self.bewareWarpDist = None
-                    return {"RUNNING_MODAL"}
-                delta = Vector((event.mouse_x - event.mouse_prev_x, event.mouse_y - event.mouse_prev_y))
-                if self.bewareWarpDist is not None:
-                    if delta.length > self.bewareWarpDist * 0.5 and delta.length > self.previousDelta.length * 2:
-                        if self.prefs.debug:
-                            print("mouse_strafing: detected cursor_warp glitch: using last mouse delta (" + str(self.previousDelta[0]) + ", " + str(self.previousDelta[1]) + ") instead of (" + str(delta[0]) + ", " + str(delta[1]) + ")")
-                        delta = self.previousDelta
-                    self.bewareWarpDist = None
-                if self.isInMouseAction and not (event.mouse_x == event.mouse_prev_x and event.mouse_y == event.mouse_prev_y):
-                    binding = self.getSatisfiedBinding()
-                    if binding is not None:
-                        self.getActionFunc(binding.action)(context, delta)
-                    self.resetMouse(context, event)
-            elif event.type in { "LEFTMOUSE", "RIGHTMOUSE", "MIDDLEMOUSE", "BUTTON4MOUSE", "BUTTON5MOUSE", "BUTTON6MOUSE", "BUTTON7MOUSE" }:
-                return self.updateMode(context, event)
-            elif event.type == "WHEELUPMOUSE" or event.type == "WHEELDOWNMOUSE":
-                if self.changedBehavior:
-                    self.nudgeFov(context, (event.type == "WHEELUPMOUSE") != self.prefs.scrollUpToZoomIn)
-                elif self.prefs.wheelMoveFunction == "moveZ":
-                    strafeFactor = self.getMovementFactor(False, self.prefs.useGearsWheel)
-                    self.move3dView(Vector((0, 0, -self.prefs.wheelDistance * strafeFactor if event.type == "WHEELUPMOUSE" else self.prefs.wheelDistance * strafeFactor)), Vector((0, 0, 0)))
-                elif self.prefs.wheelMoveFunction == "changeStrafeSensitivity":
-                    magnitude = 1 if event.type == "WHEELUPMOUSE" else -1
-                    magnitude = magnitude * 5 if self.increasedMagnitude else magnitude
-                    prefs = bpy.context.preferences.addons[MouseStrafingPreferences.bl_idname].preferences
-                    prefs.sensitivityStrafe = nudgeValue(prefs.sensitivityStrafe, magnitude, self.increasedPrecision, strafeSensitivityRanges)
-                    bpy.context.preferences.use_preferences_save = True
-                    self.editStrafeSensitivityTimeNs = time.perf_counter_ns()
-            elif event.type == self.prefs.keyCycleGears:
-                if event.value == "PRESS":
-                    self.cycleGear(context, event.shift, not self.keyCycleGearsDown)
-                self.keyCycleGearsDown = getKeyDown(self.keyCycleGearsDown, event)
-            elif event.type in {self.prefs.keyForward, self.prefs.keyLeft, self.prefs.keyBackward, self.prefs.keyRight, self.prefs.keyDown, self.prefs.keyUp}:
-                self.updateKeys(context, event)
-                if self.stopSignal is None:
-                    self.stopSignal = [False]
-                    pinnedSv3d, pinnedRv3d = self.sv3d, self.rv3d
-                    pinnedStopSignal = self.stopSignal
-                    bpy.app.timers.register(lambda: fpsMove(self, pinnedSv3d, pinnedRv3d, pinnedStopSignal))
-            elif event.type in {"ZERO", "ONE", "TWO", "THREE", "FOUR", "FIVE", "SIX", "SEVEN", "EIGHT", "NINE"}:
-                self.keySaveStateDown = getKeyDown(self.keySaveStateDown, event)
-                slotIndex = parseDigitString(event.type)
-                if self.keySaveStateDown and self.keySaveStateSlotDown[slotIndex]:
-                    return {"RUNNING_MODAL"}
-                self.keySaveStateSlotDown[slotIndex] = self.keySaveStateDown
-                if self.keySaveStateDown:
-                    self.processSaveState(slotIndex, context)
-                else:
-                    self.loadedCameraState = False
-            elif event.type == self.prefs.keyLoadCameraState:
-                if event.value == "PRESS":
-                    self.loadCameraState = not self.loadCameraState
-            elif event.type == self.prefs.keyRelocatePivot:
-                if event.value == "PRESS" and not self.keyDownRelocatePivot:
-                    if event.shift:
-                        self.prefs.adjustPivot = not self.prefs.adjustPivot
-                        bpy.context.preferences.use_preferences_save = True
-                        self.relocatePivotLock = True
-                        self.adjustPivotSuccess = False
-                    else:
-                        self.relocatePivotLock = False
-                        if self.prefs.adjustPivot:
-                            self.prefs.adjustPivot = False
-                            bpy.context.preferences.use_preferences_save = True
-                self.keyDownRelocatePivot = getKeyDown(self.keyDownRelocatePivot, event)
-                if self.keyDownRelocatePivot and not self.prefs.adjustPivot and not self.relocatePivotLock and not event.shift:
-                    self.adjustPivot(context)
-            elif event.type == self.prefs.keyResetRoll:
-                if event.value == "PRESS":
-                    self.resetRoll(context)
-            elif event.type == "ESC":
-                self.inEscape = getKeyDown(self.inEscape, event)
-                return self.considerExitOperator(context)
-            else:
+            if self.pendingMouseAction is not None and (event.type not in { "MOUSEMOVE", "INBETWEEN_MOUSEMOVE" } or self.pendingMouseModifiers != (event.shift, event.ctrl, event.alt)):
+                self.flushMouseMoves(context) # apply pending movement with the modifier state it was made with
+            settings = self.settings
+            modifierKeys = (False, event.shift, event.ctrl, event.alt)
+            self.increasedMagnitude, self.increasedPrecision, self.changedBehavior = modifierKeys[settings.increasedMagnitudeKeyIndex], modifierKeys[settings.increasedPrecisionKeyIndex], modifierKeys[settings.changedBehaviorKeyIndex]
+            if self.eventHandlersRevision != settings.bindingsRevision:
+                self.buildEventHandlers()
+            handler = self.eventHandlers.get(event.type)
+            if handler is None:
                 return {"RUNNING_MODAL"}
-            context.area.tag_redraw()
-            return {"RUNNING_MODAL"}
+            result = handler(context, event)
+            if result is None: # handled, view needs a redraw
+                context.area.tag_redraw()
+                return {"RUNNING_MODAL"}
+            return result
         except:
             self.exitOperator(context, True)
             raise
 
-    def getSatisfiedBinding(self) -> NavigationMouseButtonBinding:
-        downButtons = []
-        for button in ["lmb", "rmb", "mmb", "mb4", "mb5", "mb6", "mb7"]:
-            if self.isButtonDown(button):
-                downButtons.append(button)
-        if len(downButtons) == 0:
-            return None
-        singleBindings = []
-        doubleBindings = []
-        for binding in self.prefs.buttonBindings:
-            if binding.button1 in downButtons:
-                if binding.button2 == "omit":
-                    singleBindings.append(binding)
-                elif binding.button2 in downButtons:
-                    doubleBindings.append(binding)
-        if len(doubleBindings) > 0:
-            return doubleBindings[0]
-        if len(singleBindings) > 0:
-            return singleBindings[0]
-        return None
+    def handleMouseMove(self, context: bpy.types.Context, event: bpy.types.Event):
+        if self.ignoreMouseEvents > 0:
+            self.ignoreMouseEvents = self.ignoreMouseEvents - 1
+            self.bewareWarpDist = None
+            return {"RUNNING_MODAL"}
+        delta = Vector((event.mouse_x - event.mouse_prev_x, event.mouse_y - event.mouse_prev_y))
+        if self.bewareWarpDist is not None:
+            if delta.length > self.bewareWarpDist * 0.5 and delta.length > self.previousDelta.length * 2:
+                if self.settings.debug:
+                    print("mouse_strafing: detected cursor_warp glitch: using last mouse delta (" + str(self.previousDelta[0]) + ", " + str(self.previousDelta[1]) + ") instead of (" + str(delta[0]) + ", " + str(delta[1]) + ")")
+                delta = self.previousDelta
+            self.bewareWarpDist = None
+        if self.isInMouseAction and not (event.mouse_x == event.mouse_prev_x and event.mouse_y == event.mouse_prev_y):
+            actionFunc = self.getSatisfiedAction()
+            if actionFunc is not None:
+                if self.settings.coalesceMouseMoves:
+                    self.accumulateMouseMove(actionFunc, delta, event)
+                else:
+                    actionFunc(context, delta)
+            self.resetMouse(context, event)
+
+    def handleWheel(self, context: bpy.types.Context, event: bpy.types.Event):
+        settings = self.settings
+        if self.changedBehavior:
+            self.nudgeFov(context, (event.type == "WHEELUPMOUSE") != settings.scrollUpToZoomIn)
+        elif settings.wheelMoveFunction == "moveZ":
+            strafeFactor = self.getMovementFactor(False, settings.useGearsWheel)
+            self.move3dView(Vector((0, 0, -settings.wheelDistance * strafeFactor if event.type == "WHEELUPMOUSE" else settings.wheelDistance * strafeFactor)), Vector((0, 0, 0)))
+        elif settings.wheelMoveFunction == "changeStrafeSensitivity":
+            magnitude = 1 if event.type == "WHEELUPMOUSE" else -1
+            magnitude = magnitude * 5 if self.increasedMagnitude else magnitude
+            self.prefs.sensitivityStrafe = nudgeValue(settings.sensitivityStrafe, magnitude, self.increasedPrecision, strafeSensitivityRanges)
+            bpy.context.preferences.use_preferences_save = True
+            self.editStrafeSensitivityTimeNs = time.perf_counter_ns()
+            self.scheduleRedraws(self.editStrafeSensitivityTimeNs + overlayDurationNs)
+
+    def handleCycleGears(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.value == "PRESS":
+            self.cycleGear(context, event.shift, not self.keyCycleGearsDown)
+        self.keyCycleGearsDown = getKeyDown(self.keyCycleGearsDown, event)
+
+    def handleWasdKey(self, context: bpy.types.Context, event: bpy.types.Event):
+        self.updateKeys(context, event)
+        if self.stopSignal is None:
+            self.stopSignal = [False]
+            pinnedSv3d, pinnedRv3d = self.sv3d, self.rv3d
+            pinnedStopSignal = self.stopSignal
+            bpy.app.timers.register(lambda: fpsMove(self, pinnedSv3d, pinnedRv3d, pinnedStopSignal))
+
+    def handleSaveStateKey(self, context: bpy.types.Context, event: bpy.types.Event):
+        self.keySaveStateDown = getKeyDown(self.keySaveStateDown, event)
+        slotIndex = parseDigitString(event.type)
+        if self.keySaveStateDown and self.keySaveStateSlotDown[slotIndex]:
+            return {"RUNNING_MODAL"}
+        self.keySaveStateSlotDown[slotIndex] = self.keySaveStateDown
+        if self.keySaveStateDown:
+            self.processSaveState(slotIndex, context)
+        else:
+            self.loadedCameraState = False
+
+    def handleLoadCameraState(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.value == "PRESS":
+            self.loadCameraState = not self.loadCameraState
+
+    def handleCycleBookmarkPage(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.value == "PRESS":
+            store = self.initBookmarks(context)
+            self.showBookmarkOverlay(store.getPageName(store.cyclePage(event.shift)))
+
+    def handleRecordPath(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.value == "PRESS":
+            if pathRecorder.recording:
+                pathRecorder.stop()
+            else:
+                pathRecorder.start()
+                self.recordPathSample()
+            context.area.tag_redraw()
 
-    def isButtonDown(self, button: str) -> bool:
-        return {"lmb": self.lmbDown, "rmb": self.rmbDown, "mmb": self.mmbDown, "mb4": self.mb4Down, "mb5": self.mb5Down, "mb6": self.mb6Down, "mb7": self.mb7Down}[button]
+    def handleNearestBookmark(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.value == "PRESS":
+            self.loadNearestBookmark(context, -1 if event.shift else 1)
+
+    def handleRelocatePivot(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.value == "PRESS" and not self.keyDownRelocatePivot:
+            if event.shift:
+                self.prefs.adjustPivot = not self.settings.adjustPivot
+                bpy.context.preferences.use_preferences_save = True
+                self.requestPivotTracking()
+                self.relocatePivotLock = True
+                self.adjustPivotSuccess = False
+            else:
+                self.relocatePivotLock = False
+                if self.settings.adjustPivot:
+                    self.prefs.adjustPivot = False
+                    bpy.context.preferences.use_preferences_save = True
+        self.keyDownRelocatePivot = getKeyDown(self.keyDownRelocatePivot, event)
+        if self.keyDownRelocatePivot and not self.settings.adjustPivot and not self.relocatePivotLock and not event.shift:
+            self.adjustPivot(context)
+
+    def handleResetRoll(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.value == "PRESS":
+            self.resetRoll(context)
+
+    def handleEscape(self, context: bpy.types.Context, event: bpy.types.Event):
+        self.inEscape = getKeyDown(self.inEscape, event)
+        return self.considerExitOperator(context)
+
+    def accumulateMouseMove(self, actionFunc, delta: Vector, event: bpy.types.Event):
+        if self.pendingMouseAction is not actionFunc:
+            self.flushMouseMoves(bpy.context)
+            self.pendingMouseAction = actionFunc
+            self.pendingMouseModifiers = (event.shift, event.ctrl, event.alt)
+        self.pendingMouseDelta += delta
+        if time.perf_counter_ns() - self.previousDrawTimeNs >= self.drawIntervalNs:
+            # a frame is due and Blender redraws right after handling events, before timers run again
+            self.flushMouseMoves(bpy.context)
+            self.commitPose()
+        elif not self.mouseFlushScheduled:
+            self.mouseFlushScheduled = True
+            bpy.app.timers.register(lambda: flushMouseMoves(self), first_interval = 0) # for the moves that arrive between frames
+
+    def flushMouseMoves(self, context: bpy.types.Context):
+        if self.pendingMouseAction is None:
+            return
+        actionFunc, delta = self.pendingMouseAction, self.pendingMouseDelta
+        self.pendingMouseAction = None
+        self.pendingMouseDelta = Vector((0, 0))
+        self.pendingMouseModifiers = None
+        if delta[0] != 0 or delta[1] != 0:
+            actionFunc(context, delta)
+
+    def preparePose(self) -> tuple[Vector, Quaternion, Vector]:
+        # the operator's own copy of the view pose is authoritative while navigating, RNA is only read again when something else changed it
+        if self.poseSignature is not None:
+            if getPoseSignature(self.sv3d, self.rv3d) != self.poseSignature:
+                self.poseViewPos, self.poseViewRot = None, None
+            self.poseSignature = None
+        if self.poseViewPos is None:
+            viewPos, viewRot, viewDir = prepareCameraTransformation(self.sv3d, self.rv3d, self.viewLayer)
+            self.poseViewPos, self.poseViewRot = viewPos, viewRot.copy() # view_rotation would keep writing through to RNA
+            return self.poseViewPos, self.poseViewRot, viewDir
+        viewDir = Vector((0, 0, -1))
+        viewDir.rotate(self.poseViewRot)
+        return self.poseViewPos, self.poseViewRot, viewDir
+
+    def peekPose(self) -> tuple[Vector, Quaternion, Vector]:
+        if self.poseViewPos is None:
+            return peekCameraTransformation(self.sv3d, self.rv3d)
+        viewDir = Vector((0, 0, -1))
+        viewDir.rotate(self.poseViewRot)
+        return self.poseViewPos, self.poseViewRot, viewDir
+
+    def applyPose(self, viewPos: Vector, viewRot: Quaternion):
+        self.stopTransition() # navigating takes over from where a transition is
+        self.poseViewPos, self.poseViewRot = viewPos, viewRot
+        self.poseDirty = True
+        self.requestPivotTracking()
+        if not self.poseCommitScheduled:
+            self.poseCommitScheduled = True
+            bpy.app.timers.register(lambda: commitPose(self), first_interval = 0)
+
+    def commitPose(self):
+        if not self.poseDirty:
+            return
+        self.poseDirty = False
+        applyCameraTranformation(self.sv3d, self.rv3d, self.poseViewPos, self.poseViewRot)
+        self.poseSignature = getPoseSignature(self.sv3d, self.rv3d)
+
+    def invalidatePose(self):
+        # for changes to the view made directly through RNA, after committing any pending pose
+        self.poseViewPos, self.poseViewRot = None, None
+        self.poseDirty = False
+        self.poseSignature = None
+        self.requestPivotTracking()
+
+    def requestPivotTracking(self):
+        # the tracking timer stops once the candidate for the current view is found and is restarted when the view changes
+        if running and self.pivotTrackingStopSignal is None and self.settings.adjustPivot and self.settings.pivotTrackingBudget > 0:
+            self.pivotTrackingStopSignal = [False]
+            pinnedStopSignal = self.pivotTrackingStopSignal
+            bpy.app.timers.register(lambda: trackPivot(self, pinnedStopSignal), first_interval = 0)
+
+    def getSatisfiedAction(self):
+        table = getButtonBindingTable(self.prefs)
+        if table is not self.buttonActionSource:
+            self.buttonActionFuncs = [None if action is None else self.getActionFunc(action) for action in table]
+            self.buttonActionSource = table
+        return self.buttonActionFuncs[self.buttonMask]
 
     def isAnyButtonDown(self) -> bool:
-        return self.lmbDown or self.rmbDown or self.mmbDown or self.mb4Down or self.mb5Down or self.mb6Down or self.mb7Down
+        return self.buttonMask != 0
 
     def updateMode(self, context: bpy.types.Context, event: bpy.types.Event):
-        self.lmbDown = event.value == "PRESS" if event.type == "LEFTMOUSE" else self.lmbDown
-        self.rmbDown = event.value == "PRESS" if event.type == "RIGHTMOUSE" else self.rmbDown
-        self.mmbDown = event.value == "PRESS" if event.type == "MIDDLEMOUSE" else self.mmbDown
-        self.mb4Down = event.value == "PRESS" if event.type == "BUTTON4MOUSE" else self.mb4Down
-        self.mb5Down = event.value == "PRESS" if event.type == "BUTTON5MOUSE" else self.mb5Down
-        self.mb6Down = event.value == "PRESS" if event.type == "BUTTON6MOUSE" else self.mb6Down
-        self.mb7Down = event.value == "PRESS" if event.type == "BUTTON7MOUSE" else self.mb7Down
+        buttonBit = mouseButtonBits.get(event.type, 0)
+        self.buttonMask = (self.buttonMask | buttonBit) if event.value == "PRESS" else (self.buttonMask & ~buttonBit)
         isAnyButtonDown = self.isAnyButtonDown()
         enteringMouseMode = isAnyButtonDown and not self.isInMouseAction
         leavingMouseMode = self.isInMouseAction and not isAnyButtonDown
@@ -366,40 +566,42 @@ class MouseStrafingOperator(bpy.types.Operator):
 
     def updateKeys(self, context: bpy.types.Context, event: bpy.types.Event):
         wasWasding = self.isWasding
-        self.keyDownForward = event.value == "PRESS" if event.type == self.prefs.keyForward else self.keyDownForward
-        self.keyDownLeft = event.value == "PRESS" if event.type == self.prefs.keyLeft else self.keyDownLeft
-        self.keyDownBackward = event.value == "PRESS" if event.type == self.prefs.keyBackward else self.keyDownBackward
-        self.keyDownRight = event.value == "PRESS" if event.type == self.prefs.keyRight else self.keyDownRight
-        self.keyDownDown = event.value == "PRESS" if event.type == self.prefs.keyDown else self.keyDownDown
-        self.keyDownUp = event.value == "PRESS" if event.type == self.prefs.keyUp else self.keyDownUp
+        self.keyDownForward = event.value == "PRESS" if event.type == self.settings.keyForward else self.keyDownForward
+        self.keyDownLeft = event.value == "PRESS" if event.type == self.settings.keyLeft else self.keyDownLeft
+        self.keyDownBackward = event.value == "PRESS" if event.type == self.settings.keyBackward else self.keyDownBackward
+        self.keyDownRight = event.value == "PRESS" if event.type == self.settings.keyRight else self.keyDownRight
+        self.keyDownDown = event.value == "PRESS" if event.type == self.settings.keyDown else self.keyDownDown
+        self.keyDownUp = event.value == "PRESS" if event.type == self.settings.keyUp else self.keyDownUp
         self.isWasding = self.keyDownForward or self.keyDownLeft or self.keyDownBackward or self.keyDownRight or self.keyDownDown or self.keyDownUp
         if not wasWasding or not self.isWasding:
             self.wasdSpeedPercentage = 0.0
         if not wasWasding and self.isWasding:
-            self.wasdStartTimeNs = time.perf_counter_ns()
-            self.wasdPreviousTimeNs = self.wasdStartTimeNs
+            self.wasdElapsedNs = 0
+            self.wasdPreviousTimeNs = time.perf_counter_ns()
+            self.wasdAccumulatorNs = 0
 
     def pan3dView(self, delta: Vector):
-        viewPos, viewRot, _viewDir = prepareCameraTransformation(self.sv3d, self.rv3d)
+        viewPos, viewRot, _viewDir = self.preparePose()
         yawRot = Quaternion(Vector((0, 0, 1)), -delta[0])
         pitchAxis = Vector((1, 0, 0))
         pitchAxis.rotate(viewRot)
         pitchRot = Quaternion(pitchAxis, delta[1])
         viewRot.rotate(pitchRot)
         viewRot.rotate(yawRot)
-        applyCameraTranformation(self.sv3d, self.rv3d, viewPos, viewRot)
+        self.applyPose(viewPos, viewRot)
 
     def roll3dView(self, delta: Vector):
-        viewPos, rot, viewDir = prepareCameraTransformation(self.sv3d, self.rv3d)
+        viewPos, rot, viewDir = self.preparePose()
         roll = Quaternion(viewDir, delta[0])
         rot.rotate(roll)
-        applyCameraTranformation(self.sv3d, self.rv3d, viewPos, rot)
+        self.applyPose(viewPos, rot)
 
     def move3dView(self, delta: Vector, globalDelta: Vector):
-        viewPos, rot, _viewDir = prepareCameraTransformation(self.sv3d, self.rv3d)
-        delta.rotate(Quaternion(rot))
-        viewPos = viewPos + delta + globalDelta
-        applyCameraTranformation(self.sv3d, self.rv3d, viewPos, rot)
+        viewPos, rot, _viewDir = self.preparePose()
+        delta.rotate(rot)
+        viewPos += delta
+        viewPos += globalDelta
+        self.applyPose(viewPos, rot)
 
     def cycleGear(self, context: bpy.types.Context, gearDown: bool, allowWrap: bool):
         availableGears = self.getGears()
@@ -418,13 +620,10 @@ class MouseStrafingOperator(bpy.types.Operator):
         self.prefs.strafeGearSelected = availableGears[gearIndex]
         bpy.context.preferences.use_preferences_save = True
         self.editGearTimeNs = time.perf_counter_ns()
+        self.scheduleRedraws(self.editGearTimeNs + overlayDurationNs)
 
     def getGears(self):
-        availableGears = []
-        for gear in self.prefs.strafeGears:
-            if gear != 0.0:
-                availableGears.append(gear)
-        return availableGears
+        return self.settings.gears
 
     def findGear(self, gears: list) -> tuple[float, int]:
         smallestError = math.inf
@@ -432,7 +631,7 @@ class MouseStrafingOperator(bpy.types.Operator):
         smallestErrorGearIndex = -1
         index = 0
         for gear in gears:
-            error = abs(gear - self.prefs.strafeGearSelected)
+            error = abs(gear - self.settings.strafeGearSelected)
             if error <= smallestError:
                 smallestError = error
                 smallestErrorGear = gear
@@ -448,12 +647,28 @@ class MouseStrafingOperator(bpy.types.Operator):
             if self.sv3d.lock_camera and self.sv3d.camera is not None and self.sv3d.camera.type == "CAMERA" and type(self.sv3d.camera.data) is bpy.types.Camera:
                 cam = bpy.types.Camera(self.sv3d.camera.data)
                 sensorSize = getSensorSize(context, cam)
-                cam.lens = self.nudgeLensValue(cam.lens, sensorSize[0], sensorSize[1], self.prefs.altWheelMoveFunction, zoomOut)
+                cam.lens = self.nudgeLensValue(cam.lens, sensorSize[0], sensorSize[1], self.settings.altWheelMoveFunction, zoomOut)
                 self.editFovTimeNs = time.perf_counter_ns()
         else:
-            sensorSize = getSensorSizeView3d(context)
-            self.sv3d.lens = self.nudgeLensValue(self.sv3d.lens, sensorSize[0], sensorSize[1], self.prefs.altWheelMoveFunction, zoomOut)
+            sensorSize = getSensorSizeView3d(self.region)
+            self.sv3d.lens = self.nudgeLensValue(self.sv3d.lens, sensorSize[0], sensorSize[1], self.settings.altWheelMoveFunction, zoomOut)
             self.editFovTimeNs = time.perf_counter_ns()
+        self.lensSensor = None
+        self.scheduleRedraws(self.editFovTimeNs + overlayDurationNs)
+        if pathRecorder.recording:
+            self.recordPathSample()
+
+    def recordPathSample(self):
+        viewPos, viewRot, _viewDir = self.peekPose()
+        pathRecorder.record(viewPos, viewRot, getViewLens(self.sv3d, self.rv3d))
+
+    def scheduleRedraws(self, untilNs: int):
+        # one timer redraws the view at a limited rate until the last running animation (e.g. an overlay fading out) has settled
+        self.animationDeadlineNs = max(self.animationDeadlineNs, untilNs)
+        if self.animationStopSignal is None:
+            self.animationStopSignal = [False]
+            pinnedStopSignal = self.animationStopSignal
+            bpy.app.timers.register(lambda: animateView(self, pinnedStopSignal), first_interval = 0)
 
     def nudgeLensValue(self, lens: float, sensorWidth: float, sensorHeight: float, method: str, zoomOut: bool) -> float:
         magnitude = 1 if zoomOut else -1
@@ -465,55 +680,133 @@ class MouseStrafingOperator(bpy.types.Operator):
             return fovToFocalLength(nudgeValue(focalLengthToFov(lens, sensorHeight), magnitude, self.increasedPrecision, fovRanges), sensorHeight)
         return nudgeValue(lens, magnitude, self.increasedPrecision, focalLengthRanges)
 
-    def processSaveState(self, saveStateSlot, context: bpy.types.Context):
-        self.initSaveStates(context)
+    def processSaveState(self, digit: int, context: bpy.types.Context):
+        store = self.initBookmarks(context)
+        bookmarks = store.bookmarks
+        saveStateSlot = store.getSlot(digit)
         nowNs = time.perf_counter_ns()
-        states: CameraStates = context.scene.mstrf_camera_save_states
         if self.loadCameraState:
-            if states.imminentSlot != 0:
-                self.saveCameraState(states, states.imminentSlot, states.imminentState)
-                states.imminentSlot = -1
-            if states.usedStates[saveStateSlot]:
-                self.applyCameraState(context, states.savedStates[saveStateSlot])
+            store.commitImminent()
+            if store.isUsed(saveStateSlot):
+                self.nearestBookmarks = None
+                self.applyCameraState(context, *unpackRecord(store.getRecord(saveStateSlot)))
                 self.loadedCameraState = True
             self.loadCameraState = False
-        elif states.imminentSlot == saveStateSlot and self.imminentSaveStateTimeNs > nowNs - 1000 * ms:
-            if not states.usedStates[states.imminentSlot]:
-                self.saveCameraState(states, states.imminentSlot, states.imminentState)
-            self.applyCameraState(context, states.savedStates[saveStateSlot])
+        elif bookmarks.imminentSlot == saveStateSlot and self.imminentSaveStateTimeNs > nowNs - 1000 * ms:
+            if not store.isUsed(saveStateSlot):
+                store.setRecord(saveStateSlot, bookmarks.imminentRecord)
+            self.nearestBookmarks = None
+            self.applyCameraState(context, *unpackRecord(store.getRecord(saveStateSlot)))
             self.loadedCameraState = True
-            states.imminentSlot = -1
+            bookmarks.imminentSlot = -1
         else:
             self.loadedCameraState = False
-            if states.imminentSlot >= 0:
-                self.saveCameraState(states, states.imminentSlot, states.imminentState)
-            viewPos, rot, _viewDir = prepareCameraTransformation(self.sv3d, self.rv3d)
-            states.imminentState.viewPos = viewPos
-            states.imminentState.rot = rot
-            states.imminentState.viewDist = self.rv3d.view_distance
-            states.imminentState.lens = self.sv3d.lens
-            states.imminentState.isPerspective = self.rv3d.is_perspective
-            states.imminentSlot = saveStateSlot
+            store.commitImminent()
+            viewPos, rot, _viewDir = self.preparePose()
+            bookmarks.imminentRecord = packRecord(viewPos, rot, self.rv3d.view_distance, self.sv3d.lens, self.rv3d.is_perspective)
+            bookmarks.imminentSlot = saveStateSlot
             self.imminentSaveStateTimeNs = nowNs
 
-    def saveCameraState(self, states: CameraStates, slot, state: CameraState):
-        states.usedStates[slot] = True
-        states.savedStates[slot].viewPos = state.viewPos
-        states.savedStates[slot].rot = state.rot
-        states.savedStates[slot].viewDist = state.viewDist
-        states.savedStates[slot].lens = state.lens
-        states.savedStates[slot].isPerspective = state.isPerspective
-
-    def applyCameraState(self, context:bpy.types.Context, cameraState: CameraState):
-        if self.rv3d.is_perspective != cameraState.isPerspective:
+    def loadNearestBookmark(self, context: bpy.types.Context, step: int):
+        store = self.initBookmarks(context)
+        self.commitPose()
+        if self.nearestBookmarks is None or (self.transition is None and getPoseSignature(self.sv3d, self.rv3d) != self.nearestBookmarkSignature):
+            # the view moved since the last jump, so look around the new one; turning by one radian weighs as much as
+            # moving the pivot by view distance
+            viewPos, _viewRot, viewDir = self.peekPose()
+            self.nearestBookmarks = store.findNearest(viewPos, viewDir, self.rv3d.view_distance, nearestBookmarkCount)
+            if len(self.nearestBookmarks) == 0:
+                self.nearestBookmarks = None
+                return
+            tolerance = samePoseTolerance * (max(abs(viewPos[0]), abs(viewPos[1]), abs(viewPos[2])) + self.rv3d.view_distance) + 1e-6
+            alreadyThere = self.nearestBookmarks[0][0] < tolerance and len(self.nearestBookmarks) > 1
+            self.nearestBookmarkIndex = (1 if alreadyThere else 0) if step > 0 else len(self.nearestBookmarks) - 1
+        else:
+            self.nearestBookmarkIndex = (self.nearestBookmarkIndex + step) % len(self.nearestBookmarks)
+        slot = self.nearestBookmarks[self.nearestBookmarkIndex][1]
+        self.applyCameraState(context, *unpackRecord(store.getRecord(slot)))
+        self.nearestBookmarkSignature = getPoseSignature(self.sv3d, self.rv3d) if self.transition is None else None # see finishTransition()
+        store.bookmarks.page = slot // slotsPerPage
+        self.showBookmarkOverlay(f"{store.getPageName(slot // slotsPerPage)}: {slot % slotsPerPage}")
+
+    def showBookmarkOverlay(self, text: str):
+        self.bookmarkOverlayText = text
+        self.editBookmarkTimeNs = time.perf_counter_ns()
+        self.scheduleRedraws(self.editBookmarkTimeNs + overlayDurationNs)
+
+    def applyCameraState(self, context:bpy.types.Context, viewPos: Vector, rot: Quaternion, viewDist: float, lens: float, isPerspective: bool):
+        if self.settings.transitionDuration > 0:
+            self.startTransition(viewPos, rot, viewDist, lens, isPerspective)
+            return
+        self.stopTransition()
+        self.commitPose()
+        if self.rv3d.is_perspective != isPerspective:
             bpy.ops.view3d.view_persportho()
-        self.rv3d.view_distance = cameraState.viewDist
-        if not self.prefs.leaveFOV:
-            self.sv3d.lens = cameraState.lens
+        self.rv3d.view_distance = viewDist
+        if not self.settings.leaveFOV:
+            self.sv3d.lens = lens
+        self.lensSensor = None
 
-        vP = cameraState.viewPos
-        r = cameraState.rot
-        applyCameraTranformation(self.sv3d, self.rv3d, Vector((vP[0], vP[1], vP[2])), Quaternion((r[0], r[1], r[2], r[3])))
+        applyCameraTranformation(self.sv3d, self.rv3d, viewPos, rot)
+        self.invalidatePose()
+
+    def startTransition(self, viewPos: Vector, rot: Quaternion, viewDist: float, lens: float, isPerspective: bool):
+        # glide there in perspective: switch to perspective right away or to orthographic only once arrived
+        self.stopTransition()
+        self.commitPose()
+        if isPerspective and not self.rv3d.is_perspective:
+            bpy.ops.view3d.view_persportho()
+        orthographicAtEnd = not isPerspective and self.rv3d.is_perspective
+        startPos, startRot, _viewDir = self.preparePose()
+        startPos, startRot = startPos.copy(), startRot.copy()
+        startDist, startLens = self.rv3d.view_distance, self.sv3d.lens
+        zoomDist = not self.rv3d.is_perspective and viewDist != startDist # view distance is the zoom of orthographic views
+        zoomLens = not self.settings.leaveFOV and lens != startLens
+        if not zoomDist:
+            self.rv3d.view_distance = viewDist # only moves the pivot, as the first frame sets the view position again
+
+        frameCount = max(1, round(self.settings.transitionDuration * 1_000_000_000 / self.drawIntervalNs))
+        frames = []
+        for i in range(1, frameCount):
+            t = i / frameCount
+            t = t * t * (3 - 2 * t) # ease in and out
+            frames.append((startPos.lerp(viewPos, t), startRot.slerp(rot, t), \
+                startDist + (viewDist - startDist) * t if zoomDist else None, startLens + (lens - startLens) * t if zoomLens else None))
+        frames.append((viewPos, rot, viewDist if zoomDist else None, lens if zoomLens else None))
+        self.transition = ViewTransition(frames, self.drawIntervalNs, orthographicAtEnd)
+        self.transitionStopSignal = [False]
+        pinnedStopSignal = self.transitionStopSignal
+        if stepTransition(self, pinnedStopSignal) is not None:
+            bpy.app.timers.register(lambda: stepTransition(self, pinnedStopSignal), first_interval = 0)
+
+    def applyTransitionFrame(self, frameIndex: int):
+        viewPos, viewRot, viewDist, lens = self.transition.frames[frameIndex]
+        self.transition.frameIndex = frameIndex
+        if viewDist is not None:
+            self.rv3d.view_distance = viewDist
+        if lens is not None:
+            self.sv3d.lens = lens
+            self.lensSensor = None
+        self.poseViewPos, self.poseViewRot = viewPos.copy(), viewRot.copy()
+        self.poseDirty = True
+        self.requestPivotTracking()
+        self.commitPose()
+
+    def finishTransition(self):
+        transition = self.transition
+        if transition.frameIndex < len(transition.frames) - 1:
+            self.applyTransitionFrame(len(transition.frames) - 1)
+        self.stopTransition()
+        if transition.orthographicAtEnd:
+            self.rv3d.view_perspective = "ORTHO" # not view_persportho(), which fails its poll when called from a timer
+        if self.nearestBookmarks is not None and self.nearestBookmarkSignature is None:
+            self.nearestBookmarkSignature = getPoseSignature(self.sv3d, self.rv3d)
+
+    def stopTransition(self):
+        if self.transitionStopSignal is not None:
+            self.transitionStopSignal[0] = True
+            self.transitionStopSignal = None
+        self.transition = None
 
     def getPanFactor(self, context: bpy.types.Context):
         focalLength, _sensorSize, _cam = self.getContextualLensSensor(context)
@@ -532,25 +825,28 @@ class MouseStrafingOperator(bpy.types.Operator):
 
     def getMovementFactor(self, isForMouseMovement: bool, useGear: bool) -> float:
         mod = self.getMovementFactorModifier()
-        gear = self.prefs.strafeGearSelected if useGear else 1
-        unitSystemConversion = self.prefs.speedMultiplierForUnitSystemNone if self.isUnitSystemNone else 1.0
+        gear = self.settings.strafeGearSelected if useGear else 1
+        unitSystemConversion = self.settings.speedMultiplierForUnitSystemNone if self.isUnitSystemNone else 1.0
         if isForMouseMovement:
-            return mouseSanityMultiplierStrafe * self.prefs.sensitivityStrafe * mod * gear * unitSystemConversion
+            return mouseSanityMultiplierStrafe * self.settings.sensitivityStrafe * mod * gear * unitSystemConversion
         return mod * gear * unitSystemConversion
 
     def getMovementFactorModifier(self):
         if self.isHigherMagnitudeRequested():
-            return self.prefs.increasedMagnitudeSpeedFactor
+            return self.settings.increasedMagnitudeSpeedFactor
         if self.isPrecisionRequested():
-            return self.prefs.increasedPrecisionSpeedFactor
+            return self.settings.increasedPrecisionSpeedFactor
         return 1
 
     def getContextualLensSensor(self, context) -> tuple[float, tuple[float, float], bpy.types.Camera]:
-        if self.isViewingCamera():
-            cam = bpy.types.Camera(self.sv3d.camera.data)
-            return cam.lens, getSensorSize(context, cam), cam
-        else:
-            return self.sv3d.lens, getSensorSizeView3d(context), None
+        # cached between redraws, which check whether anything it depends on has changed, see getLensSensorKey()
+        if self.lensSensor is None:
+            if self.isViewingCamera():
+                cam = bpy.types.Camera(self.sv3d.camera.data)
+                self.lensSensor = cam.lens, getSensorSize(context, cam), cam
+            else:
+                self.lensSensor = self.sv3d.lens, getSensorSizeView3d(self.region), None
+        return self.lensSensor
 
     def isViewingCamera(self) -> bool:
         return self.rv3d.view_perspective == "CAMERA" and self.sv3d.camera is not None and self.sv3d.camera.type == "CAMERA" and type(self.sv3d.camera.data) is bpy.types.Camera
@@ -564,42 +860,51 @@ class MouseStrafingOperator(bpy.types.Operator):
     def isPrecisionRequested(self) -> bool:
         return self.increasedPrecision and (self.increasedPrecision != self.increasedMagnitude)
 
-    def adjustPivot(self, context: bpy.types.Context):
-        self.adjustPivotSuccess = False
-        hit = None
-        viewPos, rot, viewDir = prepareCameraTransformation(self.sv3d, self.rv3d)
+    def getPivotRay(self, viewPos: Vector, viewDir: Vector) -> tuple[Vector, Vector, float, bool]:
         castStart = viewPos + viewDir * self.sv3d.clip_start
         castLength = self.sv3d.clip_end - self.sv3d.clip_start
-        if self.prefs.pivotAdjustmentIgnoreBackfaces == "always" or (self.prefs.pivotAdjustmentIgnoreBackfaces == "whenCulling" and self.sv3d.shading.show_backface_culling):
-            hit = rayCastIgnoringBackfaces(context.scene, context.window.view_layer.depsgraph, castStart, viewDir, castLength)
-        else:
-            hit = context.scene.ray_cast(context.window.view_layer.depsgraph, castStart, viewDir, distance = castLength)
+        ignoreBackfaces = self.settings.pivotAdjustmentIgnoreBackfaces == "always" or (self.settings.pivotAdjustmentIgnoreBackfaces == "whenCulling" and self.sv3d.shading.show_backface_culling)
+        return castStart, viewDir, castLength, ignoreBackfaces
+
+    def adjustPivot(self, context: bpy.types.Context):
+        self.adjustPivotSuccess = False
+        self.commitPose()
+        viewPos, rot, viewDir = self.preparePose()
+        hit = self.pivotTracker.resolve(self.viewLayer.depsgraph, *self.getPivotRay(viewPos, viewDir))
         if hit[0]:
-            newPivotPos = viewPos + (Vector(hit[1]) - viewPos) * (1.0 + self.prefs.pivotDig * 0.01)
+            newPivotPos = viewPos + (Vector(hit[1]) - viewPos) * (1.0 + self.settings.pivotDig * 0.01)
             self.rv3d.view_distance = (newPivotPos - viewPos).length
             applyCameraTranformation(self.sv3d, self.rv3d, viewPos, rot, True)
+            self.invalidatePose()
             self.adjustPivotSuccess = True
 
     def resetRoll(self, context: bpy.types.Context):
-        viewPos, rot, viewDir = prepareCameraTransformation(self.sv3d, self.rv3d)
+        viewPos, rot, viewDir = self.preparePose()
         up = Vector((0, 1, 0))
         up.rotate(rot)
         py = getPitchYaw(viewDir, up)
         newRot = Quaternion(Vector((1, 0, 0)), py[0])
         if py[0] != 0:
             newRot.rotate(Quaternion(Vector((0, 0, 1)), py[1]))
-        applyCameraTranformation(self.sv3d, self.rv3d, viewPos, newRot)
+        self.applyPose(viewPos, newRot)
 
     def wasdDelta(self):
+        # fixed timestep integration, so the distance travelled does not depend on how regularly the timer gets called
         nowNs = time.perf_counter_ns()
-        moveFactor = self.getMovementFactor(False, self.prefs.useGearsWasd)
-        delta = moveFactor * self.wasdSpeedPercentage * self.prefs.wasdTopSpeed * ((nowNs - self.wasdPreviousTimeNs) / 1_000_000_000)
+        self.wasdAccumulatorNs += min(nowNs - self.wasdPreviousTimeNs, wasdMaxCatchUpNs)
         self.wasdPreviousTimeNs = nowNs
+        moveFactor = self.getMovementFactor(False, self.settings.useGearsWasd)
+        delta = 0.0
+        while self.wasdAccumulatorNs >= wasdTimestepNs:
+            self.wasdAccumulatorNs -= wasdTimestepNs
+            self.wasdElapsedNs += wasdTimestepNs
+            self.wasdAccelerate()
+            delta += moveFactor * self.wasdSpeedPercentage * self.settings.wasdTopSpeed * (wasdTimestepNs / 1_000_000_000)
         return delta
-    
+
     def wasdAccelerate(self):
-        if self.wasdSpeedPercentage < 1 and self.prefs.wasdTime > 0.0005:
-            self.wasdSpeedPercentage = ((time.perf_counter_ns() - self.wasdStartTimeNs) / 1_000_000_000 / self.prefs.wasdTime)
+        if self.wasdSpeedPercentage < 1 and self.settings.wasdTime > 0.0005:
+            self.wasdSpeedPercentage = (self.wasdElapsedNs / 1_000_000_000 / self.settings.wasdTime)
             if self.wasdSpeedPercentage > 1:
                 self.wasdSpeedPercentage = 1
         else:
@@ -629,69 +934,96 @@ class MouseStrafingOperator(bpy.types.Operator):
         return {"RUNNING_MODAL"}
 
     def shouldExitOperator(self):
-        return (not self.prefs.toggleMode and not self.operatorKeyDown and not self.isInMouseAction) or (self.prefs.toggleMode and self.operatorKeyPresses > 0) or (self.inEscape)
+        return (not self.settings.toggleMode and not self.operatorKeyDown and not self.isInMouseAction) or (self.settings.toggleMode and self.operatorKeyPresses > 0) or (self.inEscape)
 
     def exitOperator(self, context: bpy.types.Context, forceResetMouse: bool = False):
         global running
         global drawCallbackHandle
         if self.isInMouseAction or forceResetMouse:
             self.exitMouseMode(context)
+        if not forceResetMouse:
+            self.flushMouseMoves(context)
+        if self.transition is not None:
+            self.finishTransition()
+        self.commitPose()
         running = False
         if self.stopSignal is not None:
             self.stopSignal[0] = True
             self.stopSignal = None
+        if self.pivotTrackingStopSignal is not None:
+            self.pivotTrackingStopSignal[0] = True
+            self.pivotTrackingStopSignal = None
+        if self.animationStopSignal is not None:
+            self.animationStopSignal[0] = True
+            self.animationStopSignal = None
         bpy.types.SpaceView3D.draw_handler_remove(drawCallbackHandle, "WINDOW")
         drawCallbackHandle = None
-        if self.prefs.adjustPivot:
+        if self.settings.adjustPivot:
             self.adjustPivot(context)
         context.area.tag_redraw()
-        return {self.returnValue}
-
-def rayCastIgnoringBackfaces(scene: bpy.types.Scene, depsgraph, origin: Vector, direction: Vector, maxDistance: float):
-    attemptCount = 0
-    invert = False # there is no way to retrieve all hits, so we need to spam some rays back and forth.
-    minCast = origin
-    maxCast = origin + direction * maxDistance
-    while attemptCount < 100:
-        attemptCount = attemptCount + 1
-        castDir = -direction if invert else direction
-        castLength = (minCast - origin).dot(castDir) if invert else (maxCast - minCast).dot(castDir)
-        if not invert and castLength <= 0:
-            return rayCastMiss()
-        hit = scene.ray_cast(depsgraph, origin, castDir, distance = castLength)
-        if not hit[0]:
-            return rayCastMiss()
-        hitBackface = Vector(hit[2]).dot(direction) > 0
-        if hitBackface:
-            if invert:
-                invert = not invert
-                continue
-            nudge = origin.length * 0.000001
-            if nudge < 0.00001:
-                nudge = 0.00001
-            elif nudge > 0.004:
-                nudge = 0.004
-            origin = hit[1] + direction * nudge
-            invert = not invert
-            continue
-        return hit
-    return rayCastMiss()
-
-def rayCastMiss():
-    return (False, None, None, -1, None, None)
+        policy = self.settings.undoPolicy
+        if policy == "session" or policy == "timed":
+            self.pushUndoStep() # the (rest of the) navigation session
+        elif policy == "none":
+            pass # camera changes stay out of the undo history
+        return {"FINISHED"} if self.hasCameraChanged() else {"CANCELLED"}
+
+    def considerTimedUndoStep(self):
+        nowNs = time.perf_counter_ns()
+        if nowNs >= self.undoStepDueNs:
+            self.commitPose()
+            self.pushUndoStep()
+            self.undoStepDueNs = nowNs + int(self.settings.undoStepInterval * 1_000_000_000)
+
+    def pushUndoStep(self):
+        if self.editedCamera is not None and getCameraSignature(self.editedCamera) != self.undoCameraSignature:
+            bpy.ops.ed.undo_push(message = self.bl_label)
+            self.undoCameraSignature = getCameraSignature(self.editedCamera)
+
+    def hasCameraChanged(self) -> bool:
+        return self.editedCamera is not None and getCameraSignature(self.editedCamera) != self.editedCameraSignature
 
 def clamp(x, min, max):
     return min if x < min else (max if x > max else x)
 
-def magnitudeRepeat(nudgeFunc):
-    def repeatNudgeFunc(value: float, magnitude: int, fine: bool, ranges: list) -> float:
-        for i in range(0, -magnitude if magnitude < 0 else magnitude, 1):
-            value = nudgeFunc(value, 1 if magnitude >= 0 else -1, fine, ranges)
-        return value
-    return repeatNudgeFunc
+nudgeLadders = {}
 
-@magnitudeRepeat
 def nudgeValue(value: float, magnitude: int, fine: bool, ranges: list) -> float:
+    # same result as applying nudgeStep() abs(magnitude) times: the first step snaps value onto the ladder of values
+    # reachable by nudging in that direction, every further step moves one rung
+    if magnitude == 0:
+        return value
+    direction = 1 if magnitude > 0 else -1
+    value = nudgeStep(value, direction, fine, ranges)
+    if magnitude == direction:
+        return value
+    ladder = getNudgeLadder(ranges, fine, direction)
+    index = bisect.bisect_left(ladder, value)
+    if index < len(ladder) and ladder[index] == value:
+        return ladder[clamp(index + magnitude - direction, 0, len(ladder) - 1)]
+    for i in range(abs(magnitude) - 1):
+        value = nudgeStep(value, direction, fine, ranges)
+    return value
+
+def getNudgeLadder(ranges: list, fine: bool, direction: int) -> array:
+    # coarse steps down across a range boundary land on slightly different floats than steps up, hence one ladder per direction
+    key = (ranges, fine, 0 if fine else direction)
+    ladder = nudgeLadders.get(key)
+    if ladder is None:
+        minimum, maximum = ranges[0][0], ranges[len(ranges) - 1]
+        if fine:
+            ladder = array('d', (i / 1000 for i in range(round(minimum * 1000), round(maximum * 1000) + 1))) # i / 1000 is the float nearest to the decimal, like round()
+        else:
+            end = maximum if direction > 0 else minimum
+            ladder = array('d', [minimum if direction > 0 else maximum])
+            while ladder[-1] != end:
+                ladder.append(nudgeStep(ladder[-1], direction, False, ranges))
+            if direction < 0:
+                ladder.reverse()
+        nudgeLadders[key] = ladder
+    return ladder
+
+def nudgeStep(value: float, magnitude: int, fine: bool, ranges: list) -> float:
     minimum = ranges[0][0]
     maximum = ranges[len(ranges) - 1]
     for i in range(len(ranges) - 2, -1, -1):
@@ -711,25 +1043,60 @@ def nudgeValue(value: float, magnitude: int, fine: bool, ranges: list) -> float:
         return maximum
     return value
 
-def prepareCameraTransformation(sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D) -> tuple[Vector, Quaternion, Vector]:
+def prepareCameraTransformation(sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D, viewLayer: bpy.types.ViewLayer) -> tuple[Vector, Quaternion, Vector]:
+    global cameraEvaluationPending
     considerViewToCamera(sv3d, rv3d)
     viewPos, _viewDir = getViewPos(rv3d)
     viewRot = rv3d.view_rotation
     if rv3d.view_perspective == "CAMERA" and sv3d.lock_camera and sv3d.camera is not None:
+        if cameraEvaluationPending:
+            viewLayer.update() # matrix_local reads the evaluated transform, which is stale after our own write
+            cameraEvaluationPending = False
         viewPos, viewRot, _viewScale = sv3d.camera.matrix_local.decompose()
     viewDir = Vector((0, 0, -1))
     viewDir.rotate(viewRot)
     return viewPos, viewRot, viewDir
 
+def getCameraSignature(camera: bpy.types.Object) -> tuple:
+    if camera is None:
+        return None
+    return camera.matrix_basis.copy(), camera.data.lens
+
+def getPoseSignature(sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D) -> tuple:
+    # read back right after writing the pose, so an unchanged view compares equal despite RNA's float precision
+    if rv3d.view_perspective == "CAMERA" and sv3d.camera is not None:
+        return rv3d.view_perspective, sv3d.lock_camera, sv3d.camera, sv3d.camera.matrix_basis.copy() # unlike matrix_local, not stale until the depsgraph is evaluated
+    return rv3d.view_perspective, rv3d.view_location.copy(), rv3d.view_rotation.copy(), rv3d.view_distance
+
+def peekCameraTransformation(sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D) -> tuple[Vector, Quaternion, Vector]:
+    # like prepareCameraTransformation(), but without breaking out of an unlocked camera view
+    if rv3d.view_perspective == "CAMERA" and sv3d.camera is not None:
+        viewPos, viewRot, _viewScale = sv3d.camera.matrix_local.decompose()
+    else:
+        viewPos, _viewDir = getViewPos(rv3d)
+        viewRot = rv3d.view_rotation
+    viewDir = Vector((0, 0, -1))
+    viewDir.rotate(viewRot)
+    return viewPos, viewRot, viewDir
+
 def applyCameraTranformation(sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D, viewPos: Vector, viewRot: Quaternion, forceSetView = False):
+    global cameraEvaluationPending
     if not forceSetView and rv3d.view_perspective == "CAMERA" and sv3d.lock_camera and sv3d.camera is not None:
         axis, angle = viewRot.to_axis_angle()
         scale = sv3d.camera.matrix_local.to_scale()
         mat = mathutils.Matrix.Translation(viewPos) @ mathutils.Matrix.Rotation(angle, 4, axis) @ mathutils.Matrix.Diagonal(Vector((scale[0], scale[1], scale[2], 1)))
         sv3d.camera.matrix_local = mat
+        cameraEvaluationPending = True
     else:
         rv3d.view_rotation = viewRot
         setViewPos(rv3d, viewPos)
+    if pathRecorder.recording:
+        pathRecorder.record(viewPos, viewRot, getViewLens(sv3d, rv3d))
+
+def getViewLens(sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D) -> float:
+    if rv3d.view_perspective == "CAMERA" and sv3d.camera is not None and sv3d.camera.type == "CAMERA":
+        return sv3d.camera.data.lens
+    return sv3d.lens
 
 def considerViewToCamera(sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D):
     if rv3d.view_perspective == "CAMERA" and not sv3d.lock_camera and sv3d.camera is not None:
@@ -758,9 +1125,25 @@ def getPitchYaw(dir: Vector, up: Vector):
         yaw = math.pi - yaw
     return Vector((pitch, yaw))
 
+def flushMouseMoves(op: MouseStrafingOperator):
+    op.mouseFlushScheduled = False
+    if running:
+        op.flushMouseMoves(bpy.context)
+    return None
+
+def commitPose(op: MouseStrafingOperator):
+    op.poseCommitScheduled = False
+    if running:
+        op.commitPose()
+    return None
+
 def fpsMove(op: MouseStrafingOperator, sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D, stopSignal):
     if not running or stopSignal[0]: return None
-    if op.isWasding: op.wasdAccelerate()
+    if not op.isWasding:
+        if op.stopSignal is stopSignal:
+            op.stopSignal = None # idle until the next movement key press registers a new tick
+        return None
+    op.flushMouseMoves(bpy.context)
     delta = op.wasdDelta()
     deltaVecLocal = Vector((0, 0, 0))
     deltaVecGlobal = Vector((0, 0, 0))
@@ -769,45 +1152,87 @@ def fpsMove(op: MouseStrafingOperator, sv3d: bpy.types.SpaceView3D, rv3d: bpy.ty
     if op.keyDownBackward: deltaVecLocal = deltaVecLocal + Vector((0, 0, delta))
     if op.keyDownRight: deltaVecLocal = deltaVecLocal + Vector((delta, 0, 0))
     if op.keyDownDown:
-        if op.prefs.wasdGlobalZ:
+        if op.settings.wasdGlobalZ:
             deltaVecGlobal = deltaVecGlobal + Vector((0, 0, -delta))
         else:
             deltaVecLocal = deltaVecLocal + Vector((0, -delta, 0))
     if op.keyDownUp:
-        if op.prefs.wasdGlobalZ:
+        if op.settings.wasdGlobalZ:
             deltaVecGlobal = deltaVecGlobal + Vector((0, 0, delta))
         else:
             deltaVecLocal = deltaVecLocal + Vector((0, delta, 0))
     if op.keyDownForward or op.keyDownLeft or op.keyDownBackward or op.keyDownRight or op.keyDownDown or op.keyDownUp:
-        bpy.context.view_layer.update() # Fixes being unable to pan while WASDing when camera is locked to view.
         op.move3dView(deltaVecLocal, deltaVecGlobal)
-    return 0.001
+    op.commitPose()
+    # tick twice per measured redraw, so that every frame sees fresh movement even when the timer jitters
+    return clamp(op.drawIntervalNs * 0.5, minWasdTickIntervalNs, maxWasdTickIntervalNs) / 1_000_000_000
+
+def animateView(op: MouseStrafingOperator, stopSignal):
+    if not running or stopSignal[0]: return None
+    op.area.tag_redraw()
+    if time.perf_counter_ns() >= op.animationDeadlineNs:
+        op.animationStopSignal = None
+        return None
+    return 1 / op.settings.animationRedrawRate
+
+def stepTransition(op: MouseStrafingOperator, stopSignal):
+    if not running or stopSignal[0]: return None
+    transition = op.transition
+    elapsedNs = time.perf_counter_ns() - transition.startTimeNs
+    frameIndex = elapsedNs // transition.frameIntervalNs
+    if frameIndex >= len(transition.frames) - 1:
+        op.finishTransition()
+        return None
+    if frameIndex > transition.frameIndex:
+        op.applyTransitionFrame(frameIndex)
+    return (transition.frameIntervalNs - elapsedNs % transition.frameIntervalNs) / 1_000_000_000
+
+def trackPivot(op: MouseStrafingOperator, stopSignal):
+    if not running or stopSignal[0]: return None
+    if op.settings.adjustPivot and op.settings.pivotTrackingBudget > 0:
+        wasFresh = op.pivotTracker.isFresh()
+        viewPos, _viewRot, viewDir = op.peekPose()
+        op.pivotTracker.track(op.viewLayer.depsgraph, *op.getPivotRay(viewPos, viewDir), op.settings.pivotTrackingBudget * 1000)
+        if op.pivotTracker.isFresh() != wasFresh:
+            op.area.tag_redraw()
+        if not op.pivotTracker.isFresh():
+            return pivotTrackingInterval
+    if op.pivotTrackingStopSignal is stopSignal:
+        op.pivotTrackingStopSignal = None
+    return None
 
 def drawCallback(op: MouseStrafingOperator, context: bpy.types.Context):
     global drawCallbackHandle
+    global cameraEvaluationPending
     try:
-        if context.area != op.area:
-            return
-        sv3d, rv3d = getViews3D(context)
-        if rv3d != op.rv3d:
-            return
-        drawCrosshair(op, context)
-        drawFovInfo(op, context)
-        drawStrafeSensitivityInfo(op, context)
-        drawGears(op, context)
-        if op.redrawAfterDrawCallback:
-            op.redrawAfterDrawCallback = False
-            bpy.app.timers.register(context.area.tag_redraw, first_interval = 0)
+        if context.region.as_pointer() != op.regionPointer:
+            return # another 3D View, or another quad view region of the navigated one
+        cameraEvaluationPending = False # Blender evaluates the depsgraph before it redraws
+        nowNs = time.perf_counter_ns()
+        if nowNs - op.previousDrawTimeNs < 100 * ms: # only continuous redraws tell the refresh rate
+            op.drawIntervalNs += ((nowNs - op.previousDrawTimeNs) - op.drawIntervalNs) // 8
+        op.previousDrawTimeNs = nowNs
+        lensSensorKey = getLensSensorKey(op, context)
+        if lensSensorKey != op.lensSensorKey:
+            op.lensSensor, op.lensSensorKey = None, lensSensorKey
+        fontState.reset()
+        uiScale = context.preferences.system.ui_scale
+        drawCrosshair(op, context, uiScale)
+        drawFovInfo(op, context, uiScale)
+        drawStrafeSensitivityInfo(op, context, uiScale)
+        drawGears(op, context, uiScale)
+        drawBookmarkInfo(op, context, uiScale)
+        drawRecordingInfo(op, context, uiScale)
     except:
         if drawCallbackHandle is not None:
             bpy.types.SpaceView3D.draw_handler_remove(drawCallbackHandle, "WINDOW")
             drawCallbackHandle = None
         raise
 
-def drawCrosshair(op: MouseStrafingOperator, context: bpy.types.Context):
+def drawCrosshair(op: MouseStrafingOperator, context: bpy.types.Context, uiScale: float):
     color = (0.75, 0.75, 0.75, 1)
     if op.keyDownRelocatePivot:
-        if op.prefs.adjustPivot:
+        if op.settings.adjustPivot:
             color = (1, 1, 0.05, 1)
         elif op.adjustPivotSuccess:
             color = (0.1, 1, 0.05, 1)
@@ -820,87 +1245,103 @@ def drawCrosshair(op: MouseStrafingOperator, context: bpy.types.Context):
             color = (1, 0.05, 1, 1)
     elif op.loadCameraState:
         color = (0.05, 0.15, 1, 1)
-    elif op.getSatisfiedBinding() is not None:
-        if not op.prefs.showCrosshair:
+    elif op.getSatisfiedAction() is not None:
+        if not op.settings.showCrosshair:
             return
         color = (1, 1, 1, 1)
-    blf.color(0, *color)
-    blf.enable(0, blf.SHADOW)
-    blf.shadow(0, 3, 0, 0, 0, 1)
-    uiScale = context.preferences.system.ui_scale
-    blf.size(0, int(20*uiScale), 72)
+    setFontColor(*color)
+    setFontShadow(1)
+    setFontSize(int(20*uiScale))
     x, y = context.region.width // 2 - int(8*uiScale), context.region.height // 2 - int(6*uiScale)
     blf.position(0, x, y, 0)
     blf.draw(0, "+")
-
-def drawFovInfo(op: MouseStrafingOperator, context: bpy.types.Context):
-    alphaFactor = drawFadeAlpha(op, op.editFovTimeNs, 1.0, 0.5)
+    if op.settings.adjustPivot and op.settings.pivotTrackingBudget > 0 and op.pivotTracker.isFresh():
+        # small dot under the crosshair: the pivot for the current view has been found and relocating it will be instant
+        setFontColor(*((0.1, 1, 0.05, 1) if op.pivotTracker.candidate[0] else (0.75, 0.75, 0.75, 1)))
+        setFontSize(int(12*uiScale))
+        blf.position(0, x + int(5*uiScale), y - int(10*uiScale), 0)
+        blf.draw(0, "•")
+
+def drawFovInfo(op: MouseStrafingOperator, context: bpy.types.Context, uiScale: float):
+    alphaFactor = drawFadeAlpha(op, op.editFovTimeNs, overlayHoldTime, overlayFadeTime)
     if alphaFactor == 0:
         return
-    uiScale = context.preferences.system.ui_scale
-    focalLength, sensorSize, cam = op.getContextualLensSensor(context)
-    hFov = focalLengthToFov(focalLength, sensorSize[0])
-    vFov = focalLengthToFov(focalLength, sensorSize[1])
-
-    textLens = f"      {focalLength:.3f}mm"
-    textHFov = f"  {hFov:.3f}°"
-    textVFov = f"  {vFov:.3f}°"
-
-    blf.enable(0, blf.SHADOW)
-    blf.shadow(0, 3, 0, 0, 0, alphaFactor)
-    blf.size(0, int(20*uiScale), 72)
+    lensSensor = op.getContextualLensSensor(context)
+    if op.fovInfoSource is not lensSensor:
+        focalLength, sensorSize, _cam = lensSensor
+        hFov = focalLengthToFov(focalLength, sensorSize[0])
+        vFov = focalLengthToFov(focalLength, sensorSize[1])
+        op.fovInfoTexts = f"      {focalLength:.3f}mm", f"  {hFov:.3f}°", f"  {vFov:.3f}°"
+        op.fovInfoSource = lensSensor
+    textLens, textHFov, textVFov = op.fovInfoTexts
+
+    setFontShadow(alphaFactor)
+    setFontSize(int(20*uiScale))
     x, y = context.region.width // 2, context.region.height // 2
 
-    b = 1 if op.prefs.altWheelMoveFunction == "changeVFOV" else 0.75
-    blf.color(0, b, b, b, alphaFactor)
+    b = 1 if op.settings.altWheelMoveFunction == "changeVFOV" else 0.75
+    setFontColor(b, b, b, alphaFactor)
     drawText(x + int(100*uiScale), y, textVFov, halign = "CENTER", valign = "MIDDLE")
 
-    b = 1 if op.prefs.altWheelMoveFunction == "changeFOV" else 0.75
-    blf.color(0, b, b, b, alphaFactor)
+    b = 1 if op.settings.altWheelMoveFunction == "changeFOV" else 0.75
+    setFontColor(b, b, b, alphaFactor)
     drawText(x + int(50*uiScale), y - (25*uiScale), textLens, halign = "CENTER", valign = "MIDDLE")
 
-    b = 1 if op.prefs.altWheelMoveFunction == "changeHFOV" else 0.75
-    blf.color(0, b, b, b, alphaFactor)
+    b = 1 if op.settings.altWheelMoveFunction == "changeHFOV" else 0.75
+    setFontColor(b, b, b, alphaFactor)
     drawText(x, y - int(50*uiScale), textHFov, halign = "CENTER", valign = "MIDDLE")
 
-    if cam is not None:
-        blf.size(0, int(12*uiScale), 72)
-        blf.color(0, 1, 0.5, 0.1, alphaFactor)
+    if lensSensor[2] is not None:
+        setFontSize(int(12*uiScale))
+        setFontColor(1, 0.5, 0.1, alphaFactor)
         drawText(x, y - int(95*uiScale), "Showing Camera Values", halign = "CENTER")
 
-def drawStrafeSensitivityInfo(op: MouseStrafingOperator, context: bpy.types.Context):
-    alphaFactor = drawFadeAlpha(op, op.editStrafeSensitivityTimeNs, 1.0, 0.5)
+def drawStrafeSensitivityInfo(op: MouseStrafingOperator, context: bpy.types.Context, uiScale: float):
+    alphaFactor = drawFadeAlpha(op, op.editStrafeSensitivityTimeNs, overlayHoldTime, overlayFadeTime)
     if alphaFactor == 0:
         return
     x, y = context.region.width // 2, context.region.height // 2
-    blf.enable(0, blf.SHADOW)
-    blf.shadow(0, 3, 0, 0, 0, alphaFactor)
-    uiScale = context.preferences.system.ui_scale
-    blf.size(0, int(20*uiScale), 72)
-    blf.color(0, 1, 1, 1, alphaFactor)
-    drawText(x, y + int(40*uiScale), f"{op.prefs.sensitivityStrafe:.3f}", halign = "CENTER")
-
-def drawGears(op: MouseStrafingOperator, context: bpy.types.Context):
-    alphaFactor = drawFadeAlpha(op, op.editGearTimeNs, 1.0, 0.5)
+    setFontShadow(alphaFactor)
+    setFontSize(int(20*uiScale))
+    setFontColor(1, 1, 1, alphaFactor)
+    drawText(x, y + int(40*uiScale), formatLabel("{:.3f}", op.settings.sensitivityStrafe), halign = "CENTER")
+
+def drawGears(op: MouseStrafingOperator, context: bpy.types.Context, uiScale: float):
+    alphaFactor = drawFadeAlpha(op, op.editGearTimeNs, overlayHoldTime, overlayFadeTime)
     if alphaFactor == 0:
         return
     x, y = context.region.width // 2, context.region.height // 2
-    blf.enable(0, blf.SHADOW)
-    blf.shadow(0, 3, 0, 0, 0, alphaFactor)
-    uiScale = context.preferences.system.ui_scale
-    blf.size(0, int(20*uiScale), 72)
-    blf.color(0, 1, 1, 1, alphaFactor)
+    setFontShadow(alphaFactor)
+    setFontSize(int(20*uiScale))
     availableGears = op.getGears()
     yoffset = ((len(availableGears) - 1) * 25) / 2
     index = 0
     for gear in availableGears:
-        if gear == op.prefs.strafeGearSelected:
-            blf.color(0, 1, 1, 1, alphaFactor)
+        if gear == op.settings.strafeGearSelected:
+            setFontColor(1, 1, 1, alphaFactor)
         else:
-            blf.color(0, 0.75, 0.75, 0.75, alphaFactor)
-        drawText(x - (110*uiScale), y - int((yoffset-index*25)*uiScale), f"{gear:0.3f}", halign = "CENTER", valign = "MIDDLE")
+            setFontColor(0.75, 0.75, 0.75, alphaFactor)
+        drawText(x - (110*uiScale), y - int((yoffset-index*25)*uiScale), formatLabel("{:0.3f}", gear), halign = "CENTER", valign = "MIDDLE")
         index = index + 1
 
+def drawBookmarkInfo(op: MouseStrafingOperator, context: bpy.types.Context, uiScale: float):
+    alphaFactor = drawFadeAlpha(op, op.editBookmarkTimeNs, overlayHoldTime, overlayFadeTime)
+    if alphaFactor == 0:
+        return
+    x, y = context.region.width // 2, context.region.height // 2
+    setFontShadow(alphaFactor)
+    setFontSize(int(20*uiScale))
+    setFontColor(1, 1, 1, alphaFactor)
+    drawText(x, y + int(70*uiScale), op.bookmarkOverlayText, halign = "CENTER")
+
+def drawRecordingInfo(op: MouseStrafingOperator, context: bpy.types.Context, uiScale: float):
+    if not pathRecorder.recording:
+        return
+    setFontShadow(1)
+    setFontSize(int(14*uiScale))
+    setFontColor(1, 0.1, 0.05, 1)
+    drawText(int(20*uiScale), context.region.height - int(60*uiScale), "● REC", valign = "TOP")
+
 def drawFadeAlpha(op: MouseStrafingOperator, wakeTimeNs: float, holdTime: float, fadeTime: float) -> float:
     nowNs = time.perf_counter_ns()
     passed = (nowNs - wakeTimeNs) / 1_000_000_000
@@ -909,13 +1350,19 @@ def drawFadeAlpha(op: MouseStrafingOperator, wakeTimeNs: float, holdTime: float,
         alphaFactor = 1.0 - (passed - holdTime) / fadeTime
     if alphaFactor <= 0:
         alphaFactor = 0.0
-    else:
-        op.redrawAfterDrawCallback = True
     return alphaFactor
 
-def getSensorSizeView3d(context: bpy.types.Context) -> tuple[float, float]:
+def getLensSensorKey(op: MouseStrafingOperator, context: bpy.types.Context) -> tuple:
+    # everything MouseStrafingOperator.getContextualLensSensor() depends on, read once per redraw instead of per mouse move
+    if op.isViewingCamera():
+        cam = op.sv3d.camera.data
+        render = context.scene.render
+        return cam, cam.lens, cam.sensor_fit, cam.sensor_width, cam.sensor_height, render.resolution_x, render.resolution_y, render.pixel_aspect_x, render.pixel_aspect_y
+    return None, op.sv3d.lens, op.region.width, op.region.height
+
+def getSensorSizeView3d(region: bpy.types.Region) -> tuple[float, float]:
     sensorWidth = 72.0
-    aspect = context.region.width / context.region.height
+    aspect = region.width / region.height
     if aspect < 1:
         sensorWidth = sensorWidth * aspect
     sensorHeight = sensorWidth / aspect
@@ -941,14 +1388,70 @@ def focalLengthToFov(focalLength: float, sensorSideLength: float) -> float:
 def fovToFocalLength(fov: float, sensorSideLength: float) -> float:
     return sensorSideLength / 2 / math.tan(math.radians(fov)/2)
 
+class FontState:
+    # blf state last set by the overlays, so that unchanged values are not sent again; forgotten at the start of every
+    # draw callback since anything else drawing text may have changed it in between
+    __slots__ = 'size', 'color', 'shadowAlpha'
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.size = None
+        self.color = None
+        self.shadowAlpha = None
+
+fontState = FontState()
+textDimensions = {}
+formattedLabels = {}
+maxCachedTexts = 512
+
+def setFontSize(size: int):
+    if fontState.size != size:
+        fontState.size = size
+        blf.size(0, size, 72)
+
+def setFontColor(r: float, g: float, b: float, a: float):
+    color = (r, g, b, a)
+    if fontState.color != color:
+        fontState.color = color
+        blf.color(0, r, g, b, a)
+
+def setFontShadow(alpha: float):
+    if fontState.shadowAlpha != alpha:
+        if fontState.shadowAlpha is None:
+            blf.enable(0, blf.SHADOW)
+        fontState.shadowAlpha = alpha
+        blf.shadow(0, 3, 0, 0, 0, alpha)
+
+def formatLabel(format: str, value: float) -> str:
+    key = (format, value)
+    text = formattedLabels.get(key)
+    if text is None:
+        if len(formattedLabels) >= maxCachedTexts:
+            formattedLabels.clear()
+        text = formattedLabels[key] = format.format(value)
+    return text
+
+def getTextDimensions(text: str) -> tuple[float, float]:
+    key = (text, fontState.size)
+    dims = textDimensions.get(key)
+    if dims is None:
+        if len(textDimensions) >= maxCachedTexts:
+            textDimensions.clear()
+        dims = textDimensions[key] = blf.dimensions(0, text)
+    return dims
+
 def drawText(x: int, y: int, text: str, halign: str = "LEFT", valign: str = "BASELINE"):
-    dims = blf.dimensions(0, text)
+    dims = getTextDimensions(text)
     if halign == "CENTER":
         x = x - dims[0]/2
     elif halign == "RIGHT":
         x = x - dims[0]
     if valign == "MIDDLE":
         y = y - dims[1]/2
+    elif valign == "TOP":
+        y = y - dims[1]
     blf.position(0, x, y, 0)
     blf.draw(0, text)
 
@@ -1,8 +1,139 @@
 import bpy
 
+from .raycast import bvhCache
+from .raycast import bvhCacheStats
+from .raycast import setBvhCacheMemoryLimit
+from .recorder import pathRecorder
+from .recorder import setPathRecorderMemoryLimit
+
+buttonBits = {"lmb": 1, "rmb": 2, "mmb": 4, "mb4": 8, "mb5": 16, "mb6": 32, "mb7": 64}
+buttonBindingTable = None
+
+def getButtonBindingTable(prefs) -> list:
+    global buttonBindingTable
+    if buttonBindingTable is None:
+        buttonBindingTable = compileButtonBindings([(b.button1, b.button2, b.action) for b in prefs.buttonBindings])
+    return buttonBindingTable
+
+def invalidateButtonBindingTable():
+    global buttonBindingTable
+    buttonBindingTable = None
+
+def compileButtonBindings(bindings: list) -> list:
+    # Maps every combination of held buttons (as a bit mask) to the action of the binding which applies:
+    # bindings with two buttons win over bindings with a single button, then bindings further up the list win.
+    table = [None] * 128
+    for mask in range(1, 128):
+        singleAction = None
+        for button1, button2, action in bindings:
+            if mask & buttonBits[button1]:
+                if button2 == "omit":
+                    if singleAction is None:
+                        singleAction = action
+                elif mask & buttonBits[button2]:
+                    table[mask] = action
+                    break
+        else:
+            table[mask] = singleAction
+    return table
+
+modifierKeyIndices = {"omit": 0, "shift": 1, "ctrl": 2, "alt": 3} # index into (False, event.shift, event.ctrl, event.alt)
+
+class PreferencesSnapshot:
+    # Plain-Python copy of MouseStrafingPreferences for the operator's hot paths, refreshed in place by the property
+    # update callbacks so that holders of a reference always see current values. The bindings revision only changes
+    # with the key bindings, so that tables built from them survive nudging gears or sensitivities.
+    __slots__ = 'bindingsRevision', 'bindings', \
+        'sensitivityPan', 'sensitivityStrafe', 'increasedMagnitudeSpeedFactor', 'increasedPrecisionSpeedFactor', 'gears', 'strafeGearSelected', \
+        'panSignX', 'panSignY', 'strafeSignX', 'strafeSignY', 'strafeSignZ', \
+        'wasdTopSpeed', 'wasdTime', 'wasdGlobalZ', 'useGearsWasd', \
+        'increasedMagnitudeKeyIndex', 'increasedPrecisionKeyIndex', 'changedBehaviorKeyIndex', \
+        'wheelMoveFunction', 'altWheelMoveFunction', 'wheelDistance', 'useGearsWheel', 'scrollUpToZoomIn', \
+        'showCrosshair', 'adjustPivot', 'pivotDig', 'pivotAdjustmentIgnoreBackfaces', 'pivotTrackingBudget', \
+        'debug', 'toggleMode', 'leaveFOV', 'speedMultiplierForUnitSystemNone', 'coalesceMouseMoves', 'undoPolicy', 'undoStepInterval', 'animationRedrawRate', 'transitionDuration', \
+        'keyForward', 'keyBackward', 'keyLeft', 'keyRight', 'keyUp', 'keyDown', 'keyResetRoll', \
+        'keyCycleGears', 'keyRelocatePivot', 'keyLoadCameraState', 'keyCycleBookmarkPage', 'keyNearestBookmark', 'keyRecordPath', 'wasdKeys'
+
+    def __init__(self):
+        self.bindingsRevision = 0
+        self.bindings = None
+
+    def refresh(self, prefs):
+        self.sensitivityPan = prefs.sensitivityPan
+        self.sensitivityStrafe = prefs.sensitivityStrafe
+        self.increasedMagnitudeSpeedFactor = prefs.increasedMagnitudeSpeedFactor
+        self.increasedPrecisionSpeedFactor = prefs.increasedPrecisionSpeedFactor
+        self.gears = [gear for gear in prefs.strafeGears if gear != 0.0]
+        self.strafeGearSelected = prefs.strafeGearSelected
+
+        self.panSignX = -1 if prefs.invertMouseX else 1
+        self.panSignY = -1 if prefs.invertMouse else 1
+        self.strafeSignX = -1 if prefs.invertStrafeX else 1
+        self.strafeSignY = -1 if prefs.invertStrafeY else 1
+        self.strafeSignZ = 1 if prefs.invertStrafeZ else -1
+
+        self.wasdTopSpeed = prefs.wasdTopSpeed
+        self.wasdTime = prefs.wasdTime
+        self.wasdGlobalZ = prefs.wasdGlobalZ
+        self.useGearsWasd = prefs.useGearsWasd
+
+        self.increasedMagnitudeKeyIndex = modifierKeyIndices[prefs.increasedMagnitudeKey]
+        self.increasedPrecisionKeyIndex = modifierKeyIndices[prefs.increasedPrecisionKey]
+        self.changedBehaviorKeyIndex = modifierKeyIndices[prefs.changedBehaviorKey]
+
+        self.wheelMoveFunction = prefs.wheelMoveFunction
+        self.altWheelMoveFunction = prefs.altWheelMoveFunction
+        self.wheelDistance = prefs.wheelDistance
+        self.useGearsWheel = prefs.useGearsWheel
+        self.scrollUpToZoomIn = prefs.scrollUpToZoomIn
+
+        self.showCrosshair = prefs.showCrosshair
+        self.adjustPivot = prefs.adjustPivot
+        self.pivotDig = prefs.pivotDig
+        self.pivotAdjustmentIgnoreBackfaces = prefs.pivotAdjustmentIgnoreBackfaces
+        self.pivotTrackingBudget = prefs.pivotTrackingBudget
+
+        self.debug = prefs.debug
+        self.toggleMode = prefs.toggleMode
+        self.leaveFOV = prefs.leaveFOV
+        self.speedMultiplierForUnitSystemNone = prefs.speedMultiplierForUnitSystemNone
+        self.coalesceMouseMoves = prefs.coalesceMouseMoves
+        self.undoPolicy = prefs.undoPolicy
+        self.undoStepInterval = prefs.undoStepInterval
+        self.animationRedrawRate = prefs.animationRedrawRate
+        self.transitionDuration = prefs.transitionDuration
+
+        self.keyForward = prefs.keyForward
+        self.keyBackward = prefs.keyBackward
+        self.keyLeft = prefs.keyLeft
+        self.keyRight = prefs.keyRight
+        self.keyUp = prefs.keyUp
+        self.keyDown = prefs.keyDown
+        self.keyResetRoll = prefs.keyResetRoll
+        self.keyCycleGears = prefs.keyCycleGears
+        self.keyRelocatePivot = prefs.keyRelocatePivot
+        self.keyLoadCameraState = prefs.keyLoadCameraState
+        self.keyCycleBookmarkPage = prefs.keyCycleBookmarkPage
+        self.keyNearestBookmark = prefs.keyNearestBookmark
+        self.keyRecordPath = prefs.keyRecordPath
+        self.wasdKeys = frozenset((self.keyForward, self.keyBackward, self.keyLeft, self.keyRight, self.keyUp, self.keyDown))
+
+        bindings = (self.keyForward, self.keyBackward, self.keyLeft, self.keyRight, self.keyUp, self.keyDown, self.keyResetRoll, \
+            self.keyCycleGears, self.keyRelocatePivot, self.keyLoadCameraState, self.keyCycleBookmarkPage, self.keyNearestBookmark, self.keyRecordPath)
+        if bindings != self.bindings:
+            self.bindings = bindings
+            self.bindingsRevision += 1
+
+preferencesSnapshot = PreferencesSnapshot()
+
+def getPreferencesSnapshot(prefs) -> PreferencesSnapshot:
+    preferencesSnapshot.refresh(prefs)
+    return preferencesSnapshot
+
 class NavigationMouseButtonBinding(bpy.types.PropertyGroup):
 
     def markPreferencesForSaving(self, context):
+        invalidateButtonBindingTable()
         bpy.context.preferences.use_preferences_save = True
 
     mouseButtonItems = [ \
@@ -36,6 +167,7 @@ class AddButtonBinding(bpy.types.Operator):
     def invoke(self, context, event):
         prefs: MouseStrafingPreferences = bpy.context.preferences.addons[MouseStrafingPreferences.bl_idname].preferences
         prefs.buttonBindings.add()
+        invalidateButtonBindingTable()
         bpy.context.preferences.use_preferences_save = True
         return {"FINISHED"}
 
@@ -47,6 +179,7 @@ class RemoveButtonBinding(bpy.types.Operator):
     def invoke(self, context, event):
         prefs: MouseStrafingPreferences = bpy.context.preferences.addons[MouseStrafingPreferences.bl_idname].preferences
         prefs.buttonBindings.remove(self.index)
+        invalidateButtonBindingTable()
         bpy.context.preferences.use_preferences_save = True
         return {"FINISHED"}
 
@@ -58,6 +191,7 @@ class MoveButtonBindingUp(bpy.types.Operator):
     def invoke(self, context, event):
         prefs: MouseStrafingPreferences = bpy.context.preferences.addons[MouseStrafingPreferences.bl_idname].preferences
         prefs.buttonBindings.move(self.index, self.index-1)
+        invalidateButtonBindingTable()
         bpy.context.preferences.use_preferences_save = True
         return {"FINISHED"}
 
@@ -69,37 +203,41 @@ class MoveButtonBindingDown(bpy.types.Operator):
     def invoke(self, context, event):
         prefs: MouseStrafingPreferences = bpy.context.preferences.addons[MouseStrafingPreferences.bl_idname].preferences
         prefs.buttonBindings.move(self.index, self.index+1)
+        invalidateButtonBindingTable()
         bpy.context.preferences.use_preferences_save = True
         return {"FINISHED"}
 
 class MouseStrafingPreferences(bpy.types.AddonPreferences):
     bl_idname = "mouse_strafing"
 
+    def updateSnapshot(self, context):
+        preferencesSnapshot.refresh(self)
+
     buttonBindings: bpy.props.CollectionProperty(type = NavigationMouseButtonBinding, name = "Mouse button bindings", description = "Specify which mouse button or mouse button combination engages which navigation behavior")
 
     sensitivityPan: bpy.props.FloatProperty(name = "Pan Sensitivity", description = "Mouse speed multiplier when panning the 3D View", \
-        default = 1.0, min = 0.001, max = 100.0, soft_min = 0.01, soft_max = 10.0, step = 1, precision = 3)
+        default = 1.0, min = 0.001, max = 100.0, soft_min = 0.01, soft_max = 10.0, step = 1, precision = 3, update = updateSnapshot)
     sensitivityStrafe: bpy.props.FloatProperty(name = "Strafe Sensitivity", description = "Mouse speed multiplier for mouse strafing", \
-        default = 1.0, min = 0.001, soft_min = 0.01, max = 100.0, soft_max = 10.0, step = 1, precision = 3)
-    increasedMagnitudeSpeedFactor: bpy.props.FloatProperty(name = "Fast Speed Factor", description = "Strafe speed multiplier to apply while holding magnitude key (default is Shift)", default = 5, min = 1, max = 100, soft_min = 1.2, soft_max = 10)
-    increasedPrecisionSpeedFactor: bpy.props.FloatProperty(name = "Slow Speed Factor", description = "Strafe speed multiplier to apply while holding precision key (default is Alt)", default = 0.2, min = 0.01, max = 1, soft_min = 0.1, soft_max = 0.8)
+        default = 1.0, min = 0.001, soft_min = 0.01, max = 100.0, soft_max = 10.0, step = 1, precision = 3, update = updateSnapshot)
+    increasedMagnitudeSpeedFactor: bpy.props.FloatProperty(name = "Fast Speed Factor", description = "Strafe speed multiplier to apply while holding magnitude key (default is Shift)", default = 5, min = 1, max = 100, soft_min = 1.2, soft_max = 10, update = updateSnapshot)
+    increasedPrecisionSpeedFactor: bpy.props.FloatProperty(name = "Slow Speed Factor", description = "Strafe speed multiplier to apply while holding precision key (default is Alt)", default = 0.2, min = 0.01, max = 1, soft_min = 0.1, soft_max = 0.8, update = updateSnapshot)
     strafeGears: bpy.props.FloatVectorProperty(name = "Gears", description = "Set additional strafe speed multipliers to cycle through with G and Shift + G. Entries set to 0 are ignored", \
-        size = 7, default = (0.025, 0.1, 0.333, 1.0, 3.00, 0, 0), min = 0.0, max = 100.0, soft_min = 0.0, soft_max = 10.0, step = 5, precision = 2)
-    strafeGearSelected: bpy.props.FloatProperty(name = "Selected Gear", default = 1.0, options = {"HIDDEN"})
+        size = 7, default = (0.025, 0.1, 0.333, 1.0, 3.00, 0, 0), min = 0.0, max = 100.0, soft_min = 0.0, soft_max = 10.0, step = 5, precision = 2, update = updateSnapshot)
+    strafeGearSelected: bpy.props.FloatProperty(name = "Selected Gear", default = 1.0, options = {"HIDDEN"}, update = updateSnapshot)
 
-    invertMouseX: bpy.props.BoolProperty(name = "Invert Horizontal Panning", description = "Invert effect of horizontal mouse movement when looking around", default = False)
-    invertMouse: bpy.props.BoolProperty(name = "Invert Vertical Panning", description = "Invert effect of vertical mouse movement when looking around", default = False)
+    invertMouseX: bpy.props.BoolProperty(name = "Invert Horizontal Panning", description = "Invert effect of horizontal mouse movement when looking around", default = False, update = updateSnapshot)
+    invertMouse: bpy.props.BoolProperty(name = "Invert Vertical Panning", description = "Invert effect of vertical mouse movement when looking around", default = False, update = updateSnapshot)
 
-    invertStrafeX: bpy.props.BoolProperty(name = "Invert Strafe X", description = "Invert direction of sideways mouse strafe movement", default = False)
-    invertStrafeY: bpy.props.BoolProperty(name = "Invert Strafe Y", description = "Invert direction of upwards/downwards mouse strafe movement", default = False)
-    invertStrafeZ: bpy.props.BoolProperty(name = "Invert Strafe Z", description = "Invert direction of forwards/backwards mouse strafe movement", default = False)
+    invertStrafeX: bpy.props.BoolProperty(name = "Invert Strafe X", description = "Invert direction of sideways mouse strafe movement", default = False, update = updateSnapshot)
+    invertStrafeY: bpy.props.BoolProperty(name = "Invert Strafe Y", description = "Invert direction of upwards/downwards mouse strafe movement", default = False, update = updateSnapshot)
+    invertStrafeZ: bpy.props.BoolProperty(name = "Invert Strafe Z", description = "Invert direction of forwards/backwards mouse strafe movement", default = False, update = updateSnapshot)
 
     wasdTopSpeed: bpy.props.FloatProperty(name = "WASD Top Speed", description = "Top speed, in units per second, when using WASD keys to move", \
-        default = 8.0, min = 0.001, max = 20000, soft_min = 0.01, soft_max = 4000, step = 10, precision = 2)
+        default = 8.0, min = 0.001, max = 20000, soft_min = 0.01, soft_max = 4000, step = 10, precision = 2, update = updateSnapshot)
     wasdTime: bpy.props.FloatProperty(name = "WASD Acceleration Time", description = "Time, in seconds, until top speed is reached when using WASD keys to move", \
-        default = 0.2, min = 0.0, max = 4.0, soft_min = 0.0, soft_max = 1000, step = 1, precision = 2)
-    wasdGlobalZ: bpy.props.BoolProperty(name = "Use Global Z", description = "When checked, makes WASD up/down movement aligned to global Z-axis instead of view Z-axis", default = False)
-    useGearsWasd: bpy.props.BoolProperty(name = "Apply Gear to WASD Speed", description = "When checked, apply gear strafe speed multiplier to WASD move distance, too", default = True)
+        default = 0.2, min = 0.0, max = 4.0, soft_min = 0.0, soft_max = 1000, step = 1, precision = 2, update = updateSnapshot)
+    wasdGlobalZ: bpy.props.BoolProperty(name = "Use Global Z", description = "When checked, makes WASD up/down movement aligned to global Z-axis instead of view Z-axis", default = False, update = updateSnapshot)
+    useGearsWasd: bpy.props.BoolProperty(name = "Apply Gear to WASD Speed", description = "When checked, apply gear strafe speed multiplier to WASD move distance, too", default = True, update = updateSnapshot)
 
     def getUnusedModifierKey(self):
         keys = {"ctrl", "shift", "alt"}
@@ -109,28 +247,28 @@ class MouseStrafingPreferences(bpy.types.AddonPreferences):
         return list(keys)[0]
 
     def updateIncreasedMagnitudeKey(self, context):
-        if self.increasedMagnitudeKey == "omit":
-            return
-        if self.increasedPrecisionKey == self.increasedMagnitudeKey:
-            self.increasedPrecisionKey = self.getUnusedModifierKey()
-        if self.changedBehaviorKey == self.increasedMagnitudeKey:
-            self.changedBehaviorKey = self.getUnusedModifierKey()
+        if self.increasedMagnitudeKey != "omit":
+            if self.increasedPrecisionKey == self.increasedMagnitudeKey:
+                self.increasedPrecisionKey = self.getUnusedModifierKey()
+            if self.changedBehaviorKey == self.increasedMagnitudeKey:
+                self.changedBehaviorKey = self.getUnusedModifierKey()
+        preferencesSnapshot.refresh(self)
 
     def updateIncreasedPrecisionKey(self, context):
-        if self.increasedPrecisionKey == "omit":
-            return
-        if self.increasedMagnitudeKey == self.increasedPrecisionKey:
-            self.increasedMagnitudeKey = self.getUnusedModifierKey()
-        if self.changedBehaviorKey == self.increasedPrecisionKey:
-            self.changedBehaviorKey = self.getUnusedModifierKey()
+        if self.increasedPrecisionKey != "omit":
+            if self.increasedMagnitudeKey == self.increasedPrecisionKey:
+                self.increasedMagnitudeKey = self.getUnusedModifierKey()
+            if self.changedBehaviorKey == self.increasedPrecisionKey:
+                self.changedBehaviorKey = self.getUnusedModifierKey()
+        preferencesSnapshot.refresh(self)
 
     def updateChangedBehaviorKey(self, context):
-        if self.changedBehaviorKey == "omit":
-            return
-        if self.increasedMagnitudeKey == self.changedBehaviorKey:
-            self.increasedMagnitudeKey = self.getUnusedModifierKey()
-        if self.increasedPrecisionKey == self.changedBehaviorKey:
-            self.increasedPrecisionKey = self.getUnusedModifierKey()
+        if self.changedBehaviorKey != "omit":
+            if self.increasedMagnitudeKey == self.changedBehaviorKey:
+                self.increasedMagnitudeKey = self.getUnusedModifierKey()
+            if self.increasedPrecisionKey == self.changedBehaviorKey:
+                self.increasedPrecisionKey = self.getUnusedModifierKey()
+        preferencesSnapshot.refresh(self)
 
     modifierKeyItems = [ \
         ("ctrl", "Ctrl", "The control (Ctrl) key", "NONE", 0), \
@@ -144,48 +282,80 @@ class MouseStrafingPreferences(bpy.types.AddonPreferences):
     mouseWheelActionItems = [ \
         ("moveZ", "Move forward/backwards", "Move forward/backwards", "NONE", 0), \
         ("changeStrafeSensitivity", "Change strafe sensitivity", "Change the mouse speed multiplier for mouse strafing", "NONE", 1)]
-    wheelMoveFunction: bpy.props.EnumProperty(name = "Wheel", description = "Set what the scroll wheel does", items = mouseWheelActionItems, default = "moveZ")
+    wheelMoveFunction: bpy.props.EnumProperty(name = "Wheel", description = "Set what the scroll wheel does", items = mouseWheelActionItems, default = "moveZ", update = updateSnapshot)
 
     altMouseWheelActionItems = [ \
         ("changeFOV", "Change Focal Length", "Change the field of view (FOV) by controlling the distance of the lens to the camera sensor", "NONE", 0), \
         ("changeHFOV", "Change Horizontal FOV", "Change the field of view (FOV) by controlling the horizontal view angle", "NONE", 1), \
         ("changeVFOV", "Change Vertical FOV", "Change the field of view (FOV) by controlling the vertical view angle", "NONE", 2)]
-    altWheelMoveFunction: bpy.props.EnumProperty(name = "Wheel (Alt)", description = "Set what the scroll wheel does while holding alternate key (default is Ctrl)", items = altMouseWheelActionItems, default = "changeVFOV")
+    altWheelMoveFunction: bpy.props.EnumProperty(name = "Wheel (Alt)", description = "Set what the scroll wheel does while holding alternate key (default is Ctrl)", items = altMouseWheelActionItems, default = "changeVFOV", update = updateSnapshot)
 
     wheelDistance: bpy.props.FloatProperty(name = "Wheel Distance", description = "Set move distance when using the scroll wheel to move", \
-        default = 0.5, min = -1000.0, max = 1000.0, soft_min = -5.0, soft_max = 5.0, step = 1, precision = 4)
-    useGearsWheel: bpy.props.BoolProperty(name = "Apply Gear to Wheel Distance", description = "When checked, apply gear strafe speed multiplier to scroll wheel move distance, too", default = True)
-    scrollUpToZoomIn: bpy.props.BoolProperty(name = "Invert Direction", description = "When checked, inverts the scroll wheel direction such that scrolling up zooms in and scrolling down zooms out", default = False)
+        default = 0.5, min = -1000.0, max = 1000.0, soft_min = -5.0, soft_max = 5.0, step = 1, precision = 4, update = updateSnapshot)
+    useGearsWheel: bpy.props.BoolProperty(name = "Apply Gear to Wheel Distance", description = "When checked, apply gear strafe speed multiplier to scroll wheel move distance, too", default = True, update = updateSnapshot)
+    scrollUpToZoomIn: bpy.props.BoolProperty(name = "Invert Direction", description = "When checked, inverts the scroll wheel direction such that scrolling up zooms in and scrolling down zooms out", default = False, update = updateSnapshot)
 
-    showCrosshair: bpy.props.BoolProperty(name = "Show Crosshair", description = "Show crosshair during strafe actions", default = True)
+    coalesceMouseMoves: bpy.props.BoolProperty(name = "Coalesce Mouse Moves", description = "When checked, mouse movement is accumulated and applied to the view once per redraw instead of once per mouse event. Reduces CPU load with high polling rate mice", default = True, update = updateSnapshot)
+    showCrosshair: bpy.props.BoolProperty(name = "Show Crosshair", description = "Show crosshair during strafe actions", default = True, update = updateSnapshot)
     adjustPivot: bpy.props.BoolProperty(name = "Automatically Relocate Pivot", description = "Automatically relocate the 3D View's "
-        "pivot point (instead of manually by pressing 'C') to the surface of whatever object you are looking at while using the operator; you can toggle this with Shift + C", default = True)
+        "pivot point (instead of manually by pressing 'C') to the surface of whatever object you are looking at while using the operator; you can toggle this with Shift + C", default = True, update = updateSnapshot)
     pivotDig: bpy.props.FloatProperty(name = "Pivot Dig", description = "When relocating the pivot point, specifies how far the pivot will be moved into the surface you are looking at, based on a percentage of its distance to the 3D View camera", \
-        default = 0.0, min = 0.0, max = 100.0, soft_min = 0.0, soft_max = 100.0, step = 100, precision = 0, subtype = "PERCENTAGE")
+        default = 0.0, min = 0.0, max = 100.0, soft_min = 0.0, soft_max = 100.0, step = 100, precision = 0, subtype = "PERCENTAGE", update = updateSnapshot)
 
     pivotAdjustmentIgnoreBackfacesItems = [ \
         ("whenCulling", "When culling", "When adjusting the pivot, ignore backfaces if backface culling is enabled", "NONE", 0), \
         ("always", "Always", "When adjusting the pivot, always respect backfaces", "NONE", 1), \
         ("never", "Never", "When adjusting the pivot, always ignore backfaces", "NONE", 2)]
-    pivotAdjustmentIgnoreBackfaces: bpy.props.EnumProperty(name = "Ignore Backfaces", description = "Set when to ignore backfaces when adjusting the view pivot", items = pivotAdjustmentIgnoreBackfacesItems, default = "whenCulling")
+    pivotAdjustmentIgnoreBackfaces: bpy.props.EnumProperty(name = "Ignore Backfaces", description = "Set when to ignore backfaces when adjusting the view pivot", items = pivotAdjustmentIgnoreBackfacesItems, default = "whenCulling", update = updateSnapshot)
 
-    debug: bpy.props.BoolProperty(name = "Debug Mode", description = "When checked, print in the console when Blender's cursor_warp glitch is detected and countered", default = False)
-    toggleMode: bpy.props.BoolProperty(name = "Toggle", description = "When checked, strafe-mode will only quit when pressing the key a second time or pressing Escape", default = False)
-    leaveFOV: bpy.props.BoolProperty(name = "Leave FOV", description = "When checked, loading camera states will leave the FOV as it is", default = False)
-    speedMultiplierForUnitSystemNone: bpy.props.FloatProperty(name = "Unit System 'None' Speed Multiplier", description = "Speed multiplier which is applied to all movement operations when the scene's unit system is set to 'None'. For example, if such a scene uses one unit per inch instead of per meter, you might want to set this to 100cm / 2.54cm = 39.37", \
-        default = 1.0, min = 0.001, soft_min = 0.01, max = 10000.0, soft_max = 100.0, step = 1, precision = 3)
+    pivotTrackingBudget: bpy.props.IntProperty(name = "Pivot Tracking Budget (µs)", description = "While navigating with automatic pivot relocation, keep looking for the surface under the crosshair for at most this many microseconds per frame, "
+        "so that relocating the pivot is instant when the operator ends. Set to 0 to only search when the operator ends", default = 1000, min = 0, max = 100000, soft_max = 10000, update = updateSnapshot)
+
+    def updatePivotCacheMemoryLimit(self, context):
+        setBvhCacheMemoryLimit(self.pivotCacheMemoryLimit * 1024 * 1024)
+
+    pivotCacheMemoryLimit: bpy.props.IntProperty(name = "Raycast Cache Limit (MB)", description = "Maximum amount of memory, in megabytes, used to keep the acceleration structures of objects which pivot relocation casts rays against. "
+        "The least recently hit objects are dropped first when the limit is exceeded", default = 256, min = 8, max = 65536, soft_min = 32, soft_max = 4096, update = updatePivotCacheMemoryLimit)
 
-    keyForward: bpy.props.StringProperty(name = "Move Forward", description = "Press this key to move the camera forward (must be upper-case)", default = "W")
-    keyBackward: bpy.props.StringProperty(name = "Move Backward", description = "Press this key to move the camera backward (must be upper-case)", default = "S")
-    keyLeft: bpy.props.StringProperty(name = "Move Left", description = "Press this key to strafe the camera to the left (must be upper-case)", default = "A")
-    keyRight: bpy.props.StringProperty(name = "Move Right", description = "Press this key to stafe the camera to the right (must be upper-case)", default = "D")
-    keyUp: bpy.props.StringProperty(name = "Move Up", description = "Press this key to strafe the camera upwards (must be upper-case)", default = "E")
-    keyDown: bpy.props.StringProperty(name = "Move Down", description = "Press this key to strafe the camera downwards (must be upper-case)", default = "Q")
-    keyResetRoll: bpy.props.StringProperty(name = "Reset Roll", description = "Press this key to reset camera roll (must be upper-case)", default = "R")
+    def updatePathRecorderMemoryLimit(self, context):
+        setPathRecorderMemoryLimit(self.pathRecorderMemoryLimit * 1024 * 1024)
 
-    keyCycleGears: bpy.props.StringProperty(name = "Cycle Gear", description = "Press this key to cycle through strafing gears (must be upper-case)", default = "G")
-    keyRelocatePivot: bpy.props.StringProperty(name = "Relocate Pivot", description = "Press this key to relocate camera pivot to the nearest surface in the center of the view. You can toggle this to happen automatically on and off with Shift + this key (must be upper-case)", default = "C")
-    keyLoadCameraState: bpy.props.StringProperty(name = "Load Camera State", description = "Press this key and then one of the number keys [0-9] to load the camera state in that slot without the need to quickly press the number key twice (must be upper-case)", default = "T")
+    pathRecorderMemoryLimit: bpy.props.IntProperty(name = "Path Recorder Limit (MB)", description = "Maximum amount of memory, in megabytes, used to record the navigation path. Once it is used up, the oldest part of the path is dropped. "
+        "Each megabyte holds about 14500 samples, one per change of the view", default = 16, min = 1, max = 4096, soft_max = 512, update = updatePathRecorderMemoryLimit)
+
+    debug: bpy.props.BoolProperty(name = "Debug Mode", description = "When checked, print in the console when Blender's cursor_warp glitch is detected and countered", default = False, update = updateSnapshot)
+    toggleMode: bpy.props.BoolProperty(name = "Toggle", description = "When checked, strafe-mode will only quit when pressing the key a second time or pressing Escape", default = False, update = updateSnapshot)
+    leaveFOV: bpy.props.BoolProperty(name = "Leave FOV", description = "When checked, loading camera states will leave the FOV as it is", default = False, update = updateSnapshot)
+    speedMultiplierForUnitSystemNone: bpy.props.FloatProperty(name = "Unit System 'None' Speed Multiplier", description = "Speed multiplier which is applied to all movement operations when the scene's unit system is set to 'None'. For example, if such a scene uses one unit per inch instead of per meter, you might want to set this to 100cm / 2.54cm = 39.37", \
+        default = 1.0, min = 0.001, soft_min = 0.01, max = 10000.0, soft_max = 100.0, step = 1, precision = 3, update = updateSnapshot)
+
+    undoPolicyItems = [ \
+        ("session", "Per Navigation", "Record one undo step for each use of the operator that moved a camera locked to view", "NONE", 0), \
+        ("timed", "Timed", "Additionally record an undo step at a regular interval while moving a camera locked to view", "NONE", 1), \
+        ("none", "None", "Never record undo steps for navigation", "NONE", 2)]
+    undoPolicy: bpy.props.EnumProperty(name = "Undo", description = "Set when navigating a camera locked to view records undo steps. Navigating the 3D View itself never does", items = undoPolicyItems, default = "session", update = updateSnapshot)
+    undoStepInterval: bpy.props.FloatProperty(name = "Undo Interval", description = "Time, in seconds, between undo steps recorded while navigating with the 'Timed' undo setting", \
+        default = 10.0, min = 1.0, max = 3600.0, soft_min = 2.0, soft_max = 120.0, step = 100, precision = 0, update = updateSnapshot)
+
+    animationRedrawRate: bpy.props.IntProperty(name = "Animation Rate", description = "Maximum number of times per second the 3D View is redrawn just to animate overlays, e.g. while the selected gear fades out", \
+        default = 60, min = 5, max = 240, soft_min = 10, soft_max = 144, update = updateSnapshot)
+    transitionDuration: bpy.props.FloatProperty(name = "Load Transition", description = "Time, in seconds, the view takes to glide to a loaded camera state. Zero loads camera states instantly", \
+        default = 0.0, min = 0.0, max = 5.0, soft_max = 2.0, step = 10, precision = 2, update = updateSnapshot)
+
+    keyForward: bpy.props.StringProperty(name = "Move Forward", description = "Press this key to move the camera forward (must be upper-case)", default = "W", update = updateSnapshot)
+    keyBackward: bpy.props.StringProperty(name = "Move Backward", description = "Press this key to move the camera backward (must be upper-case)", default = "S", update = updateSnapshot)
+    keyLeft: bpy.props.StringProperty(name = "Move Left", description = "Press this key to strafe the camera to the left (must be upper-case)", default = "A", update = updateSnapshot)
+    keyRight: bpy.props.StringProperty(name = "Move Right", description = "Press this key to stafe the camera to the right (must be upper-case)", default = "D", update = updateSnapshot)
+    keyUp: bpy.props.StringProperty(name = "Move Up", description = "Press this key to strafe the camera upwards (must be upper-case)", default = "E", update = updateSnapshot)
+    keyDown: bpy.props.StringProperty(name = "Move Down", description = "Press this key to strafe the camera downwards (must be upper-case)", default = "Q", update = updateSnapshot)
+    keyResetRoll: bpy.props.StringProperty(name = "Reset Roll", description = "Press this key to reset camera roll (must be upper-case)", default = "R", update = updateSnapshot)
+
+    keyCycleGears: bpy.props.StringProperty(name = "Cycle Gear", description = "Press this key to cycle through strafing gears (must be upper-case)", default = "G", update = updateSnapshot)
+    keyRelocatePivot: bpy.props.StringProperty(name = "Relocate Pivot", description = "Press this key to relocate camera pivot to the nearest surface in the center of the view. You can toggle this to happen automatically on and off with Shift + this key (must be upper-case)", default = "C", update = updateSnapshot)
+    keyLoadCameraState: bpy.props.StringProperty(name = "Load Camera State", description = "Press this key and then one of the number keys [0-9] to load the camera state in that slot without the need to quickly press the number key twice (must be upper-case)", default = "T", update = updateSnapshot)
+    keyCycleBookmarkPage: bpy.props.StringProperty(name = "Cycle Save State Page", description = "Press this key to switch the number keys [0-9] to the next page of camera save states, or with Shift to the previous page (must be upper-case)", default = "P", update = updateSnapshot)
+    keyNearestBookmark: bpy.props.StringProperty(name = "Nearest Save State", description = "Press this key to load the saved camera state closest to the current view in position and direction. Press it again to go on to the next closest, or with Shift back to the previous one (must be upper-case)", default = "N", update = updateSnapshot)
+    keyRecordPath: bpy.props.StringProperty(name = "Record Navigation Path", description = "Press this key to start recording the path of the view, or to stop recording it. Recording continues across uses of the operator until stopped (must be upper-case)", default = "K", update = updateSnapshot)
 
     def draw(self, context: bpy.types.Context):
         layout: bpy.types.UILayout = self.layout
@@ -268,6 +438,13 @@ class MouseStrafingPreferences(bpy.types.AddonPreferences):
 
         row = box.row()
         row.prop(self, "pivotAdjustmentIgnoreBackfaces")
+        row.prop(self, "pivotTrackingBudget")
+
+        row = box.row()
+        row.prop(self, "pivotCacheMemoryLimit")
+
+        row = box.row()
+        row.label(text = f"Raycast cache: {len(bvhCache)} objects, {bvhCacheStats.sizeBytes / (1024 * 1024):.1f} MB, {bvhCacheStats.hits} hits, {bvhCacheStats.rebuilds} rebuilds, {bvhCacheStats.evictions} evictions")
 
     def drawWasdPrefs(self, layout: bpy.types.UILayout):
         box = layout.box()
@@ -293,6 +470,21 @@ class MouseStrafingPreferences(bpy.types.AddonPreferences):
 
         row = box.row()
         row.prop(self, "speedMultiplierForUnitSystemNone")
+        row.prop(self, "coalesceMouseMoves")
+
+        row = box.row()
+        row.prop(self, "undoPolicy")
+        subRow = row.row()
+        subRow.enabled = self.undoPolicy == "timed"
+        subRow.prop(self, "undoStepInterval")
+
+        row = box.row()
+        row.prop(self, "animationRedrawRate")
+        row.prop(self, "transitionDuration")
+
+        row = box.row()
+        row.prop(self, "pathRecorderMemoryLimit")
+        row.label(text = f"Navigation path: {pathRecorder.count} samples, {pathRecorder.getDuration():.1f} s{' (recording)' if pathRecorder.recording else ''}")
 
     def drawModifierKeyPrefs(self, layout: bpy.types.UILayout):
         box = layout.box()
@@ -318,3 +510,6 @@ class MouseStrafingPreferences(bpy.types.AddonPreferences):
         box.row().prop(self, "keyCycleGears")
         box.row().prop(self, "keyRelocatePivot")
         box.row().prop(self, "keyLoadCameraState")
+        box.row().prop(self, "keyCycleBookmarkPage")
+        box.row().prop(self, "keyNearestBookmark")
+        box.row().prop(self, "keyRecordPath")
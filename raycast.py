@@ -0,0 +1,465 @@
+import heapq
+import time
+from array import array
+from collections import OrderedDict
+
+import bpy
+from bpy.app.handlers import persistent
+from mathutils import Vector
+from mathutils import Matrix
+from mathutils.bvhtree import BVHTree
+
+meshLikeTypes = {"MESH", "CURVE", "SURFACE", "FONT", "META"}
+indexNeutralTypes = {"CAMERA", "LIGHT", "LIGHT_PROBE", "SPEAKER"} # moving these (e.g. a camera locked to the view) never changes what rays can hit
+
+instancesPerLeaf = 8
+
+# rough footprint of a BVHTree built by FromObject(): copied vertex coordinates, triangle indices, and the tree's nodes and bounds
+bytesPerVertex = 12
+bytesPerTriangle = 108
+
+class BvhCacheEntry:
+    __slots__ = 'signature', 'bvh', 'sizeBytes'
+
+    def __init__(self, signature: tuple, bvh: BVHTree, sizeBytes: int):
+        self.signature = signature
+        self.bvh = bvh
+        self.sizeBytes = sizeBytes
+
+class BvhCacheStats:
+    __slots__ = 'hits', 'rebuilds', 'evictions', 'sizeBytes'
+
+    def __init__(self):
+        self.hits = 0
+        self.rebuilds = 0
+        self.evictions = 0
+        self.sizeBytes = 0
+
+bvhCache: OrderedDict[tuple, BvhCacheEntry] = OrderedDict() # least recently used first
+bvhCacheStats = BvhCacheStats()
+bvhCacheMemoryLimit = 256 * 1024 * 1024
+
+cacheGeneration = 0 # changes whenever what rays can hit may have changed, see getRayKey()
+
+def clearBvhCache():
+    global cacheGeneration
+    bvhCache.clear()
+    bvhCacheStats.sizeBytes = 0
+    cacheGeneration += 1
+
+def setBvhCacheMemoryLimit(limitBytes: int):
+    global bvhCacheMemoryLimit
+    bvhCacheMemoryLimit = limitBytes
+    evictBvhCacheEntries()
+
+def invalidateBvhCacheEntry(key: tuple):
+    global cacheGeneration
+    dropBvhCacheEntry(key)
+    cacheGeneration += 1
+
+def dropBvhCacheEntry(key: tuple):
+    # without changing the generation: the entry can be rebuilt from unchanged data
+    entry = bvhCache.pop(key, None)
+    if entry is not None:
+        bvhCacheStats.sizeBytes -= entry.sizeBytes
+
+def evictBvhCacheEntries(keep: tuple = None):
+    while bvhCacheStats.sizeBytes > bvhCacheMemoryLimit and len(bvhCache) > 0:
+        key = next(iter(bvhCache))
+        if key == keep:
+            break
+        dropBvhCacheEntry(key)
+        bvhCacheStats.evictions += 1
+
+def getBvhKey(obj: bpy.types.Object) -> tuple:
+    # objects without modifiers or shape keys evaluate to their mesh as it is, so all users of a mesh (linked duplicates,
+    # collection instances) share one tree and memory grows with the number of unique meshes rather than with instances
+    if obj.type == "MESH" and len(obj.modifiers) == 0 and obj.data.shape_keys is None:
+        return ("MESH", obj.data.original.name_full)
+    return ("OBJECT", obj.original.name_full)
+
+def getDataSignature(obj: bpy.types.Object) -> tuple:
+    data = obj.data
+    if data is None:
+        return (0,)
+    if obj.type == "MESH":
+        return (data.as_pointer(), len(data.vertices), len(data.polygons))
+    return (data.as_pointer(),)
+
+def estimateBvhSize(obj: bpy.types.Object) -> int:
+    if obj.type == "MESH":
+        mesh = obj.data
+    else:
+        mesh = obj.to_mesh()
+    try:
+        triangleCount = len(mesh.loops) - 2 * len(mesh.polygons)
+        return len(mesh.vertices) * bytesPerVertex + triangleCount * bytesPerTriangle
+    finally:
+        if mesh is not obj.data:
+            obj.to_mesh_clear()
+
+def getObjectBvh(obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph) -> BVHTree:
+    # trees are built in object space, so they stay valid when only the object's transform changes
+    key = getBvhKey(obj)
+    signature = getDataSignature(obj)
+    entry = bvhCache.get(key)
+    if entry is not None and entry.signature == signature:
+        bvhCache.move_to_end(key)
+        bvhCacheStats.hits += 1
+        return entry.bvh
+    dropBvhCacheEntry(key)
+    entry = BvhCacheEntry(signature, BVHTree.FromObject(obj.original, depsgraph), estimateBvhSize(obj))
+    bvhCache[key] = entry
+    bvhCacheStats.rebuilds += 1
+    bvhCacheStats.sizeBytes += entry.sizeBytes
+    evictBvhCacheEntries(key)
+    return entry.bvh
+
+class InstanceIndex:
+    # World space bounding boxes of all instances which rays can hit, in flat arrays (six floats per box: minimum, then
+    # maximum) and organized as a tree of boxes. Leaves refer to a run of instance indices in 'order'. Only original
+    # objects are kept, evaluated ones must not be held on to across depsgraph updates. Moving an object which is
+    # neither instanced nor instancing only refits the boxes on the path from its leaf to the root.
+    __slots__ = 'depsgraphPointer', 'objects', 'matrices', 'boxes', 'order', 'nodeBounds', 'nodeFirst', 'nodeSecond', 'nodeLeafCount', 'nodeParent', \
+        'instanceLeaf', 'objectInstances', 'unrefittableObjects'
+
+    def __init__(self, depsgraph: bpy.types.Depsgraph):
+        self.depsgraphPointer = depsgraph.as_pointer()
+        self.objects = []
+        self.matrices = []
+        self.boxes = array('d')
+        self.objectInstances = {} # original object -> its instance index, for objects placed in the scene directly
+        self.unrefittableObjects = set() # instanced objects and their instancers, which move other instances along
+        for instance in depsgraph.object_instances:
+            obj = instance.object
+            if obj.type not in meshLikeTypes or not (instance.is_instance or obj.original.visible_get()):
+                continue
+            matrix = instance.matrix_world.copy()
+            boundBox = obj.bound_box
+            if instance.is_instance:
+                self.unrefittableObjects.add(obj.original)
+                if instance.parent is not None:
+                    self.unrefittableObjects.add(instance.parent.original)
+            else:
+                self.objectInstances[obj.original] = len(self.objects)
+            self.boxes.extend(transformBox(matrix, boundBox[0], boundBox[6]))
+            self.objects.append(obj.original)
+            self.matrices.append(matrix)
+        self.order = array('l', range(len(self.objects)))
+        self.instanceLeaf = array('l', bytes(self.order.itemsize * len(self.objects)))
+        self.nodeBounds = array('d')
+        self.nodeFirst = array('l')
+        self.nodeSecond = array('l')
+        self.nodeLeafCount = array('l')
+        self.nodeParent = array('l')
+        if len(self.objects) > 0:
+            self.buildNode(0, len(self.objects), -1)
+
+    def buildNode(self, start: int, end: int, parent: int) -> int:
+        boxes, order = self.boxes, self.order
+        lo = [min(boxes[order[i] * 6 + axis] for i in range(start, end)) for axis in range(3)]
+        hi = [max(boxes[order[i] * 6 + 3 + axis] for i in range(start, end)) for axis in range(3)]
+        node = len(self.nodeLeafCount)
+        self.nodeBounds.extend(lo + hi)
+        self.nodeFirst.append(start)
+        self.nodeSecond.append(-1)
+        self.nodeLeafCount.append(end - start)
+        self.nodeParent.append(parent)
+        if end - start > instancesPerLeaf:
+            axis = max(range(3), key = lambda a: hi[a] - lo[a])
+            order[start:end] = array('l', sorted(order[start:end], key = lambda i: boxes[i * 6 + axis] + boxes[i * 6 + 3 + axis]))
+            middle = (start + end) // 2
+            self.nodeLeafCount[node] = 0
+            self.nodeFirst[node] = self.buildNode(start, middle, node)
+            self.nodeSecond[node] = self.buildNode(middle, end, node)
+        else:
+            for k in range(start, end):
+                self.instanceLeaf[order[k]] = node
+        return node
+
+    def refit(self, obj: bpy.types.Object) -> bool:
+        # returns False if the index has to be rebuilt to reflect the object's new transform
+        original = obj.original
+        if original in self.unrefittableObjects:
+            return False
+        i = self.objectInstances.get(original)
+        if i is None:
+            return obj.type not in meshLikeTypes # rays cannot hit it; a mesh missing from the index may just have been unhidden
+        matrix = obj.matrix_world.copy()
+        boundBox = obj.bound_box
+        self.matrices[i] = matrix
+        self.boxes[i * 6:i * 6 + 6] = array('d', transformBox(matrix, boundBox[0], boundBox[6]))
+        node = self.instanceLeaf[i]
+        while node >= 0:
+            if self.nodeLeafCount[node] > 0:
+                first = self.nodeFirst[node]
+                offsets = [self.order[k] * 6 for k in range(first, first + self.nodeLeafCount[node])]
+                bounds = self.boxes
+            else:
+                offsets = [self.nodeFirst[node] * 6, self.nodeSecond[node] * 6]
+                bounds = self.nodeBounds
+            lo = [min(bounds[offset + axis] for offset in offsets) for axis in range(3)]
+            hi = [max(bounds[offset + 3 + axis] for offset in offsets) for axis in range(3)]
+            self.nodeBounds[node * 6:node * 6 + 6] = array('d', lo + hi)
+            node = self.nodeParent[node]
+        return True
+
+instanceIndex: InstanceIndex = None
+
+def invalidateInstanceIndex():
+    global instanceIndex
+    global cacheGeneration
+    instanceIndex = None
+    cacheGeneration += 1
+
+def refitInstanceIndex(obj: bpy.types.Object):
+    global cacheGeneration
+    if instanceIndex is not None and not instanceIndex.refit(obj):
+        invalidateInstanceIndex()
+    cacheGeneration += 1
+
+def getInstanceIndex(depsgraph: bpy.types.Depsgraph) -> InstanceIndex:
+    global instanceIndex
+    if instanceIndex is None or instanceIndex.depsgraphPointer != depsgraph.as_pointer():
+        instanceIndex = InstanceIndex(depsgraph)
+    return instanceIndex
+
+def transformBox(matrix: Matrix, boxMin, boxMax) -> list:
+    # world space box enclosing the transformed local box, see Arvo, "Transforming Axis-Aligned Bounding Boxes"
+    lo, hi = [], []
+    for row in range(3):
+        m = matrix[row]
+        a, b = m[3], m[3]
+        for axis in range(3):
+            e, f = m[axis] * boxMin[axis], m[axis] * boxMax[axis]
+            if e < f:
+                a, b = a + e, b + f
+            else:
+                a, b = a + f, b + e
+        lo.append(a)
+        hi.append(b)
+    return lo + hi
+
+@persistent
+def onDepsgraphUpdatePost(scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph):
+    # transform-only updates keep their tree, rays are brought into object space with the current matrix on every cast,
+    # and only refit the instance index
+    for update in depsgraph.updates:
+        id = update.id
+        if isinstance(id, bpy.types.Object):
+            if id.type not in indexNeutralTypes:
+                if update.is_updated_transform and not update.is_updated_geometry:
+                    refitInstanceIndex(id)
+                else:
+                    invalidateInstanceIndex()
+            if update.is_updated_geometry:
+                invalidateBvhCacheEntry(("OBJECT", id.original.name_full))
+                if id.type == "MESH":
+                    invalidateBvhCacheEntry(("MESH", id.data.original.name_full))
+        elif isinstance(id, bpy.types.Mesh):
+            if update.is_updated_geometry:
+                invalidateInstanceIndex()
+                invalidateBvhCacheEntry(("MESH", id.original.name_full))
+        elif isinstance(id, bpy.types.Collection):
+            invalidateInstanceIndex()
+
+@persistent
+def onLoadPost(*args):
+    invalidateInstanceIndex()
+    clearBvhCache()
+
+@persistent
+def onUndoRedoPost(*args):
+    invalidateInstanceIndex() # undo replaces all datablocks, so the index would refer to stale objects
+
+def registerHandlers():
+    if onDepsgraphUpdatePost not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(onDepsgraphUpdatePost)
+    if onLoadPost not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(onLoadPost)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if onUndoRedoPost not in handlers:
+            handlers.append(onUndoRedoPost)
+
+def unregisterHandlers():
+    if onDepsgraphUpdatePost in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(onDepsgraphUpdatePost)
+    if onLoadPost in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(onLoadPost)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if onUndoRedoPost in handlers:
+            handlers.remove(onUndoRedoPost)
+    invalidateInstanceIndex()
+    clearBvhCache()
+
+class RayQuery:
+    # Best-first walk over the instance index: nodes and instances are visited in order of the distance at which the ray
+    # enters their box, so the walk ends as soon as the next box starts behind the closest hit found so far. Each step
+    # handles one node or one instance, which lets callers spread a query over several frames.
+    __slots__ = 'depsgraph', 'index', 'origin', 'direction', 'inverseDirection', 'maxDistance', 'ignoreBackfaces', 'queue', 'best'
+
+    def __init__(self, depsgraph: bpy.types.Depsgraph, origin: Vector, direction: Vector, maxDistance: float, ignoreBackfaces: bool):
+        self.depsgraph = depsgraph
+        self.index = getInstanceIndex(depsgraph)
+        self.origin = Vector(origin)
+        self.direction = direction.normalized()
+        self.inverseDirection = tuple(1.0 / d if d != 0 else 0.0 for d in self.direction)
+        self.maxDistance = maxDistance
+        self.ignoreBackfaces = ignoreBackfaces
+        self.queue = [] # (entry distance, is instance, node or instance index)
+        self.best = None
+        if len(self.index.nodeLeafCount) > 0:
+            self.push(self.index.nodeBounds, 0, False)
+
+    def push(self, bounds: array, i: int, isInstance: bool):
+        distance = intersectRayFlatBox(self.origin, self.direction, self.inverseDirection, bounds, i * 6, self.maxDistance)
+        if distance is not None:
+            heapq.heappush(self.queue, (distance, isInstance, i))
+
+    def isDone(self) -> bool:
+        return len(self.queue) == 0
+
+    def step(self):
+        distance, isInstance, i = heapq.heappop(self.queue)
+        if distance > self.maxDistance:
+            self.queue.clear()
+            return
+        index = self.index
+        if isInstance:
+            obj, matrix = index.objects[i], index.matrices[i]
+            hit = castRayAtObject(obj.evaluated_get(self.depsgraph), self.depsgraph, matrix, self.origin, self.direction, self.maxDistance, self.ignoreBackfaces)
+            if hit is not None:
+                location, normal, polygonIndex, self.maxDistance = hit
+                self.best = (True, location, normal, polygonIndex, obj, matrix)
+        elif index.nodeLeafCount[i] > 0:
+            first = index.nodeFirst[i]
+            for k in range(first, first + index.nodeLeafCount[i]):
+                self.push(index.boxes, index.order[k], True)
+        else:
+            self.push(index.nodeBounds, index.nodeFirst[i], False)
+            self.push(index.nodeBounds, index.nodeSecond[i], False)
+
+    def run(self) -> tuple:
+        while self.queue:
+            self.step()
+        return self.result()
+
+    def result(self) -> tuple:
+        return self.best if self.best is not None else rayCastMiss()
+
+# returns the first hit along the ray in the same layout as Scene.ray_cast(), optionally passing through faces which point away from the ray
+def castRay(depsgraph: bpy.types.Depsgraph, origin: Vector, direction: Vector, maxDistance: float, ignoreBackfaces: bool) -> tuple:
+    return RayQuery(depsgraph, origin, direction, maxDistance, ignoreBackfaces).run()
+
+class PivotTracker:
+    # Keeps the first hit along the view ray up to date while navigating by advancing a RayQuery within a time budget per
+    # tick; the query restarts whenever the ray changes. Building a missing tree for an object is a single step and cannot
+    # be split, so a tick may overrun its budget by that much.
+    __slots__ = 'query', 'queryKey', 'candidate', 'candidateKey', 'lastKey'
+
+    def __init__(self):
+        self.query = None
+        self.queryKey = None
+        self.candidate = None
+        self.candidateKey = None
+        self.lastKey = None
+
+    def track(self, depsgraph: bpy.types.Depsgraph, origin: Vector, direction: Vector, maxDistance: float, ignoreBackfaces: bool, budgetNs: int):
+        key = self.lastKey = getRayKey(depsgraph, origin, direction, maxDistance, ignoreBackfaces)
+        if key == self.candidateKey:
+            return
+        if key != self.queryKey:
+            self.query, self.queryKey = RayQuery(depsgraph, origin, direction, maxDistance, ignoreBackfaces), key
+        deadlineNs = time.perf_counter_ns() + budgetNs
+        query = self.query
+        while not query.isDone():
+            query.step()
+            if time.perf_counter_ns() >= deadlineNs:
+                return
+        self.candidate, self.candidateKey = query.result(), key
+        self.query, self.queryKey = None, None
+
+    def isFresh(self) -> bool:
+        return self.candidateKey is not None and self.candidateKey == self.lastKey and self.candidateKey[0] == cacheGeneration
+
+    def resolve(self, depsgraph: bpy.types.Depsgraph, origin: Vector, direction: Vector, maxDistance: float, ignoreBackfaces: bool) -> tuple:
+        key = getRayKey(depsgraph, origin, direction, maxDistance, ignoreBackfaces)
+        if key != self.candidateKey:
+            query = self.query if key == self.queryKey else RayQuery(depsgraph, origin, direction, maxDistance, ignoreBackfaces)
+            self.candidate, self.candidateKey = query.run(), key
+            self.query, self.queryKey = None, None
+        return self.candidate
+
+def getRayKey(depsgraph: bpy.types.Depsgraph, origin: Vector, direction: Vector, maxDistance: float, ignoreBackfaces: bool) -> tuple:
+    # a changed generation invalidates the candidate as well as a query still walking the previous index
+    return (cacheGeneration, depsgraph.as_pointer(), origin.to_tuple(), direction.to_tuple(), maxDistance, ignoreBackfaces)
+
+def castRayAtObject(obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph, matrix: Matrix, origin: Vector, direction: Vector, maxDistance: float, ignoreBackfaces: bool):
+    inverse = matrix.inverted_safe()
+    localOrigin = inverse @ origin
+    localDirection = inverse.to_3x3() @ direction
+    scale = localDirection.length
+    if scale == 0:
+        return None
+    localDirection = localDirection / scale
+    localMaxDistance = maxDistance * scale
+    boundBox = obj.bound_box
+    if intersectRayBox(localOrigin, localDirection, boundBox[0], boundBox[6], localMaxDistance) is None:
+        return None # rejecting here also avoids building trees for objects the ray never comes close to
+    bvh = getObjectBvh(obj, depsgraph)
+    travelled = 0.0
+    while travelled < localMaxDistance:
+        location, normal, index, distance = bvh.ray_cast(localOrigin, localDirection, localMaxDistance - travelled)
+        if location is None:
+            return None
+        travelled += distance
+        if not ignoreBackfaces or normal.dot(localDirection) <= 0:
+            worldNormal = (inverse.to_3x3().transposed() @ normal).normalized()
+            return (matrix @ location, worldNormal, index, travelled / scale)
+        # step through the backface and keep walking along the same ray inside this object's tree
+        nudge = min(max((matrix @ location).length * 0.000001, 0.00001), 0.004) * scale
+        localOrigin = location + localDirection * nudge
+        travelled += nudge
+    return None
+
+# slab test, returns the distance at which the ray enters the box or None if it misses it within maxDistance
+def intersectRayBox(origin: Vector, direction: Vector, boxMin, boxMax, maxDistance: float):
+    tMin, tMax = 0.0, maxDistance
+    for axis in range(3):
+        o, d = origin[axis], direction[axis]
+        if d == 0:
+            if o < boxMin[axis] or o > boxMax[axis]:
+                return None
+            continue
+        t1, t2 = (boxMin[axis] - o) / d, (boxMax[axis] - o) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tMin:
+            tMin = t1
+        if t2 < tMax:
+            tMax = t2
+        if tMin > tMax:
+            return None
+    return tMin
+
+def intersectRayFlatBox(origin: Vector, direction: Vector, inverseDirection: tuple, bounds: array, offset: int, maxDistance: float):
+    tMin, tMax = 0.0, maxDistance
+    for axis in range(3):
+        o, boxMin, boxMax = origin[axis], bounds[offset + axis], bounds[offset + 3 + axis]
+        if direction[axis] == 0:
+            if o < boxMin or o > boxMax:
+                return None
+            continue
+        t1, t2 = (boxMin - o) * inverseDirection[axis], (boxMax - o) * inverseDirection[axis]
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tMin:
+            tMin = t1
+        if t2 < tMax:
+            tMax = t2
+        if tMin > tMax:
+            return None
+    return tMin
+
+def rayCastMiss():
+    return (False, None, None, -1, None, None)
@@ -0,0 +1,268 @@
+# Records the path of the view while navigating: every pose written to the 3D View or to a camera locked to it becomes
+# one sample of doubles in a preallocated ring buffer, which keeps the most recent samples once it is full. Recorded
+# paths can be played back in a 3D View and saved to and loaded from files.
+
+from array import array
+import os
+import struct
+import sys
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+from mathutils import Vector
+from mathutils import Quaternion
+
+sampleSize = 9 # seconds since recording started, position (3), rotation (4), lens
+bytesPerSample = sampleSize * 8
+maxInterpolatedGap = 0.1 # seconds; the view stood still during longer gaps between samples
+
+playbackInterval = 1 / 60
+
+# path file: header, then all samples (oldest first) as little-endian doubles
+pathMagic = b"MSTRFNP\0"
+pathVersion = 1
+pathHeader = struct.Struct("<8sIII") # magic, version, doubles per sample, sample count
+pathExtension = ".mstrfpath"
+
+class PathRecorder:
+    __slots__ = 'samples', 'capacity', 'count', 'head', 'recording', 'startTimeNs', 'memoryLimit'
+
+    def __init__(self):
+        self.samples = array('d')
+        self.capacity = 0
+        self.count = 0
+        self.head = 0
+        self.recording = False
+        self.startTimeNs = 0
+        self.memoryLimit = 16 * 1024 * 1024
+
+    def start(self):
+        # replaces the previous recording; the buffer for the whole memory limit is allocated here, not while recording
+        capacity = max(2, self.memoryLimit // bytesPerSample)
+        if capacity != self.capacity:
+            self.samples = array('d', bytes(capacity * bytesPerSample))
+            self.capacity = capacity
+        self.count, self.head = 0, 0
+        self.startTimeNs = time.perf_counter_ns()
+        self.recording = True
+
+    def stop(self):
+        self.recording = False
+
+    def record(self, viewPos: Vector, viewRot: Quaternion, lens: float):
+        samples = self.samples
+        i = self.head * sampleSize
+        samples[i] = (time.perf_counter_ns() - self.startTimeNs) / 1_000_000_000
+        samples[i + 1], samples[i + 2], samples[i + 3] = viewPos[0], viewPos[1], viewPos[2]
+        samples[i + 4], samples[i + 5], samples[i + 6], samples[i + 7] = viewRot[0], viewRot[1], viewRot[2], viewRot[3]
+        samples[i + 8] = lens
+        self.head = self.head + 1 if self.head + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+
+    def getSamples(self) -> array:
+        # oldest first
+        if self.count < self.capacity:
+            return self.samples[:self.count * sampleSize]
+        split = self.head * sampleSize
+        return self.samples[split:] + self.samples[:split]
+
+    def load(self, samples: array):
+        self.recording = False
+        self.samples = samples
+        self.capacity = self.count = len(samples) // sampleSize
+        self.head = 0
+
+    def getDuration(self) -> float:
+        if self.count < 2:
+            return 0.0
+        oldest = (self.head if self.count == self.capacity else 0) * sampleSize
+        newest = (self.head - 1 if self.head > 0 else self.capacity - 1) * sampleSize
+        return self.samples[newest] - self.samples[oldest]
+
+pathRecorder = PathRecorder()
+
+def setPathRecorderMemoryLimit(limitBytes: int):
+    # takes effect with the next recording
+    pathRecorder.memoryLimit = limitBytes
+
+class PathPlayback:
+    __slots__ = 'samples', 'sv3d', 'rv3d', 'cursor', 'startTimeNs'
+
+    def __init__(self, samples: array, sv3d: bpy.types.SpaceView3D, rv3d: bpy.types.RegionView3D):
+        self.samples = samples
+        self.sv3d, self.rv3d = sv3d, rv3d
+        self.cursor = 0
+        self.startTimeNs = time.perf_counter_ns()
+
+playbackStopSignal = None
+
+def stopPlayback():
+    global playbackStopSignal
+    if playbackStopSignal is not None:
+        playbackStopSignal[0] = True
+        playbackStopSignal = None
+
+def playPath(playback: PathPlayback, stopSignal):
+    global playbackStopSignal
+    if stopSignal[0]: return None
+    try:
+        interval = stepPlayback(playback)
+    except ReferenceError:
+        interval = None # the 3D View was closed
+    if interval is None and playbackStopSignal is stopSignal:
+        playbackStopSignal = None
+    return interval
+
+def stepPlayback(playback: PathPlayback) -> float:
+    samples = playback.samples
+    count = len(samples) // sampleSize
+    t = samples[0] + (time.perf_counter_ns() - playback.startTimeNs) / 1_000_000_000
+    cursor = playback.cursor
+    while cursor + 1 < count and samples[(cursor + 1) * sampleSize] <= t:
+        cursor += 1
+    playback.cursor = cursor
+    a = cursor * sampleSize
+    if cursor + 1 >= count:
+        setPlaybackView(playback, Vector(samples[a + 1:a + 4]), Quaternion(samples[a + 4:a + 8]), samples[a + 8])
+        return None
+    b = a + sampleSize
+    span = samples[b] - samples[a]
+    f = (t - samples[a]) / span if 0 < span <= maxInterpolatedGap else 0.0
+    viewPos = Vector(samples[a + 1:a + 4]).lerp(Vector(samples[b + 1:b + 4]), f)
+    viewRot = Quaternion(samples[a + 4:a + 8]).slerp(Quaternion(samples[b + 4:b + 8]), f)
+    setPlaybackView(playback, viewPos, viewRot, samples[a + 8] + (samples[b + 8] - samples[a + 8]) * f)
+    return playbackInterval
+
+def setPlaybackView(playback: PathPlayback, viewPos: Vector, viewRot: Quaternion, lens: float):
+    # like mouse_strafing.setViewPos(), but always the 3D View itself, so that playing back never moves a camera
+    rv3d = playback.rv3d
+    viewDir = Vector((0, 0, -1))
+    viewDir.rotate(viewRot)
+    rv3d.view_rotation = viewRot
+    rv3d.view_location = viewPos + viewDir * rv3d.view_distance
+    playback.sv3d.lens = lens
+
+@persistent
+def onLoadPre(*args):
+    stopPlayback() # the 3D View being played back in goes away with the file
+
+def registerHandlers():
+    if onLoadPre not in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.append(onLoadPre)
+
+def unregisterHandlers():
+    if onLoadPre in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(onLoadPre)
+    stopPlayback()
+
+def writePath(filepath: str, samples: array):
+    if sys.byteorder != "little":
+        samples = array('d', samples)
+        samples.byteswap()
+    with open(filepath, "wb") as file:
+        file.write(pathHeader.pack(pathMagic, pathVersion, sampleSize, len(samples) // sampleSize))
+        samples.tofile(file)
+
+def readPath(filepath: str) -> array:
+    with open(filepath, "rb") as file:
+        header = file.read(pathHeader.size)
+        if len(header) < pathHeader.size:
+            raise ValueError("not a navigation path")
+        magic, version, fileSampleSize, count = pathHeader.unpack(header)
+        if magic != pathMagic:
+            raise ValueError("not a navigation path")
+        if version > pathVersion:
+            raise ValueError(f"path version {version} is newer than supported version {pathVersion}")
+        if fileSampleSize < sampleSize or os.fstat(file.fileno()).st_size < pathHeader.size + count * fileSampleSize * 8:
+            raise ValueError("navigation path file is damaged")
+        samples = array('d')
+        samples.fromfile(file, count * fileSampleSize)
+    if sys.byteorder != "little":
+        samples.byteswap()
+    if fileSampleSize != sampleSize:
+        # samples of newer versions: keep the fields this version knows
+        samples = array('d', (samples[i * fileSampleSize + j] for i in range(count) for j in range(sampleSize)))
+    return samples
+
+class PlayNavigationPath(bpy.types.Operator):
+    """Play back the recorded navigation path in this 3D View, or stop playing it back"""
+    bl_idname = "view3d.mouse_strafing_play_path"
+    bl_label = "Play Navigation Path"
+    @classmethod
+    def poll(cls, context):
+        return context.area is not None and context.area.type == "VIEW_3D"
+    def execute(self, context):
+        global playbackStopSignal
+        if playbackStopSignal is not None:
+            stopPlayback()
+            return {"FINISHED"}
+        samples = pathRecorder.getSamples()
+        if len(samples) == 0:
+            self.report({"WARNING"}, "No navigation path has been recorded")
+            return {"CANCELLED"}
+        rv3d = context.region_data
+        if rv3d.view_perspective == "CAMERA":
+            rv3d.view_perspective = "PERSP"
+        playback = PathPlayback(samples, context.space_data, rv3d)
+        playbackStopSignal = [False]
+        pinnedStopSignal = playbackStopSignal
+        bpy.app.timers.register(lambda: playPath(playback, pinnedStopSignal), first_interval = 0)
+        return {"FINISHED"}
+
+class ExportNavigationPath(bpy.types.Operator):
+    """Save the recorded navigation path to a file"""
+    bl_idname = "view3d.mouse_strafing_export_path"
+    bl_label = "Export Navigation Path"
+    filepath: bpy.props.StringProperty(subtype = "FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default = "*" + pathExtension, options = {"HIDDEN"})
+    def invoke(self, context, event):
+        if self.filepath == "":
+            self.filepath = "navigation_path" + pathExtension
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+    def execute(self, context):
+        filepath = self.filepath if self.filepath.endswith(pathExtension) else self.filepath + pathExtension
+        if pathRecorder.count == 0:
+            self.report({"WARNING"}, "No navigation path has been recorded")
+            return {"CANCELLED"}
+        try:
+            writePath(filepath, pathRecorder.getSamples())
+        except OSError as e:
+            self.report({"ERROR"}, f"Cannot write {filepath}: {e.strerror}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Exported {pathRecorder.getDuration():.1f} seconds of navigation")
+        return {"FINISHED"}
+
+class ImportNavigationPath(bpy.types.Operator):
+    """Load a navigation path from a file, replacing the recorded one, so that it can be played back"""
+    bl_idname = "view3d.mouse_strafing_import_path"
+    bl_label = "Import Navigation Path"
+    filepath: bpy.props.StringProperty(subtype = "FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default = "*" + pathExtension, options = {"HIDDEN"})
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+    def execute(self, context):
+        try:
+            samples = readPath(self.filepath)
+        except OSError as e:
+            self.report({"ERROR"}, f"Cannot read {self.filepath}: {e.strerror}")
+            return {"CANCELLED"}
+        except ValueError as e:
+            self.report({"ERROR"}, f"Cannot read {self.filepath}: {e}")
+            return {"CANCELLED"}
+        stopPlayback()
+        pathRecorder.load(samples)
+        self.report({"INFO"}, f"Imported {pathRecorder.getDuration():.1f} seconds of navigation")
+        return {"FINISHED"}
+
+def drawViewMenu(self, context: bpy.types.Context):
+    self.layout.operator(PlayNavigationPath.bl_idname)
+
+def drawImportMenu(self, context: bpy.types.Context):
+    self.layout.operator(ImportNavigationPath.bl_idname, text = f"Navigation Path ({pathExtension})")
+
+def drawExportMenu(self, context: bpy.types.Context):
+    self.layout.operator(ExportNavigationPath.bl_idname, text = f"Navigation Path ({pathExtension})")
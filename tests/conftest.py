@@ -0,0 +1,27 @@
+# Tests run the add-on in plain CPython against the headless stand-ins for bpy, blf and mathutils, see CONTRIBUTING.md.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import headless
+
+@pytest.fixture(scope = "session")
+def addon():
+    return headless.loadAddon()
+
+@pytest.fixture
+def session(addon, monkeypatch):
+    session = headless.Session(addon)
+    # preferences outlive sessions; tests change them through monkeypatch, so that they are restored afterwards
+    monkeypatch.setattr(session.prefs, "adjustPivot", False)
+    yield session
+    if session.running:
+        session.context.window_manager.modalHandlers[0].exitOperator(session.context)
+    session.context.window_manager.modalHandlers.clear()
+    addon.recorder.stopPlayback()
+    addon.raycast.invalidateInstanceIndex()
+    addon.raycast.clearBvhCache()
@@ -0,0 +1,113 @@
+from array import array
+
+import bpy
+import pytest
+
+@pytest.fixture
+def bm(addon):
+    return addon.bookmarks
+
+def makeLibrary(bm, pages: dict) -> tuple[list, array]:
+    # {page name: {digit: x}} -> names and records, each record at (x, 0, 0)
+    values = array('f', bytes(4 * bm.recordSize * bm.slotsPerPage * len(pages)))
+    for page, digits in enumerate(pages.values()):
+        for digit, x in digits.items():
+            slot = page * bm.slotsPerPage + digit
+            values[slot * bm.recordSize:(slot + 1) * bm.recordSize] = bm.packRecord((x, 0, 0), (1, 0, 0, 0), 5.0, 50.0, True)
+    return list(pages), values
+
+def getX(bm, store, page: int, digit: int):
+    record = store.getRecord(page * bm.slotsPerPage + digit)
+    return record[0] if record is not None and bm.isRecordUsed(record) else None
+
+def test_library_round_trip(session, bm, tmp_path):
+    store = bm.getBookmarkStore(session.scene)
+    bm.importLibrary(store, *makeLibrary(bm, {"Wides": {0: 1.0, 9: 2.0}, "Details": {3: 3.0}}), False)
+    path = str(tmp_path / ("lib" + bm.libraryExtension))
+    assert bm.writeLibrary(path, store) == 3
+    names, values = bm.readLibrary(path)
+    assert names == ["Wides", "Details"]
+    assert values == store.values
+
+def test_export_leaves_the_scene_alone(session, bm, tmp_path):
+    store = bm.getBookmarkStore(session.scene)
+    bm.importLibrary(store, *makeLibrary(bm, {"Page 1": {0: 1.0}}), False)
+    bookmarks = store.bookmarks
+    bookmarks.imminentRecord = bm.packRecord((7, 0, 0), (1, 0, 0, 0), 5.0, 50.0, True)
+    bookmarks.imminentSlot = 2 * bm.slotsPerPage + 4
+    recordCount, pageCount = len(bookmarks.records), len(bookmarks.pages)
+    path = str(tmp_path / ("lib" + bm.libraryExtension))
+    assert bm.writeLibrary(path, store) == 2
+    assert (len(bookmarks.records), len(bookmarks.pages), bookmarks.imminentSlot) == (recordCount, pageCount, 2 * bm.slotsPerPage + 4)
+    names, values = bm.readLibrary(path)
+    assert len(names) == 3
+    assert values[(2 * bm.slotsPerPage + 4) * bm.recordSize] == 7.0
+
+def test_replace_drops_the_scene_bookmarks(session, bm):
+    store = bm.getBookmarkStore(session.scene)
+    bm.importLibrary(store, *makeLibrary(bm, {"A": {0: 1.0}, "B": {1: 2.0}}), False)
+    assert bm.importLibrary(store, *makeLibrary(bm, {"C": {5: 3.0}}), False) == 1
+    assert [page.name for page in store.bookmarks.pages] == ["C"]
+    assert getX(bm, store, 0, 0) is None and getX(bm, store, 0, 5) == 3.0
+    assert bm.BookmarkStore(store.bookmarks).values == store.values
+
+def test_merge_matches_pages_by_name_and_digit(session, bm):
+    store = bm.getBookmarkStore(session.scene)
+    bm.importLibrary(store, *makeLibrary(bm, {"A": {0: 1.0, 1: 2.0}}), True)
+    count = bm.importLibrary(store, *makeLibrary(bm, {"B": {0: 5.0}, "A": {1: 20.0, 2: 30.0}}), True)
+    assert count == 3
+    assert [page.name for page in store.bookmarks.pages] == ["A", "B"]
+    assert [getX(bm, store, 0, digit) for digit in range(4)] == [1.0, 20.0, 30.0, None]
+    assert getX(bm, store, 1, 0) == 5.0
+    assert bm.BookmarkStore(store.bookmarks).values == store.values # written through to the scene
+
+def test_merge_of_repeated_page_names_goes_to_one_page(session, bm):
+    store = bm.getBookmarkStore(session.scene)
+    names, first = makeLibrary(bm, {"E": {0: 1.0}})
+    _names, second = makeLibrary(bm, {"E": {3: 3.0}})
+    bm.importLibrary(store, ["E", "E"], first + second, True)
+    assert [page.name for page in store.bookmarks.pages] == ["E"]
+    assert getX(bm, store, 0, 0) == 1.0 and getX(bm, store, 0, 3) == 3.0
+
+def writeRawLibrary(bm, path: str, recordSize: int, pageCount: int, pageNameSize: int, values: array = None):
+    with open(path, "wb") as file:
+        file.write(bm.libraryHeader.pack(bm.libraryMagic, bm.libraryVersion, recordSize, pageCount, pageNameSize))
+        file.write(b"".join(f"P{page}".encode("utf-8").ljust(pageNameSize, b"\0")[:pageNameSize] for page in range(pageCount)))
+        if values is None:
+            values = array('f', bytes(4 * recordSize * pageCount * bm.slotsPerPage))
+        values.tofile(file)
+
+def test_read_converts_other_record_sizes(session, bm, tmp_path):
+    names, values = makeLibrary(bm, {"A": {0: 1.0, 7: 2.0}})
+    wide = array('f', bytes(4 * 14 * bm.slotsPerPage))
+    for field in range(bm.recordSize):
+        wide[field::14] = values[field::bm.recordSize]
+    path = str(tmp_path / "wide.mstrf")
+    writeRawLibrary(bm, path, 14, 1, bm.libraryPageNameSize, wide)
+    assert bm.readLibrary(path) == (["P0"], values)
+
+@pytest.mark.parametrize("recordSize, pageNameSize, truncate", [(12, 0, 0), (9, 64, 0), (12, 64, 4)])
+def test_read_rejects_damaged_files(session, bm, tmp_path, recordSize, pageNameSize, truncate):
+    path = tmp_path / "damaged.mstrf"
+    writeRawLibrary(bm, str(path), recordSize, 2, pageNameSize)
+    if truncate > 0:
+        path.write_bytes(path.read_bytes()[:-truncate])
+    with pytest.raises(ValueError, match = "damaged"):
+        bm.readLibrary(str(path))
+
+def test_read_rejects_other_files(session, bm, tmp_path):
+    path = tmp_path / "other.mstrf"
+    path.write_bytes(b"not a library at all, but long enough")
+    with pytest.raises(ValueError, match = "not a camera bookmark library"):
+        bm.readLibrary(str(path))
+
+def test_rename_page(session, bm):
+    assert bpy.ops.view3d.mouse_strafing_rename_bookmark_page(name = "  Hero shots ") == {"FINISHED"}
+    store = bm.getBookmarkStore(session.scene)
+    assert store.getPageName(0) == "Hero shots"
+    assert len(store) == bm.slotsPerPage
+    store.bookmarks.page = 2
+    assert bpy.ops.view3d.mouse_strafing_rename_bookmark_page(name = "Hero shots") == {"CANCELLED"}
+    assert bpy.ops.view3d.mouse_strafing_rename_bookmark_page(name = " ") == {"CANCELLED"}
+    assert bpy.ops.view3d.mouse_strafing_rename_bookmark_page(name = "Wides") == {"FINISHED"}
+    assert [page.name for page in store.bookmarks.pages] == ["Hero shots", "Page 2", "Wides"]
@@ -0,0 +1,58 @@
+from mathutils import Quaternion
+
+def dragHorizontally(session, moves: int, dx: int):
+    op = session.invoke()
+    session.press("LEFTMOUSE")
+    session.draw() # a frame was just drawn, so the next one is not due yet
+    for i in range(moves):
+        session.moveMouse(dx, 0)
+    return op
+
+def test_moves_accumulate_until_flushed(session):
+    rotation = session.rv3d.view_rotation
+    op = dragHorizontally(session, 10, 3)
+    assert op.pendingMouseAction is not None
+    assert tuple(op.pendingMouseDelta) == (30.0, 0.0)
+    assert session.rv3d.view_rotation == rotation
+    session.settle()
+    assert op.pendingMouseAction is None
+    assert session.rv3d.view_rotation != rotation
+
+def test_coalesced_moves_end_where_single_moves_do(session, monkeypatch):
+    start = session.rv3d.view_rotation
+    dragHorizontally(session, 10, 3)
+    session.settle()
+    session.release("LEFTMOUSE"); session.release("SPACE")
+    coalesced = session.rv3d.view_rotation
+
+    session.rv3d.view_rotation = start
+    monkeypatch.setattr(session.prefs, "coalesceMouseMoves", False)
+    op = dragHorizontally(session, 10, 3)
+    assert op.pendingMouseAction is None
+    session.settle()
+    session.release("LEFTMOUSE"); session.release("SPACE")
+    single = session.rv3d.view_rotation
+    assert coalesced.rotation_difference(single).angle < 1e-5
+    assert Quaternion(start).rotation_difference(single).angle > 0.01
+
+def test_moves_flush_in_modal_once_a_frame_is_due(session):
+    op = dragHorizontally(session, 3, 3)
+    rotation = session.rv3d.view_rotation
+    op.previousDrawTimeNs -= 10 * op.drawIntervalNs
+    session.moveMouse(3, 0)
+    assert op.pendingMouseAction is None
+    assert session.rv3d.view_rotation != rotation # committed before the redraw, without waiting for timers
+
+def test_draw_leaves_pending_moves_alone(session):
+    op = dragHorizontally(session, 5, 3)
+    rotation = session.rv3d.view_rotation
+    session.draw()
+    assert tuple(op.pendingMouseDelta) == (15.0, 0.0)
+    assert session.rv3d.view_rotation == rotation
+    assert op.animationStopSignal is None
+
+def test_changed_modifiers_flush_pending_moves(session):
+    op = dragHorizontally(session, 4, 3)
+    session.moveMouse(3, 0, shift = True)
+    assert op.pendingMouseModifiers == (True, False, False)
+    assert tuple(op.pendingMouseDelta) == (3.0, 0.0)
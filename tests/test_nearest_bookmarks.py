@@ -0,0 +1,58 @@
+import math
+import random
+
+from mathutils import Vector
+from mathutils import Quaternion
+
+def randomRotation(rng: random.Random) -> Quaternion:
+    return Quaternion((rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1))).normalized()
+
+def findNearestByScan(bm, store, viewPos: Vector, viewDir: Vector, angleWeight: float, count: int) -> list:
+    nearest = []
+    for slot in range(len(store)):
+        record = store.getRecord(slot)
+        if bm.isRecordUsed(record):
+            angle = math.acos(max(-1.0, min(1.0, viewDir.dot(bm.getRecordDirection(record)))))
+            nearest.append(((Vector(record[0:3]) - viewPos).length + angle * angleWeight, slot))
+    return [slot for _distance, slot in sorted(nearest)[:count]]
+
+def fillStore(bm, session, rng: random.Random, count: int):
+    store = bm.getBookmarkStore(session.scene)
+    store.reserve(count)
+    for slot in range(count):
+        if rng.random() < 0.8: # leave some slots empty
+            position = Vector((rng.uniform(-50, 50), rng.uniform(-50, 50), rng.uniform(-5, 5)))
+            store.values[slot * bm.recordSize:(slot + 1) * bm.recordSize] = bm.packRecord(position, randomRotation(rng), 10.0, 50.0, True)
+    store.writeAll()
+    return store
+
+def test_nearest_matches_a_full_scan(session, addon):
+    bm = addon.bookmarks
+    rng = random.Random(3)
+    store = fillStore(bm, session, rng, 600)
+    for i in range(60):
+        viewPos = Vector((rng.uniform(-60, 60), rng.uniform(-60, 60), rng.uniform(-6, 6)))
+        viewDir = randomRotation(rng) @ Vector((0, 0, -1))
+        angleWeight = rng.uniform(0.0, 30.0)
+        found = [slot for _distance, slot in store.findNearest(viewPos, viewDir, angleWeight, 10)]
+        assert found == findNearestByScan(bm, store, viewPos, viewDir, angleWeight, 10)
+
+def test_records_saved_after_indexing_are_found(session, addon):
+    bm = addon.bookmarks
+    rng = random.Random(5)
+    store = fillStore(bm, session, rng, 200)
+    store.findNearest(Vector(), Vector((0, 0, -1)), 10.0, 5)
+    index = store.index
+    slots = rng.sample(range(260), bm.maxUnindexedRecords + 1)
+    for slot in slots[:-1]:
+        store.setRecord(slot, bm.packRecord(Vector((rng.uniform(-50, 50), rng.uniform(-50, 50), 0)), randomRotation(rng), 10.0, 50.0, True))
+        viewPos = Vector((rng.uniform(-50, 50), rng.uniform(-50, 50), 0))
+        found = [slot for _distance, slot in store.findNearest(viewPos, Vector((0, 0, -1)), 5.0, 8)]
+        assert found == findNearestByScan(bm, store, viewPos, Vector((0, 0, -1)), 5.0, 8)
+    assert store.index is index # no rebuild until there are more than maxUnindexedRecords of them
+    store.setRecord(slots[-1], bm.packRecord(Vector(), Quaternion(), 10.0, 50.0, True))
+    assert store.index is None
+
+def test_empty_store_has_no_nearest(session, addon):
+    store = addon.bookmarks.getBookmarkStore(session.scene)
+    assert store.findNearest(Vector(), Vector((0, 0, -1)), 10.0, 5) == []
@@ -0,0 +1,42 @@
+# A representative grid of the exhaustive check in bench/nudge.py (python -m bench.nudge): every rung of the coarse
+# ladders, a sample of the fine ones including the rungs around each range boundary, and values off the ladders.
+
+import bisect
+
+import pytest
+
+from bench.nudge import magnitudes, offLadderValues, referenceNudge
+
+rangeNames = ("strafeSensitivityRanges", "focalLengthRanges", "fovRanges")
+fineRungStride = 997
+
+def getGridValues(ms, ranges, fine: bool) -> list:
+    values = set()
+    for direction in (1, -1):
+        ladder = ms.getNudgeLadder(ranges, fine, direction)
+        if not fine:
+            values.update(ladder)
+            continue
+        values.update(ladder[::fineRungStride])
+        values.update(ladder[-3:])
+        for start, _step in ranges[:-1]:
+            i = bisect.bisect_left(ladder, start)
+            values.update(ladder[max(0, i - 3):i + 3])
+    return sorted(values) + offLadderValues(ranges, 1, 50)
+
+@pytest.mark.parametrize("fine", [False, True], ids = ["coarse", "fine"])
+@pytest.mark.parametrize("name", rangeNames)
+def test_nudge_value_matches_repeated_steps(addon, name, fine):
+    ms = addon.mouse_strafing
+    ranges = getattr(ms, name)
+    for value in getGridValues(ms, ranges, fine):
+        for magnitude in magnitudes:
+            assert ms.nudgeValue(value, magnitude, fine, ranges) == referenceNudge(ms, value, magnitude, fine, ranges), (value, magnitude)
+
+@pytest.mark.parametrize("name", rangeNames)
+def test_nudge_ladders_increase_strictly(addon, name):
+    ms = addon.mouse_strafing
+    for fine in (False, True):
+        for direction in (1, -1):
+            ladder = ms.getNudgeLadder(getattr(ms, name), fine, direction)
+            assert all(ladder[i] < ladder[i + 1] for i in range(len(ladder) - 1))
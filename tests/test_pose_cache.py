@@ -0,0 +1,44 @@
+from mathutils import Vector
+
+def getViewPosition(rv3d) -> Vector:
+    viewDir = Vector((0, 0, -1))
+    viewDir.rotate(rv3d.view_rotation)
+    return rv3d.view_location - viewDir * rv3d.view_distance
+
+def test_moves_between_commits_write_rna_once(session, monkeypatch):
+    monkeypatch.setattr(session.prefs, "coalesceMouseMoves", False)
+    op = session.invoke()
+    session.press("LEFTMOUSE")
+    writes = session.rv3d.writeCount
+    for i in range(20):
+        session.moveMouse(4, 2)
+    assert session.rv3d.writeCount == writes
+    assert op.poseDirty
+    session.settle()
+    assert session.rv3d.writeCount == writes + 2 # location and rotation
+    viewPos, viewRot, _viewDir = op.peekPose()
+    assert (viewPos - getViewPosition(session.rv3d)).length < 1e-4
+    assert viewRot.rotation_difference(session.rv3d.view_rotation).angle < 1e-5
+
+def test_changes_made_through_rna_replace_the_cached_pose(session, monkeypatch):
+    monkeypatch.setattr(session.prefs, "coalesceMouseMoves", False)
+    session.invoke()
+    session.press("LEFTMOUSE")
+    session.moveMouse(10, 0)
+    session.settle()
+    session.rv3d.view_location = session.rv3d.view_location + Vector((5.0, -3.0, 2.0)) # e.g. a script or another operator
+    viewPos = getViewPosition(session.rv3d)
+    session.moveMouse(10, 0) # turning keeps the view position
+    session.settle()
+    assert (getViewPosition(session.rv3d) - viewPos).length < 1e-4
+
+def test_exit_commits_the_pending_pose(session, monkeypatch):
+    monkeypatch.setattr(session.prefs, "coalesceMouseMoves", False)
+    rotation = session.rv3d.view_rotation
+    session.invoke()
+    session.press("LEFTMOUSE")
+    session.moveMouse(10, 5)
+    session.release("LEFTMOUSE")
+    session.release("SPACE")
+    assert not session.running
+    assert session.rv3d.view_rotation != rotation
@@ -0,0 +1,119 @@
+import random
+
+import bpy
+import pytest
+from mathutils import Vector
+from mathutils import Matrix
+
+import headless
+
+@pytest.fixture
+def rc(addon):
+    return addon.raycast
+
+def scatterCubes(session, rng: random.Random, count: int) -> list:
+    return [session.addMesh(f"Cube{i}", *headless.cubeMesh(1.0), Matrix.Translation((rng.uniform(-20, 20), rng.uniform(-20, 20), rng.uniform(-2, 2)))) for i in range(count)]
+
+def castRandomRays(rc, depsgraph, rng: random.Random, count: int) -> list:
+    hits = []
+    for i in range(count):
+        origin = Vector((rng.uniform(-20, 20), rng.uniform(-20, 20), 10.0))
+        direction = Vector((rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3), -1.0))
+        hit = rc.castRay(depsgraph, origin, direction, 100.0, False)
+        hits.append((hit[4].name, tuple(round(c, 4) for c in hit[1])) if hit[0] else None)
+    return hits
+
+def test_cast_ray_matches_scene_ray_cast(session, rc):
+    rng = random.Random(1)
+    scatterCubes(session, rng, 40)
+    session.addMesh("Ground", *headless.gridMesh(60.0, 6), Matrix.Translation((0.0, 0.0, -3.0)))
+    depsgraph = session.viewLayer.depsgraph
+    for i in range(100):
+        origin = Vector((rng.uniform(-20, 20), rng.uniform(-20, 20), 10.0))
+        direction = Vector((rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3), -1.0))
+        hit = rc.castRay(depsgraph, origin, direction, 100.0, False)
+        expected = session.scene.ray_cast(depsgraph, origin, direction, 100.0)
+        assert hit[0] == expected[0]
+        assert hit[4] is expected[4]
+        assert (hit[1] - expected[1]).length < 1e-4
+
+def test_backfaces_can_be_ignored(session, rc):
+    session.addMesh("Cube", *headless.cubeMesh(2.0))
+    depsgraph = session.viewLayer.depsgraph
+    origin, direction = Vector((0.0, 0.0, 0.0)), Vector((0.0, 0.0, -1.0)) # from inside, every face points away
+    assert rc.castRay(depsgraph, origin, direction, 10.0, False)[0]
+    assert not rc.castRay(depsgraph, origin, direction, 10.0, True)[0]
+
+def test_max_distance_limits_hits(session, rc):
+    session.addMesh("Ground", *headless.gridMesh(10.0, 1))
+    depsgraph = session.viewLayer.depsgraph
+    assert rc.castRay(depsgraph, Vector((0, 0, 5)), Vector((0, 0, -1)), 6.0, False)[0]
+    assert not rc.castRay(depsgraph, Vector((0, 0, 5)), Vector((0, 0, -1)), 4.0, False)[0]
+
+def test_transform_updates_refit_the_index(session, rc):
+    rng = random.Random(2)
+    cubes = scatterCubes(session, rng, 200)
+    depsgraph = session.viewLayer.depsgraph
+    index = rc.getInstanceIndex(depsgraph)
+    for i in range(20):
+        cube = rng.choice(cubes)
+        cube.matrix_world = Matrix.Translation((rng.uniform(-20, 20), rng.uniform(-20, 20), rng.uniform(-2, 2)))
+        session.tagUpdate(cube, transform = True)
+        assert rc.instanceIndex is index
+    state = rng.getstate()
+    refitted = castRandomRays(rc, depsgraph, rng, 200)
+    rc.invalidateInstanceIndex()
+    rng.setstate(state)
+    assert refitted == castRandomRays(rc, depsgraph, rng, 200)
+    assert any(hit is not None for hit in refitted)
+
+def test_other_updates_rebuild_the_index(session, rc):
+    cube = session.addMesh("Cube", *headless.cubeMesh(1.0))
+    collection = bpy.types.Collection("Set", [session.addMesh("Member", *headless.cubeMesh(1.0))])
+    session.scene.objects._items.remove(collection.objects[0])
+    instancer = session.addCollectionInstance("Instancer", collection, Matrix.Translation((0.0, 0.0, 5.0)))
+    depsgraph = session.viewLayer.depsgraph
+    rc.getInstanceIndex(depsgraph)
+    session.tagUpdate(cube, geometry = True, transform = True)
+    assert rc.instanceIndex is None
+    rc.getInstanceIndex(depsgraph)
+    instancer.matrix_world = Matrix.Translation((0.0, 0.0, 8.0))
+    session.tagUpdate(instancer, transform = True) # moves all of its instances
+    assert rc.instanceIndex is None
+    assert rc.castRay(depsgraph, Vector((0, 0, 20)), Vector((0, 0, -1)), 100.0, False)[1].z == pytest.approx(8.5)
+
+def test_cameras_never_change_what_rays_hit(session, rc):
+    session.addMesh("Cube", *headless.cubeMesh(1.0))
+    camera = session.addCamera()
+    rc.getInstanceIndex(session.viewLayer.depsgraph)
+    generation = rc.cacheGeneration
+    session.tagUpdate(camera, transform = True)
+    assert rc.instanceIndex is not None
+    assert rc.cacheGeneration == generation
+
+def test_pivot_candidates_go_stale_with_the_generation(session, rc):
+    cube = session.addMesh("Cube", *headless.cubeMesh(1.0))
+    depsgraph = session.viewLayer.depsgraph
+    origin, direction = Vector((0, 0, 10)), Vector((0, 0, -1))
+    tracker = rc.PivotTracker()
+    tracker.track(depsgraph, origin, direction, 100.0, False, 10**9)
+    assert tracker.isFresh()
+    assert tracker.candidate[1].z == pytest.approx(0.5)
+    cube.matrix_world = Matrix.Translation((0.0, 0.0, 2.0))
+    session.tagUpdate(cube, transform = True)
+    assert not tracker.isFresh() # same ray, but the scene changed
+    assert tracker.resolve(depsgraph, origin, direction, 100.0, False)[1].z == pytest.approx(2.5)
+
+def test_trees_are_shared_and_rebuilt_on_geometry_updates(session, rc):
+    mesh = bpy.types.Mesh("Shared", *headless.cubeMesh(1.0))
+    for i in range(3):
+        obj = bpy.types.Object(f"Duplicate{i}", mesh)
+        obj.matrix_world = Matrix.Translation((i * 3.0, 0.0, 0.0))
+        session.scene.objects._items.append(obj)
+    depsgraph = session.viewLayer.depsgraph
+    rebuilds = rc.bvhCacheStats.rebuilds
+    for i in range(3):
+        assert rc.castRay(depsgraph, Vector((i * 3.0, 0, 10)), Vector((0, 0, -1)), 100.0, False)[0]
+    assert rc.bvhCacheStats.rebuilds == rebuilds + 1 # linked duplicates use one tree
+    session.tagUpdate(mesh, geometry = True)
+    assert len(rc.bvhCache) == 0
@@ -0,0 +1,122 @@
+from array import array
+
+import bpy
+import pytest
+from mathutils import Vector
+from mathutils import Quaternion
+
+@pytest.fixture
+def rec(addon):
+    return addon.recorder
+
+@pytest.fixture
+def pathRecorder(addon, rec, monkeypatch):
+    # a fresh recorder in place of the add-on's, so that tests neither see nor leave recordings
+    pathRecorder = rec.PathRecorder()
+    monkeypatch.setattr(rec, "pathRecorder", pathRecorder)
+    monkeypatch.setattr(addon.mouse_strafing, "pathRecorder", pathRecorder)
+    return pathRecorder
+
+def makePath(rec, count: int, interval: float) -> array:
+    samples = array('d')
+    for i in range(count):
+        samples.extend((i * interval, float(i), 0.0, 1.0, 1.0, 0.0, 0.0, 0.0, 50.0))
+    return samples
+
+def test_ring_buffer_keeps_the_newest_samples(rec, pathRecorder):
+    pathRecorder.memoryLimit = 5 * rec.bytesPerSample
+    pathRecorder.start()
+    for i in range(12):
+        pathRecorder.record(Vector((i, 0, 0)), Quaternion(), 50.0)
+    assert pathRecorder.count == pathRecorder.capacity == 5
+    samples = pathRecorder.getSamples()
+    assert [samples[i * rec.sampleSize + 1] for i in range(5)] == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert all(samples[i * rec.sampleSize] <= samples[(i + 1) * rec.sampleSize] for i in range(4))
+    assert pathRecorder.getDuration() == samples[4 * rec.sampleSize] - samples[0]
+
+def test_start_replaces_the_previous_recording(rec, pathRecorder):
+    pathRecorder.start()
+    pathRecorder.record(Vector(), Quaternion(), 50.0)
+    pathRecorder.start()
+    assert pathRecorder.count == 0
+    assert len(pathRecorder.getSamples()) == 0
+
+def test_navigating_records_samples(session, rec, pathRecorder):
+    session.invoke()
+    session.tap("K")
+    assert pathRecorder.recording
+    session.press("LEFTMOUSE")
+    for i in range(5):
+        session.moveMouse(10, 3)
+        session.settle()
+    session.release("LEFTMOUSE")
+    session.tap("K")
+    session.release("SPACE")
+    assert not pathRecorder.recording
+    assert pathRecorder.count >= 5
+    samples = pathRecorder.getSamples()
+    last = (pathRecorder.count - 1) * rec.sampleSize
+    assert Quaternion(samples[last + 4:last + 8]).rotation_difference(session.rv3d.view_rotation).angle < 1e-5
+
+def test_path_file_round_trip(rec, tmp_path):
+    samples = makePath(rec, 50, 0.01)
+    path = str(tmp_path / ("path" + rec.pathExtension))
+    rec.writePath(path, samples)
+    assert rec.readPath(path) == samples
+
+def test_read_keeps_known_fields_of_newer_samples(rec, tmp_path):
+    samples = makePath(rec, 4, 0.01)
+    wide = array('d')
+    for i in range(4):
+        wide.extend(samples[i * rec.sampleSize:(i + 1) * rec.sampleSize])
+        wide.extend((-1.0, -2.0))
+    path = tmp_path / "wide.mstrfpath"
+    path.write_bytes(rec.pathHeader.pack(rec.pathMagic, rec.pathVersion, rec.sampleSize + 2, 4) + wide.tobytes())
+    assert rec.readPath(str(path)) == samples
+
+def test_read_rejects_damaged_and_other_files(rec, tmp_path):
+    path = tmp_path / "path.mstrfpath"
+    rec.writePath(str(path), makePath(rec, 10, 0.01))
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match = "damaged"):
+        rec.readPath(str(path))
+    path.write_bytes(b"MSTRF")
+    with pytest.raises(ValueError, match = "not a navigation path"):
+        rec.readPath(str(path))
+
+def test_playback_moves_the_view(session, rec, pathRecorder):
+    pathRecorder.load(makePath(rec, 10, 0.0)) # no time between samples, so the first step ends at the last one
+    assert bpy.ops.view3d.mouse_strafing_play_path() == {"FINISHED"}
+    session.settle()
+    viewDir = Vector((0, 0, -1))
+    viewDir.rotate(session.rv3d.view_rotation)
+    viewPos = session.rv3d.view_location - viewDir * session.rv3d.view_distance
+    assert (viewPos - Vector((9.0, 0.0, 1.0))).length < 1e-5
+    assert rec.playbackStopSignal is None
+    assert bpy.app.timers.pending() == 0
+
+def test_playback_stops_when_the_view_goes_away(session, rec, pathRecorder):
+    pathRecorder.load(makePath(rec, 100, 1.0))
+    bpy.ops.view3d.mouse_strafing_play_path()
+    session.runTimers()
+    assert rec.playbackStopSignal is not None
+    session.closeArea()
+    session.runTimers(bpy.app.timers.nextDue())
+    assert rec.playbackStopSignal is None
+    assert bpy.app.timers.pending() == 0
+
+def test_playback_stops_when_loading_a_file(session, rec, pathRecorder):
+    pathRecorder.load(makePath(rec, 100, 1.0))
+    bpy.ops.view3d.mouse_strafing_play_path()
+    for handler in list(bpy.app.handlers.load_pre):
+        handler(None)
+    assert rec.playbackStopSignal is None
+    session.settle()
+    assert bpy.app.timers.pending() == 0
+
+def test_playing_again_stops_playback(session, rec, pathRecorder):
+    pathRecorder.load(makePath(rec, 100, 1.0))
+    bpy.ops.view3d.mouse_strafing_play_path()
+    assert rec.playbackStopSignal is not None
+    bpy.ops.view3d.mouse_strafing_play_path()
+    assert rec.playbackStopSignal is None
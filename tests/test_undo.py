@@ -0,0 +1,57 @@
+import bpy
+import pytest
+
+import headless
+
+@pytest.fixture
+def undoPushes():
+    bpy.ops.undoPushes.clear()
+    return bpy.ops.undoPushes
+
+def navigate(session, moves: int = 3):
+    session.press("LEFTMOUSE")
+    for i in range(moves):
+        session.moveMouse(30, 0)
+        session.settle()
+    session.release("LEFTMOUSE")
+
+def lockToCamera(session):
+    session.addCamera(matrix = headless.lookAt((0.0, -10.0, 2.0), (0.0, 0.0, 0.0)))
+    session.viewThroughCamera()
+
+@pytest.mark.parametrize("policy, pushes", [("session", 1), ("timed", 1), ("none", 0)])
+def test_camera_navigation_pushes_per_policy(session, monkeypatch, undoPushes, policy, pushes):
+    monkeypatch.setattr(session.prefs, "undoPolicy", policy)
+    lockToCamera(session)
+    session.invoke()
+    navigate(session)
+    assert session.release("SPACE") == {"FINISHED"} # the camera changed, whether or not that is undoable
+    assert len(undoPushes) == pushes
+    assert session.undoSteps == 0 # Blender pushes no step of its own on top
+
+def test_timed_policy_pushes_from_modal_once_due(session, monkeypatch, undoPushes):
+    monkeypatch.setattr(session.prefs, "undoPolicy", "timed")
+    lockToCamera(session)
+    op = session.invoke()
+    navigate(session)
+    session.settle()
+    assert len(undoPushes) == 0
+    op.undoStepDueNs = 0
+    session.settle()
+    assert len(undoPushes) == 0 # timers never push
+    navigate(session, 2) # re-entering mouse mode skips the move of the cursor warp
+    assert len(undoPushes) == 1
+    session.release("SPACE")
+    assert len(undoPushes) == 2 # the rest of the navigation
+
+def test_unchanged_camera_pushes_nothing(session, undoPushes):
+    lockToCamera(session)
+    session.invoke()
+    assert session.release("SPACE") == {"CANCELLED"}
+    assert len(undoPushes) == 0
+
+def test_view_navigation_never_pushes(session, undoPushes):
+    session.invoke()
+    navigate(session)
+    assert session.release("SPACE") == {"CANCELLED"}
+    assert len(undoPushes) == 0